@@ -142,6 +142,54 @@ else:
     }
 
 
+# --- CACHES ---
+# Must be shared between gunicorn workers/threads and Cloud Run instances, so the
+# default is the database cache (run `python manage.py createcachetable` once).
+# Set CACHE_URL (e.g. redis://host:6379/0) to use a dedicated cache server.
+# Template fragments ({% cache %}) are keyed on the shared catalog version, so a
+# per-process memory cache is safe for them and saves a cache query per fragment.
+CACHES = {
+    "default": env.cache_url("CACHE_URL", default="dbcache://django_cache"),
+    "template_fragments": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "template-fragments",
+    },
+}
+# The database cache culls once it holds MAX_ENTRIES rows (Django's default is
+# 300). Size it for the key space: ~5 keys per quiz version (payload, ETag,
+# answer key, question order, windows), 2 per active user (attempted-quiz set
+# and its version) and one per anonymous catalog page and catalog version.
+# When full, 1/CULL_FREQUENCY of the rows are deleted.
+if CACHES["default"]["BACKEND"] == "django.core.cache.backends.db.DatabaseCache":
+    _cache_options = CACHES["default"].setdefault("OPTIONS", {})
+    _cache_options.setdefault(
+        "MAX_ENTRIES", env.int("CACHE_MAX_ENTRIES", default=100_000)
+    )
+    _cache_options.setdefault(
+        "CULL_FREQUENCY", env.int("CACHE_CULL_FREQUENCY", default=10)
+    )
+
+
+# --- QUIZ DELIVERY ---
+# Quizzes with more active questions than the threshold are delivered in pages:
+# the first QUIZ_PAGE_SIZE questions are inlined and app.js fetches the rest.
+QUIZ_PAGED_DELIVERY_THRESHOLD = env.int("QUIZ_PAGED_DELIVERY_THRESHOLD", default=60)
+QUIZ_PAGE_SIZE = env.int("QUIZ_PAGE_SIZE", default=20)
+
+# --- QUIZ ATTEMPT INGESTION ---
+# "direct": submit_quiz_attempt inserts each QuizAttempt in the request.
+# "spool": validated attempts are appended to a local SQLite spool file and a
+# background thread bulk-inserts them in batches (multi_choice_quiz/ingestion.py).
+# The spool must live on a persistent disk shared by all workers of the host;
+# Cloud Run's filesystem is in-memory, so keep "direct" there.
+ATTEMPT_INGESTION_MODE = env("ATTEMPT_INGESTION_MODE", default="direct")
+ATTEMPT_SPOOL_PATH = env(
+    "ATTEMPT_SPOOL_PATH", default=str(PROJECT_ROOT_DIR / "attempt_spool.sqlite3")
+)
+ATTEMPT_SPOOL_BATCH_SIZE = env.int("ATTEMPT_SPOOL_BATCH_SIZE", default=200)
+ATTEMPT_SPOOL_FLUSH_INTERVAL = env.float("ATTEMPT_SPOOL_FLUSH_INTERVAL", default=1.0)
+
+
 # --- AUTHENTICATION ---
 AUTH_PASSWORD_VALIDATORS = [
     {
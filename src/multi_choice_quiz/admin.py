@@ -4,7 +4,8 @@ from django.contrib import admin
 from django.utils.html import format_html
 
 # Add QuizAttempt to the import
-from .models import Quiz, Question, Option, Topic, QuizAttempt
+from .models import Quiz, Question, Option, Topic, QuizAttempt, QuestionResponse
+from .search import search_question_ids
 
 
 # ... (Keep OptionInline, QuestionAdmin, QuestionInline, QuizAdmin, TopicAdmin) ...
@@ -29,6 +30,17 @@ class QuestionAdmin(admin.ModelAdmin):
     search_fields = ["text", "quiz__title", "topic__name", "tag"]
     inlines = [OptionInline]
 
+    def get_search_results(self, request, queryset, search_term):
+        # search_fields matches (tags, topics, inactive questions, uncapped) plus
+        # the full-text index, which adds option texts and stemmed matches.
+        results, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        question_ids = search_question_ids(search_term) if search_term else None
+        if question_ids:
+            results = results | queryset.filter(pk__in=question_ids)
+        return results, may_have_duplicates
+
     def text_preview(self, obj):
         return obj.text[:50] + "..." if len(obj.text) > 50 else obj.text
 
@@ -60,10 +72,13 @@ class QuizAdmin(admin.ModelAdmin):
         "title",
         "get_topics_display",
         "question_count",
+        "attempt_count",
+        "average_percentage",
         "created_at",
         "is_active",
     ]
     list_filter = ["is_active", "topics"]
+    readonly_fields = ["active_question_count", "attempt_count", "average_percentage"]
     search_fields = ["title", "description", "topics__name"]
     filter_horizontal = ["topics"]
     inlines = [QuestionInline]
@@ -89,6 +104,17 @@ class TopicAdmin(admin.ModelAdmin):
     quiz_count.short_description = "Quizzes"
 
 
+class QuestionResponseInline(admin.TabularInline):
+    model = QuestionResponse
+    extra = 0
+    fields = ["question", "chosen_index", "is_correct"]
+    readonly_fields = fields  # Written when the attempt is submitted
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 # <<< START NEW ADMIN CLASS >>>
 class QuizAttemptAdmin(admin.ModelAdmin):
     list_display = (
@@ -103,6 +129,7 @@ class QuizAttemptAdmin(admin.ModelAdmin):
     list_filter = ("quiz", "user", "start_time")
     search_fields = ("quiz__title", "user__username", "user__email")
     readonly_fields = ("start_time", "end_time")  # These are set programmatically
+    inlines = [QuestionResponseInline]
 
     def user_display(self, obj):
         return obj.user.username if obj.user else "Anonymous"
@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class MultiChoiceQuizConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'multi_choice_quiz'
+
+    def ready(self):
+        from . import signals  # noqa: F401  (connects payload cache invalidation)
+
+        if settings.ATTEMPT_INGESTION_MODE == "spool":
+            from django.core.signals import request_started
+            from .ingestion import start_spool_flusher_on_request
+
+            # Start the flusher (and replay leftovers) in serving processes only,
+            # not in management commands.
+            request_started.connect(
+                start_spool_flusher_on_request, dispatch_uid="attempt_spool_flusher"
+            )
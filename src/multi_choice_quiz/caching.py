@@ -0,0 +1,350 @@
+# src/multi_choice_quiz/caching.py
+"""
+Shared cache for serialized quiz payloads.
+
+Entries are keyed on the quiz ID plus its content version (`Quiz.updated_at`).
+Any change to a quiz, its questions or their options bumps `updated_at` (see
+`signals.py` and the bulk import paths), so readers simply stop hitting the
+old key. The cache backend comes from `settings.CACHES` and must be shared
+between gunicorn workers (database or Redis, never a per-process locmem).
+
+The set of quizzes each user has attempted is cached here too, as a packed
+sorted integer array. Its key carries a per-user version that every saved or
+deleted attempt bumps (see `recording.py`), so a set rebuilt from attempts
+read before the change is stored under the old version and never served.
+
+The catalog version is a single shared token bumped whenever anything listed in
+the catalog changes (quizzes, their questions, topics, system categories).
+Per-process structures derived from the catalog compare it to rebuild.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from array import array
+from typing import FrozenSet, Iterable
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Quiz, Question, Option, QuizAttempt
+from .scoring import question_order_version
+from .transform import aquiz_to_frontend, quiz_to_frontend
+
+logger = logging.getLogger(__name__)
+
+QUIZ_PAYLOAD_CACHE_PREFIX = "quiz_payload"
+QUIZ_PAYLOAD_ETAG_CACHE_PREFIX = "quiz_payload_etag"
+QUIZ_PAYLOAD_WINDOW_CACHE_PREFIX = "quiz_payload_window"
+QUIZ_ANSWER_KEY_CACHE_PREFIX = "quiz_answer_key"
+QUIZ_QUESTION_ORDER_CACHE_PREFIX = "quiz_question_order"
+QUIZ_PAYLOAD_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day; stale keys are never read again
+USER_ATTEMPTED_QUIZZES_CACHE_PREFIX = "user_attempted_quizzes"
+USER_ATTEMPTED_QUIZZES_VERSION_CACHE_PREFIX = "user_attempted_quizzes_version"
+USER_ATTEMPTED_QUIZZES_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day; then rebuilt from the DB
+CATALOG_VERSION_CACHE_KEY = "catalog_version"
+
+
+def quiz_content_version(quiz: Quiz) -> str:
+    """Return the content version token for a quiz (microsecond `updated_at`)."""
+    return f"{quiz.updated_at.timestamp():.6f}"
+
+
+def quiz_payload_cache_key(quiz: Quiz) -> str:
+    """Return the cache key for the serialized payload of this quiz version."""
+    return f"{QUIZ_PAYLOAD_CACHE_PREFIX}:{quiz.pk}:{quiz_content_version(quiz)}"
+
+
+def quiz_payload_etag_cache_key(quiz: Quiz) -> str:
+    """Return the cache key for the payload ETag of this quiz version."""
+    return f"{QUIZ_PAYLOAD_ETAG_CACHE_PREFIX}:{quiz.pk}:{quiz_content_version(quiz)}"
+
+
+def get_quiz_payload_json(quiz: Quiz) -> str:
+    """
+    Return the frontend payload of a quiz as a JSON string.
+
+    Served from the shared cache when the quiz version is unchanged, otherwise
+    serialized with `quiz_to_frontend` and stored for the next request.
+    """
+    key = quiz_payload_cache_key(quiz)
+    payload_json = cache.get(key)
+    if payload_json is not None:
+        logger.debug(f"Quiz payload cache hit for quiz ID {quiz.pk} ({key}).")
+        return payload_json
+
+    payload_json = json.dumps(quiz_to_frontend(quiz))
+    cache.set(key, payload_json, QUIZ_PAYLOAD_CACHE_TIMEOUT)
+    logger.debug(f"Quiz payload cache miss for quiz ID {quiz.pk}; stored {key}.")
+    return payload_json
+
+
+async def aget_quiz_payload_json(quiz: Quiz) -> str:
+    """Async version of `get_quiz_payload_json`."""
+    key = quiz_payload_cache_key(quiz)
+    payload_json = await cache.aget(key)
+    if payload_json is not None:
+        return payload_json
+
+    payload_json = json.dumps(await aquiz_to_frontend(quiz))
+    await cache.aset(key, payload_json, QUIZ_PAYLOAD_CACHE_TIMEOUT)
+    logger.debug(f"Quiz payload cache miss for quiz ID {quiz.pk}; stored {key}.")
+    return payload_json
+
+
+def get_quiz_payload_etag(quiz: Quiz) -> str:
+    """
+    Return a strong ETag value (unquoted) for the current payload of a quiz.
+
+    The ETag is a SHA-256 hash of the payload JSON. It is cached next to the
+    payload so conditional requests can be answered without loading the payload.
+    """
+    key = quiz_payload_etag_cache_key(quiz)
+    etag = cache.get(key)
+    if etag is None:
+        payload_json = get_quiz_payload_json(quiz)
+        etag = hashlib.sha256(payload_json.encode("utf-8")).hexdigest()
+        cache.set(key, etag, QUIZ_PAYLOAD_CACHE_TIMEOUT)
+    return etag
+
+
+async def aget_quiz_payload_etag(quiz: Quiz) -> str:
+    """Async version of `get_quiz_payload_etag`."""
+    key = quiz_payload_etag_cache_key(quiz)
+    etag = await cache.aget(key)
+    if etag is None:
+        payload_json = await aget_quiz_payload_json(quiz)
+        etag = hashlib.sha256(payload_json.encode("utf-8")).hexdigest()
+        await cache.aset(key, etag, QUIZ_PAYLOAD_CACHE_TIMEOUT)
+    return etag
+
+
+def get_quiz_payload_window(quiz: Quiz, offset: int, limit: int) -> dict:
+    """
+    Return a window of the frontend payload for paged delivery.
+
+    Returns a dict with 'questions' (the slice), 'offset', 'limit' and 'total'.
+    Windows are cached per quiz version, so only the first request for a
+    window parses the full payload; windows starting past the last question
+    are returned empty and not cached.
+    """
+    key = (
+        f"{QUIZ_PAYLOAD_WINDOW_CACHE_PREFIX}:{quiz.pk}:{quiz_content_version(quiz)}"
+        f":{offset}:{limit}"
+    )
+    window = cache.get(key)
+    if window is None:
+        questions = json.loads(get_quiz_payload_json(quiz))
+        window = {
+            "questions": questions[offset : offset + limit],
+            "offset": offset,
+            "limit": limit,
+            "total": len(questions),
+        }
+        if offset < len(questions) or offset == 0:
+            cache.set(key, window, QUIZ_PAYLOAD_CACHE_TIMEOUT)
+    return window
+
+
+def _answer_key_rows(quiz_id: int):
+    return (
+        Option.objects.filter(question__quiz_id=quiz_id, is_correct=True)
+        .order_by("question_id", "position")
+        .values_list("question_id", "position")
+    )
+
+
+def _answer_key_from_rows(rows) -> dict:
+    answer_key = {}
+    for question_id, position in rows:
+        answer_key.setdefault(question_id, position - 1)  # 0-based for JS
+    return answer_key
+
+
+def build_quiz_answer_key(quiz_id: int) -> dict:
+    """
+    Return {question_id: correct 0-based option index} for every question of a quiz.
+
+    One query over the correct options. When several options are marked
+    correct the lowest position wins, matching `Question.correct_option()`.
+    Questions without a correct option are left out.
+    """
+    return _answer_key_from_rows(_answer_key_rows(quiz_id))
+
+
+def build_question_answer_key(question_ids) -> dict:
+    """
+    Return {question_id: correct 0-based option index} for the given questions.
+
+    Used to grade review sessions, whose questions span several quizzes. Not
+    cached: one query over the correct options of those questions only.
+    """
+    return _answer_key_from_rows(
+        Option.objects.filter(question_id__in=question_ids, is_correct=True)
+        .order_by("question_id", "position")
+        .values_list("question_id", "position")
+    )
+
+
+def quiz_answer_key_cache_key(quiz: Quiz) -> str:
+    """Return the cache key for the answer key of this quiz version."""
+    return f"{QUIZ_ANSWER_KEY_CACHE_PREFIX}:{quiz.pk}:{quiz_content_version(quiz)}"
+
+
+def get_quiz_answer_key(quiz: Quiz) -> dict:
+    """
+    Return the cached answer key of a quiz for scoring submissions.
+
+    Keyed on the quiz content version like the payload, so any option change
+    (which bumps `Quiz.updated_at`) is picked up on the next submission.
+    """
+    key = quiz_answer_key_cache_key(quiz)
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = build_quiz_answer_key(quiz.pk)
+        cache.set(key, answer_key, QUIZ_PAYLOAD_CACHE_TIMEOUT)
+    return answer_key
+
+
+def _question_order_rows(quiz_id: int):
+    return (
+        Question.objects.filter(quiz_id=quiz_id, is_active=True)
+        .order_by("position", "id")
+        .values_list("id", flat=True)
+    )
+
+
+def quiz_question_order_cache_key(quiz: Quiz) -> str:
+    """Return the cache key for the question order of this quiz version."""
+    return f"{QUIZ_QUESTION_ORDER_CACHE_PREFIX}:{quiz.pk}:{quiz_content_version(quiz)}"
+
+
+def get_quiz_question_order(quiz: Quiz) -> list:
+    """
+    Return the active question IDs of a quiz in the order the frontend shows them.
+
+    This is the order of `QuizAttempt.packed_answers`; cached per quiz version.
+    """
+    key = quiz_question_order_cache_key(quiz)
+    question_order = cache.get(key)
+    if question_order is None:
+        question_order = list(_question_order_rows(quiz.pk))
+        cache.set(key, question_order, QUIZ_PAYLOAD_CACHE_TIMEOUT)
+    return question_order
+
+
+def get_attempt_answer_sheet(attempt):
+    """
+    Return {question_id: (chosen_index or None, is_correct)} for every question
+    of the attempt's quiz, decoded from `QuizAttempt.packed_answers`.
+
+    The sheet stays decodable across quiz edits that keep the question order
+    (titles, question text, options). Returns None when the attempt has no
+    packed answers or questions were added, removed or reordered since it was
+    scored; callers then fall back to `QuestionResponse` rows or
+    `attempt_details`.
+    """
+    if attempt.packed_answers is None:
+        return None
+    question_order = get_quiz_question_order(attempt.quiz)
+    if attempt.answers_version != question_order_version(question_order):
+        return None
+    return attempt.answer_sheet(question_order)
+
+
+def touch_quiz(quiz_id: int) -> None:
+    """
+    Bump the content version of a quiz so cached payloads are no longer used.
+
+    Uses a queryset update so it works for bulk paths that bypass `save()`
+    and does not fire further signals. Also bumps the catalog version.
+    """
+    Quiz.objects.filter(pk=quiz_id).update(updated_at=timezone.now())
+    bump_catalog_version()
+
+
+def get_catalog_version() -> int:
+    """Return the current catalog version token (set on first use)."""
+    version = cache.get(CATALOG_VERSION_CACHE_KEY)
+    if version is None:
+        version = time.time_ns()
+        # add() so concurrent first readers agree on one token
+        if not cache.add(CATALOG_VERSION_CACHE_KEY, version, None):
+            version = cache.get(CATALOG_VERSION_CACHE_KEY, version)
+    return version
+
+
+def bump_catalog_version() -> None:
+    """Give the catalog a new version so derived structures are rebuilt."""
+    cache.set(CATALOG_VERSION_CACHE_KEY, time.time_ns(), None)
+
+
+def invalidate_quiz_payload(quiz: Quiz) -> None:
+    """Drop the cached payload and ETag for the current version of a quiz."""
+    cache.delete_many([quiz_payload_cache_key(quiz), quiz_payload_etag_cache_key(quiz)])
+
+
+def _attempted_quizzes_version_cache_key(user_id: int) -> str:
+    return f"{USER_ATTEMPTED_QUIZZES_VERSION_CACHE_PREFIX}:{user_id}"
+
+
+def _attempted_quizzes_version(user_id: int) -> int:
+    """Return the version token of a user's attempted-quiz set (set on first use)."""
+    version_key = _attempted_quizzes_version_cache_key(user_id)
+    version = cache.get(version_key)
+    if version is None:
+        version = time.time_ns()
+        # add() so concurrent first readers agree on one token
+        if not cache.add(version_key, version, None):
+            version = cache.get(version_key, version)
+    return version
+
+
+def user_attempted_quizzes_cache_key(user_id: int) -> str:
+    """Return the cache key for the current version of a user's attempted-quiz set."""
+    version = _attempted_quizzes_version(user_id)
+    return f"{USER_ATTEMPTED_QUIZZES_CACHE_PREFIX}:{user_id}:{version}"
+
+
+def _pack_quiz_ids(quiz_ids: Iterable[int]) -> bytes:
+    # 8 bytes per attempted quiz, sorted
+    return array("Q", sorted(quiz_ids)).tobytes()
+
+
+def _unpack_quiz_ids(packed: bytes) -> FrozenSet[int]:
+    quiz_ids = array("Q")
+    quiz_ids.frombytes(packed)
+    return frozenset(quiz_ids)
+
+
+def get_attempted_quiz_ids(user_id: int) -> FrozenSet[int]:
+    """
+    Return the IDs of the quizzes a user has attempted.
+
+    Read from the cache; on a miss, built with one DISTINCT query over the
+    user's attempts and cached under the version read before that query.
+    """
+    key = user_attempted_quizzes_cache_key(user_id)
+    packed = cache.get(key)
+    if packed is not None:
+        return _unpack_quiz_ids(packed)
+
+    quiz_ids = frozenset(
+        QuizAttempt.objects.filter(user_id=user_id)
+        .order_by()
+        .values_list("quiz_id", flat=True)
+        .distinct()
+    )
+    cache.set(key, _pack_quiz_ids(quiz_ids), USER_ATTEMPTED_QUIZZES_CACHE_TIMEOUT)
+    return quiz_ids
+
+
+def invalidate_attempted_quizzes(user_id: int) -> None:
+    """
+    Give a user's cached set a new version, after attempts were saved or deleted.
+
+    The next read rebuilds it; a rebuild racing with the change writes to the
+    old version's key, which is no longer read.
+    """
+    cache.set(_attempted_quizzes_version_cache_key(user_id), time.time_ns(), None)
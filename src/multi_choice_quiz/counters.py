@@ -0,0 +1,305 @@
+# src/multi_choice_quiz/counters.py
+"""
+Denormalized counters on Quiz: active_question_count, attempt_count and
+average_percentage.
+
+Question changes refresh the question count (signals, bulk import), saved
+attempts add to the attempt stats (`recording.py`) and `manage.py recount`
+repairs any drift. Every write is a queryset `update()`, which neither fires
+signals nor bumps `Quiz.updated_at`, so counters never invalidate the cached
+quiz payloads.
+
+The per-user read model for the profile page (`UserStats`, `UserQuizStats`)
+is kept here too: saved attempts are added to it, deleted ones trigger a
+rebuild of the user's rows, and `manage.py rebuild_user_stats` repairs drift.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence
+
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Avg,
+    Case,
+    Count,
+    DateTimeField,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    IntegerField,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Question, Quiz, QuizAttempt, UserQuizStats, UserStats
+
+
+def _quiz_subquery(queryset, aggregate, default):
+    """Correlated per-quiz aggregate of `queryset`, with `default` for no rows."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(quiz_id=OuterRef("pk"))
+            .order_by()
+            .values("quiz_id")
+            .annotate(value=aggregate)
+            .values("value")
+        ),
+        Value(default),
+    )
+
+
+def actual_active_question_count():
+    return _quiz_subquery(Question.objects.filter(is_active=True), Count("id"), 0)
+
+
+def actual_attempt_count():
+    return _quiz_subquery(QuizAttempt.objects.all(), Count("id"), 0)
+
+
+def actual_average_percentage():
+    return _quiz_subquery(QuizAttempt.objects.all(), Avg("percentage"), 0.0)
+
+
+def refresh_question_counts(quiz_ids: Iterable[int]) -> None:
+    """Recompute the active question count of the given quizzes (one UPDATE)."""
+    Quiz.objects.filter(pk__in=list(quiz_ids)).update(
+        active_question_count=actual_active_question_count()
+    )
+
+
+def refresh_attempt_stats(quiz_ids: Iterable[int]) -> None:
+    """Recompute the attempt count and average of the given quizzes (one UPDATE)."""
+    Quiz.objects.filter(pk__in=list(quiz_ids)).update(
+        attempt_count=actual_attempt_count(),
+        average_percentage=actual_average_percentage(),
+    )
+
+
+def add_attempt_stats(attempts: Sequence[QuizAttempt]) -> None:
+    """
+    Fold newly saved attempts into their quizzes' attempt stats.
+
+    One UPDATE per quiz; the new average is computed from the stored one in the
+    same statement, so concurrent submissions cannot lose an increment.
+    """
+    # {quiz_id: [attempts, sum of percentages]}
+    totals: Dict[int, list] = {}
+    for attempt in attempts:
+        total = totals.setdefault(attempt.quiz_id, [0, 0.0])
+        total[0] += 1
+        total[1] += float(attempt.percentage)
+
+    for quiz_id, (count, percentage_sum) in totals.items():
+        Quiz.objects.filter(pk=quiz_id).update(
+            average_percentage=ExpressionWrapper(
+                (F("average_percentage") * F("attempt_count") + percentage_sum)
+                / (F("attempt_count") + count),
+                output_field=FloatField(),
+            ),
+            attempt_count=F("attempt_count") + count,
+        )
+
+
+def recount_quizzes(
+    quiz_ids: Optional[Iterable[int]] = None, batch_size: int = 500
+) -> int:
+    """
+    Repair the counters of every quiz (or the given ones) that drifted.
+
+    Returns the number of quizzes whose counters were wrong. One SELECT of the
+    drifted quiz IDs, then one UPDATE per `batch_size` of them.
+    """
+    quizzes = Quiz.objects.all()
+    if quiz_ids is not None:
+        quizzes = quizzes.filter(pk__in=list(quiz_ids))
+    drifted_ids = list(
+        quizzes.annotate(
+            actual_questions=actual_active_question_count(),
+            actual_attempts=actual_attempt_count(),
+            actual_average=actual_average_percentage(),
+        )
+        .filter(
+            ~Q(active_question_count=F("actual_questions"))
+            | ~Q(attempt_count=F("actual_attempts"))
+            # Compare with a tolerance: the incremental average is a float.
+            | Q(average_percentage__gt=F("actual_average") + 1e-6)
+            | Q(average_percentage__lt=F("actual_average") - 1e-6)
+        )
+        .values_list("pk", flat=True)
+    )
+    for start in range(0, len(drifted_ids), batch_size):
+        Quiz.objects.filter(pk__in=drifted_ids[start : start + batch_size]).update(
+            active_question_count=actual_active_question_count(),
+            attempt_count=actual_attempt_count(),
+            average_percentage=actual_average_percentage(),
+        )
+    return len(drifted_ids)
+
+
+def _attempted_at():
+    return Coalesce("end_time", "start_time")
+
+
+def refresh_user_stats(user_ids: Iterable[int]) -> None:
+    """
+    Rebuild the UserStats row and UserQuizStats rows of the given users.
+
+    Per user: one aggregate and one grouped query over their attempts, then an
+    upsert of the totals and a delete + bulk insert of the per-quiz rows.
+    """
+    for user_id in set(user_ids):
+        attempts = QuizAttempt.objects.filter(user_id=user_id).order_by()
+        with transaction.atomic():
+            totals = attempts.aggregate(
+                attempt_count=Count("id"),
+                average_percentage=Avg("percentage"),
+                last_attempt_at=Max(_attempted_at()),
+            )
+            UserStats.objects.update_or_create(
+                user_id=user_id,
+                defaults={
+                    "attempt_count": totals["attempt_count"],
+                    "average_percentage": totals["average_percentage"] or 0,
+                    "last_attempt_at": totals["last_attempt_at"],
+                },
+            )
+            UserQuizStats.objects.filter(user_id=user_id).delete()
+            UserQuizStats.objects.bulk_create(
+                [
+                    UserQuizStats(user_id=user_id, **row)
+                    for row in attempts.values("quiz_id").annotate(
+                        attempt_count=Count("id"),
+                        best_percentage=Max("percentage"),
+                        last_attempt_at=Max(_attempted_at()),
+                    )
+                ]
+            )
+
+
+def get_user_stats(user_id: int) -> UserStats:
+    """Return the UserStats row of a user, building their stats on first use."""
+    try:
+        return UserStats.objects.get(user_id=user_id)
+    except UserStats.DoesNotExist:
+        refresh_user_stats([user_id])
+        return UserStats.objects.get(user_id=user_id)
+
+
+def _add_user_quiz_stats(user_id: int, user_quizzes: Dict[int, list]) -> None:
+    """
+    Fold {quiz_id: [attempts, best percentage, last attempted at]} into a
+    user's UserQuizStats rows.
+
+    If a concurrent first attempt on a quiz inserts its row in the meantime,
+    the insert is rolled back to its savepoint and those quizzes are added to
+    the now existing rows instead.
+    """
+    pending = user_quizzes
+    for retry in (False, True):
+        tracked = set(
+            UserQuizStats.objects.filter(
+                user_id=user_id, quiz_id__in=pending
+            ).values_list("quiz_id", flat=True)
+        )
+        if tracked:
+
+            def per_quiz(position, output_field):
+                return Case(
+                    *[
+                        When(quiz_id=q_id, then=Value(pending[q_id][position]))
+                        for q_id in tracked
+                    ],
+                    output_field=output_field,
+                )
+
+            UserQuizStats.objects.filter(user_id=user_id, quiz_id__in=tracked).update(
+                attempt_count=F("attempt_count") + per_quiz(0, IntegerField()),
+                best_percentage=Greatest(
+                    "best_percentage", per_quiz(1, FloatField())
+                ),
+                last_attempt_at=Greatest(
+                    "last_attempt_at", per_quiz(2, DateTimeField())
+                ),
+            )
+        pending = {
+            q_id: stats for q_id, stats in pending.items() if q_id not in tracked
+        }
+        if not pending:
+            return
+        try:
+            with transaction.atomic():
+                UserQuizStats.objects.bulk_create(
+                    [
+                        UserQuizStats(
+                            user_id=user_id,
+                            quiz_id=q_id,
+                            attempt_count=count,
+                            best_percentage=best,
+                            last_attempt_at=attempted_at,
+                        )
+                        for q_id, (count, best, attempted_at) in pending.items()
+                    ]
+                )
+            return
+        except IntegrityError:
+            if retry:
+                raise
+
+
+def add_user_stats(attempts: Sequence[QuizAttempt]) -> None:
+    """
+    Fold newly saved attempts by logged-in users into their stats rows.
+
+    Per user: one UPDATE of the totals, one query for the quizzes already
+    tracked, one UPDATE (with per-quiz CASE values) for those and one bulk
+    INSERT for new ones (`_add_user_quiz_stats`). Users without stats rows yet
+    are rebuilt from their attempts instead, which already include the new
+    ones.
+    """
+    # {user_id: [attempts, sum of percentages, last attempted at]}
+    totals: Dict[int, list] = {}
+    # {user_id: {quiz_id: [attempts, best percentage, last attempted at]}}
+    quizzes_by_user: Dict[int, Dict[int, list]] = {}
+    for attempt in attempts:
+        if attempt.user_id is None:
+            continue
+        percentage = float(attempt.percentage)
+        attempted_at = attempt.end_time or attempt.start_time or timezone.now()
+        total = totals.setdefault(attempt.user_id, [0, 0.0, attempted_at])
+        total[0] += 1
+        total[1] += percentage
+        total[2] = max(total[2], attempted_at)
+        user_quizzes = quizzes_by_user.setdefault(attempt.user_id, {})
+        quiz_stats = user_quizzes.get(attempt.quiz_id)
+        if quiz_stats is None:
+            user_quizzes[attempt.quiz_id] = [1, percentage, attempted_at]
+        else:
+            quiz_stats[0] += 1
+            quiz_stats[1] = max(quiz_stats[1], percentage)
+            quiz_stats[2] = max(quiz_stats[2], attempted_at)
+
+    unbuilt_user_ids = []
+    for user_id, (count, percentage_sum, last_attempt_at) in totals.items():
+        updated = UserStats.objects.filter(user_id=user_id).update(
+            average_percentage=ExpressionWrapper(
+                (F("average_percentage") * F("attempt_count") + percentage_sum)
+                / (F("attempt_count") + count),
+                output_field=FloatField(),
+            ),
+            attempt_count=F("attempt_count") + count,
+            last_attempt_at=Greatest(
+                Coalesce("last_attempt_at", Value(last_attempt_at)),
+                Value(last_attempt_at),
+            ),
+        )
+        if not updated:
+            unbuilt_user_ids.append(user_id)
+            continue
+
+        _add_user_quiz_stats(user_id, quizzes_by_user[user_id])
+    refresh_user_stats(unbuilt_user_ids)
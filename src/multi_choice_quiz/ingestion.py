@@ -0,0 +1,292 @@
+# src/multi_choice_quiz/ingestion.py
+"""
+Write-behind ingestion of quiz attempts.
+
+With `settings.ATTEMPT_INGESTION_MODE = "spool"`, `submit_quiz_attempt` grades
+the submission as usual but, instead of inserting the QuizAttempt, appends it
+to a local SQLite spool (WAL, synchronous=FULL, so the entry is durable once
+`spool_attempt` returns). A daemon thread per worker process drains the spool
+with bulk inserts (`recording.save_attempts`) every
+`ATTEMPT_SPOOL_FLUSH_INTERVAL` seconds.
+
+A flusher claims a batch under the spool's write lock, releases the lock,
+inserts the batch into the database and then deletes the claimed entries, so
+`spool_attempt` never waits on the main database. If the database is
+unavailable the claim is released and the entries are retried on the next
+flush; only entries that cannot be decoded or that the database rejects as
+invalid (IntegrityError, DataError) are dropped.
+
+Each entry carries a unique `idempotency_key`, and batches are inserted with
+`ignore_conflicts`, so a batch replayed after a crash between the database
+commit and the spool delete is not inserted twice. Entries left behind by a
+crashed process (including its stale claims) are replayed when the flusher
+starts (first request of a worker) or with `manage.py flush_attempt_spool`.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, close_old_connections
+
+from .models import QuizAttempt
+from .recording import save_attempts
+
+logger = logging.getLogger(__name__)
+
+SPOOL_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS spooled_attempt (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    spooled_at REAL NOT NULL,
+    claim TEXT,
+    claimed_at REAL
+)
+"""
+SPOOL_CLAIM_TIMEOUT = 10 * 60  # seconds; older claims belong to a dead flusher
+# Rows the database rejects for their content, not for being unavailable.
+DATA_ERRORS = (IntegrityError, DataError)
+# Spool entries that are not valid JSON or lack / mistype a field.
+DECODE_ERRORS = (ValueError, KeyError, TypeError, AttributeError)
+
+_local = threading.local()
+_flusher = None
+_flusher_lock = threading.Lock()
+
+
+def attempt_spool_enabled() -> bool:
+    """Return True if attempts are ingested via the spool."""
+    return settings.ATTEMPT_INGESTION_MODE == "spool"
+
+
+def _spool_connection() -> sqlite3.Connection:
+    """Return this thread's connection to the spool file, opening it if needed."""
+    path = settings.ATTEMPT_SPOOL_PATH
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(path)
+    if conn is None:
+        # Autocommit mode; multi-statement work uses explicit BEGIN/COMMIT.
+        conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.execute(SPOOL_TABLE_SQL)
+        columns = {
+            row[1] for row in conn.execute("PRAGMA table_info(spooled_attempt)")
+        }
+        for column, sql_type in (("claim", "TEXT"), ("claimed_at", "REAL")):
+            if column not in columns:  # Spool file from an older release
+                conn.execute(
+                    f"ALTER TABLE spooled_attempt ADD COLUMN {column} {sql_type}"
+                )
+        connections[path] = conn
+    return conn
+
+
+def spool_attempt(
+    quiz_id,
+    user_id,
+    score,
+    total_questions,
+    percentage,
+    end_time,
+    attempt_details,
+    responses=(),
+    packed_answers=None,
+    answers_version="",
+    idempotency_key=None,
+) -> str:
+    """
+    Append a validated attempt to the spool and return its idempotency key.
+
+    The client's key is kept if given, so a replay of the same attempt is
+    skipped when the entry is flushed. The entry is committed to disk before
+    this returns.
+    """
+    idempotency_key = idempotency_key or uuid.uuid4().hex
+    payload = {
+        "idempotency_key": idempotency_key,
+        "quiz_id": quiz_id,
+        "user_id": user_id,
+        "score": score,
+        "total_questions": total_questions,
+        "percentage": percentage,
+        "end_time": end_time.isoformat() if end_time else None,
+        "attempt_details": attempt_details,
+        "responses": [list(response) for response in responses],
+        "packed_answers": packed_answers.hex() if packed_answers is not None else None,
+        "answers_version": answers_version,
+    }
+    _spool_connection().execute(
+        "INSERT INTO spooled_attempt (payload, spooled_at) VALUES (?, ?)",
+        (json.dumps(payload), time.time()),
+    )
+    return idempotency_key
+
+
+def spooled_attempt_count() -> int:
+    """Return the number of attempts waiting in the spool."""
+    return _spool_connection().execute(
+        "SELECT COUNT(*) FROM spooled_attempt"
+    ).fetchone()[0]
+
+
+def _attempt_from_payload(payload: dict):
+    """Return (unsaved QuizAttempt, graded responses) for a spool entry."""
+    end_time = payload.get("end_time")
+    attempt = QuizAttempt(
+        quiz_id=payload["quiz_id"],
+        user_id=payload.get("user_id"),
+        score=payload["score"],
+        total_questions=payload["total_questions"],
+        percentage=payload["percentage"],
+        end_time=datetime.fromisoformat(end_time) if end_time else None,
+        attempt_details=payload.get("attempt_details"),
+        idempotency_key=payload["idempotency_key"],
+    )
+    if payload.get("packed_answers") is not None:
+        attempt.packed_answers = bytes.fromhex(payload["packed_answers"])
+        attempt.answers_version = payload.get("answers_version", "")
+    responses = [tuple(response) for response in payload.get("responses", [])]
+    return attempt, responses
+
+
+def _decode_batch(rows):
+    """
+    Return [(unsaved QuizAttempt, graded responses)] for claimed spool rows.
+
+    Entries that cannot be decoded are logged and dropped, like entries the
+    database rejects, so a corrupt entry cannot block the spool.
+    """
+    graded_attempts = []
+    for row_id, payload in rows:
+        try:
+            graded_attempts.append(_attempt_from_payload(json.loads(payload)))
+        except DECODE_ERRORS as e:
+            logger.error(f"Dropping undecodable spooled attempt entry {row_id}: {e!r}")
+    return graded_attempts
+
+
+def _insert_attempts(graded_attempts) -> None:
+    """
+    Insert a batch of attempts, skipping ones already stored.
+
+    If the database rejects the batch (e.g. the quiz or user was deleted since
+    the attempt was spooled), attempts are retried one by one and rejected ones
+    are logged and dropped so a single bad entry cannot block the spool. Other
+    database errors (connection lost, database unavailable) propagate, so the
+    caller keeps the entries for the next flush.
+    """
+    try:
+        save_attempts(graded_attempts)
+        return
+    except DATA_ERRORS as e:
+        logger.warning(
+            f"Bulk insert of {len(graded_attempts)} spooled attempts failed ({e}); "
+            "retrying one by one."
+        )
+
+    for attempt, responses in graded_attempts:
+        try:
+            save_attempts([(attempt, responses)])
+        except DATA_ERRORS as e:
+            logger.error(
+                f"Dropping spooled attempt {attempt.idempotency_key} "
+                f"(quiz ID {attempt.quiz_id}, user ID {attempt.user_id}): {e}"
+            )
+
+
+def _claim_batch(conn, batch_size):
+    """Claim up to `batch_size` entries; returns (claim, [(id, payload)])."""
+    claim = uuid.uuid4().hex
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rows = conn.execute(
+            "SELECT id, payload FROM spooled_attempt "
+            "WHERE claim IS NULL OR claimed_at < ? ORDER BY id LIMIT ?",
+            (now - SPOOL_CLAIM_TIMEOUT, batch_size),
+        ).fetchall()
+        conn.executemany(
+            "UPDATE spooled_attempt SET claim = ?, claimed_at = ? WHERE id = ?",
+            [(claim, now, row_id) for row_id, _ in rows],
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return claim, rows
+
+
+def flush_spool(batch_size=None) -> int:
+    """
+    Move every spooled attempt into the database, in batches.
+
+    Each batch is claimed under the spool's write lock, so concurrent flushers
+    (one per worker process) never take the same entries, but the lock is
+    released before the database insert. Undecodable entries and rejected data
+    are dropped; if the insert fails for any other reason, the claim is
+    released and the error propagates.
+    Returns the number of spooled entries processed.
+    """
+    batch_size = batch_size or settings.ATTEMPT_SPOOL_BATCH_SIZE
+    conn = _spool_connection()
+    flushed = 0
+    while True:
+        claim, rows = _claim_batch(conn, batch_size)
+        if not rows:
+            return flushed
+        try:
+            graded_attempts = _decode_batch(rows)
+            if graded_attempts:
+                _insert_attempts(graded_attempts)
+        except BaseException:
+            conn.execute(
+                "UPDATE spooled_attempt SET claim = NULL, claimed_at = NULL "
+                "WHERE claim = ?",
+                (claim,),
+            )
+            raise
+        conn.execute("DELETE FROM spooled_attempt WHERE claim = ?", (claim,))
+        flushed += len(rows)
+        logger.info(f"Flushed {len(rows)} spooled quiz attempts.")
+
+
+class SpoolFlusher(threading.Thread):
+    """Daemon thread draining the attempt spool at a fixed interval."""
+
+    def __init__(self, interval):
+        super().__init__(name="attempt-spool-flusher", daemon=True)
+        self.interval = interval
+
+    def run(self):
+        while True:
+            try:
+                flush_spool()
+            except Exception as e:
+                logger.error(f"Attempt spool flush failed: {e}", exc_info=True)
+            finally:
+                close_old_connections()
+            time.sleep(self.interval)
+
+
+def start_spool_flusher() -> None:
+    """Start the flusher thread of this process, if not already running."""
+    global _flusher
+    with _flusher_lock:
+        if _flusher is None or not _flusher.is_alive():
+            # The first pass replays whatever a crashed process left behind.
+            _flusher = SpoolFlusher(settings.ATTEMPT_SPOOL_FLUSH_INTERVAL)
+            _flusher.start()
+            logger.info("Started attempt spool flusher thread.")
+
+
+def start_spool_flusher_on_request(sender, **kwargs) -> None:
+    """request_started receiver: start the flusher in server processes only."""
+    start_spool_flusher()
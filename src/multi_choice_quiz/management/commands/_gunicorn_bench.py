@@ -0,0 +1,29 @@
+# src/multi_choice_quiz/management/commands/_gunicorn_bench.py
+"""
+Gunicorn config used by `manage.py benchmark_servers`.
+
+Adds BENCH_DB_LATENCY_MS of blocking sleep to every database query in the
+worker, standing in for the network round trip to Cloud SQL.
+"""
+
+import os
+import time
+
+
+def post_worker_init(worker):
+    latency = float(os.environ.get("BENCH_DB_LATENCY_MS", "0")) / 1000
+    if not latency:
+        return
+
+    from django.db.backends.signals import connection_created
+
+    def slow_query(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    def add_latency(sender, connection, **kwargs):
+        # Sent on every reconnect of the same (per-thread) connection wrapper.
+        if slow_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(slow_query)
+
+    connection_created.connect(add_latency, weak=False)
@@ -0,0 +1,95 @@
+# src/multi_choice_quiz/management/commands/backfill_question_responses.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from multi_choice_quiz.models import Question, QuestionResponse, QuizAttempt
+from multi_choice_quiz.scoring import chosen_option_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Create QuestionResponse rows for attempts saved before the table "
+        "existed, from their attempt_details JSON. Only mistakes were stored "
+        "there, so only incorrect responses can be backfilled. Attempts that "
+        "already have responses are skipped, so the command can be re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Attempts per batch"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        pending = (
+            QuizAttempt.objects.filter(attempt_details__isnull=False)
+            .filter(~Exists(QuestionResponse.objects.filter(attempt=OuterRef("pk"))))
+            .order_by("id")
+        )
+
+        last_id = 0
+        total_attempts = total_responses = skipped = 0
+        while True:
+            batch = list(
+                pending.filter(id__gt=last_id).values_list("id", "attempt_details")[
+                    :batch_size
+                ]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            details_by_attempt = {
+                attempt_id: details
+                for attempt_id, details in batch
+                if isinstance(details, dict)
+            }
+            question_ids = set()
+            for details in details_by_attempt.values():
+                question_ids.update(
+                    int(q_id) for q_id in details if str(q_id).isdigit()
+                )
+            existing_questions = set(
+                Question.objects.filter(id__in=question_ids).values_list(
+                    "id", flat=True
+                )
+            )
+
+            responses = []
+            for attempt_id, details in details_by_attempt.items():
+                for q_id, mistake in details.items():
+                    question_id = int(q_id) if str(q_id).isdigit() else None
+                    if question_id not in existing_questions:
+                        skipped += 1  # Malformed key or question deleted since
+                        continue
+                    user_answer_idx = (
+                        mistake.get("user_answer_idx")
+                        if isinstance(mistake, dict)
+                        else None
+                    )
+                    responses.append(
+                        QuestionResponse(
+                            attempt_id=attempt_id,
+                            question_id=question_id,
+                            chosen_index=chosen_option_index(user_answer_idx),
+                            is_correct=False,
+                        )
+                    )
+
+            with transaction.atomic():
+                QuestionResponse.objects.bulk_create(responses, ignore_conflicts=True)
+            total_attempts += len(batch)
+            total_responses += len(responses)
+            self.stdout.write(
+                f"Backfilled {len(responses)} responses for {len(batch)} attempts "
+                f"(up to attempt ID {last_id})."
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {total_responses} responses for {total_attempts} attempts"
+                f" ({skipped} entries for missing questions skipped)."
+            )
+        )
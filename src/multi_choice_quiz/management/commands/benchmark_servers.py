@@ -0,0 +1,188 @@
+# src/multi_choice_quiz/management/commands/benchmark_servers.py
+
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from multi_choice_quiz.models import Question
+from multi_choice_quiz.utils import quiz_bank_to_models
+
+SERVERS = {
+    # Sync workers: each in-flight request holds one of workers x threads.
+    "wsgi": lambda workers, threads: [
+        "core.wsgi",
+        "--workers",
+        str(workers),
+        "--threads",
+        str(threads),
+    ],
+    # Event-loop workers: async views await the ORM instead of holding a thread.
+    "asgi": lambda workers, threads: [
+        "core.asgi",
+        "--workers",
+        str(workers),
+        "--worker-class",
+        "uvicorn_worker.UvicornWorker",
+    ],
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the quiz data and submit endpoints under gunicorn (WSGI, "
+        "threads) vs. gunicorn with uvicorn workers (ASGI) at the same worker "
+        "count, with simulated database latency. Creates a temporary quiz in "
+        "the configured database and deletes it afterwards; point DATABASE_URL "
+        "at a throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument(
+            "--threads", type=int, default=4, help="Threads per WSGI worker"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=32, help="Concurrent clients"
+        )
+        parser.add_argument("--requests", type=int, default=400)
+        parser.add_argument(
+            "--db-latency-ms",
+            type=float,
+            default=20,
+            help="Added to every query, standing in for a Cloud SQL round trip",
+        )
+        parser.add_argument(
+            "--endpoint", choices=["data", "submit"], default="submit"
+        )
+        parser.add_argument(
+            "--server", choices=["wsgi", "asgi", "both"], default="both"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            import gunicorn  # noqa: F401
+            import uvicorn_worker  # noqa: F401
+        except ImportError as e:
+            raise CommandError(
+                f"{e.name} is required (pip install gunicorn uvicorn-worker)."
+            )
+
+        quiz = quiz_bank_to_models(
+            [
+                {
+                    "text": f"Server benchmark question {i}?",
+                    "options": ["A", "B", "C", "D"],
+                    "answerIndex": (i % 4) + 1,
+                }
+                for i in range(20)
+            ],
+            "Server Benchmark Quiz",
+        )
+        try:
+            self.stdout.write(
+                f"{options['endpoint']} endpoint, {options['requests']} requests, "
+                f"{options['concurrency']} concurrent clients, "
+                f"{options['workers']} workers, "
+                f"{options['db_latency_ms']:.0f} ms per query.\n"
+            )
+            servers = ["wsgi", "asgi"] if options["server"] == "both" else [options["server"]]
+            for server in servers:
+                self._run_server(server, quiz, options)
+        finally:
+            quiz.delete()
+
+    def _request_factory(self, base_url, quiz, endpoint):
+        if endpoint == "data":
+            url = f"{base_url}/quiz/{quiz.id}/data.json"
+            return lambda: urllib.request.Request(url)
+
+        question_ids = list(
+            Question.objects.filter(quiz=quiz).values_list("id", flat=True)
+        )
+        body = json.dumps(
+            {
+                "quiz_id": quiz.id,
+                "score": 0,
+                "total_questions": len(question_ids),
+                "percentage": 0,
+                "end_time": datetime.now(timezone.utc).isoformat(),
+                "attempt_details": {str(q_id): 0 for q_id in question_ids},
+            }
+        ).encode()
+        url = f"{base_url}/quiz/submit_attempt/"
+        return lambda: urllib.request.Request(
+            url, data=body, headers={"Content-Type": "application/json"}
+        )
+
+    def _run_server(self, server, quiz, options):
+        port = _free_port()
+        command = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            *SERVERS[server](options["workers"], options["threads"]),
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--config",
+            "python:multi_choice_quiz.management.commands._gunicorn_bench",
+            "--log-level",
+            "warning",
+        ]
+        env = dict(os.environ, BENCH_DB_LATENCY_MS=str(options["db_latency_ms"]))
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            self._wait_until_ready(base_url, process)
+            make_request = self._request_factory(base_url, quiz, options["endpoint"])
+
+            def timed_request(_):
+                start = time.perf_counter()
+                with urllib.request.urlopen(make_request(), timeout=60) as response:
+                    response.read()
+                return (time.perf_counter() - start) * 1000
+
+            # Warm up connections and caches in every worker.
+            with ThreadPoolExecutor(options["concurrency"]) as pool:
+                list(pool.map(timed_request, range(options["concurrency"])))
+                start = time.perf_counter()
+                timings = sorted(pool.map(timed_request, range(options["requests"])))
+                elapsed = time.perf_counter() - start
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+        p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+        self.stdout.write(
+            self.style.SUCCESS(f"{server}:")
+            + f" {len(timings) / elapsed:.1f} req/s,"
+            f" median {statistics.median(timings):.1f} ms,"
+            f" p95 {p95:.1f} ms"
+        )
+
+    def _wait_until_ready(self, base_url, process, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"Server exited with code {process.returncode}.")
+            try:
+                urllib.request.urlopen(f"{base_url}/quiz/", timeout=2).read()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError("Server did not start in time.")
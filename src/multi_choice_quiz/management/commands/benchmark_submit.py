@@ -0,0 +1,122 @@
+# src/multi_choice_quiz/management/commands/benchmark_submit.py
+
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+
+from multi_choice_quiz.models import Question
+from multi_choice_quiz.utils import quiz_bank_to_models
+
+
+class _Rollback(Exception):
+    """Raised to discard the benchmark data."""
+
+
+def legacy_answer_key(quiz):
+    """Scoring lookup as done before the answer-key cache (N+1 queries)."""
+    return {q.id: q.correct_option_index() for q in Question.objects.filter(quiz=quiz)}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark submit_quiz_attempt latency with the legacy per-question "
+        "scoring vs. the cached answer key. Runs inside a transaction that is "
+        "rolled back, so no data is kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--questions", type=int, default=100, help="Questions in the quiz"
+        )
+        parser.add_argument(
+            "--runs", type=int, default=50, help="Submissions per variant"
+        )
+
+    def handle(self, *args, **options):
+        num_questions = options["questions"]
+        runs = options["runs"]
+
+        try:
+            with transaction.atomic():
+                self._run(num_questions, runs)
+                raise _Rollback()
+        except _Rollback:
+            self.stdout.write("Benchmark data rolled back.")
+
+    def _run(self, num_questions, runs):
+        quiz = quiz_bank_to_models(
+            [
+                {
+                    "text": f"Benchmark question {i}?",
+                    "options": ["A", "B", "C", "D"],
+                    "answerIndex": (i % 4) + 1,
+                }
+                for i in range(num_questions)
+            ],
+            "Submit Benchmark Quiz",
+        )
+        question_ids = list(
+            Question.objects.filter(quiz=quiz).values_list("id", flat=True)
+        )
+        payload = json.dumps(
+            {
+                "quiz_id": quiz.id,
+                "score": 0,
+                "total_questions": num_questions,
+                "percentage": 0,
+                "end_time": datetime.now(timezone.utc).isoformat(),
+                # Always answer index 0, so roughly 3/4 are recorded as mistakes
+                "attempt_details": {str(q_id): 0 for q_id in question_ids},
+            }
+        )
+        client = Client()
+        url = reverse("multi_choice_quiz:submit_quiz_attempt")
+
+        def submit():
+            response = client.post(url, data=payload, content_type="application/json")
+            if response.status_code != 200:
+                raise RuntimeError(f"Submission failed: {response.status_code}")
+
+        self.stdout.write(
+            f"Quiz with {num_questions} questions, {runs} submissions per variant.\n"
+        )
+        with mock.patch(
+            "multi_choice_quiz.views.get_quiz_answer_key", new=legacy_answer_key
+        ):
+            self._measure("before (per-question scoring)", submit, runs)
+
+        submit()  # Warm the answer-key cache
+        self._measure("after (cached answer key)", submit, runs)
+
+    def _measure(self, label, submit, runs):
+        timings = []
+        executed = []
+
+        def count_query(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        # connection.queries is reset per request, so count via a wrapper.
+        with connection.execute_wrapper(count_query):
+            submit()
+        for _ in range(runs):
+            start = time.perf_counter()
+            submit()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+        self.stdout.write(
+            self.style.SUCCESS(f"{label}:")
+            + f" mean {statistics.mean(timings):.2f} ms,"
+            f" median {statistics.median(timings):.2f} ms,"
+            f" p95 {p95:.2f} ms,"
+            f" {len(executed)} queries per submission"
+        )
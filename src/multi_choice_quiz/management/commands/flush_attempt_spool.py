@@ -0,0 +1,31 @@
+# src/multi_choice_quiz/management/commands/flush_attempt_spool.py
+
+from django.core.management.base import BaseCommand
+
+from multi_choice_quiz.ingestion import flush_spool, spooled_attempt_count
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert all quiz attempts waiting in the local attempt spool "
+        "(ATTEMPT_INGESTION_MODE=spool). Safe to run while the server is up and "
+        "after a crash: entries already inserted are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Attempts per bulk insert (default: ATTEMPT_SPOOL_BATCH_SIZE)",
+        )
+
+    def handle(self, *args, **options):
+        pending = spooled_attempt_count()
+        if not pending:
+            self.stdout.write("Attempt spool is empty.")
+            return
+        flushed = flush_spool(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Flushed {flushed} spooled quiz attempts.")
+        )
@@ -0,0 +1,26 @@
+# src/multi_choice_quiz/management/commands/rebuild_search_index.py
+
+from django.core.management.base import BaseCommand
+
+from multi_choice_quiz.search import rebuild_search_index, search_backend
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the full-text search index over quizzes, questions and options. "
+        "Imports and model saves keep it up to date afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=200, help="Quizzes per batch"
+        )
+
+    def handle(self, *args, **options):
+        if search_backend() is None:
+            self.stdout.write(
+                self.style.WARNING("No search index on this database; nothing to do.")
+            )
+            return
+        count = rebuild_search_index(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} quizzes."))
@@ -0,0 +1,66 @@
+# src/multi_choice_quiz/management/commands/rebuild_user_mistakes.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from multi_choice_quiz.models import QuestionResponse, UserMistake
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the UserMistake index from the stored QuestionResponse rows "
+        "(run backfill_question_responses first for older attempts). Submits "
+        "keep the index up to date afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows per insert batch"
+        )
+
+    def handle(self, *args, **options):
+        misses = QuestionResponse.objects.filter(
+            is_correct=False, attempt__user__isnull=False
+        )
+        last_miss = misses.filter(
+            attempt__user_id=OuterRef("attempt__user_id"),
+            question_id=OuterRef("question_id"),
+        ).order_by(
+            Coalesce("attempt__end_time", "attempt__start_time").desc(), "-attempt_id"
+        )
+        rows = (
+            misses.values("attempt__user_id", "question_id")
+            .annotate(
+                miss_count=Count("id"),
+                last_missed_at=Coalesce(
+                    Max("attempt__end_time"), Max("attempt__start_time")
+                ),
+                last_chosen_index=Subquery(last_miss.values("chosen_index")[:1]),
+            )
+            .order_by()
+        )
+
+        with transaction.atomic():
+            UserMistake.objects.all().delete()
+            total = 0
+            batch = []
+            for row in rows.iterator():
+                batch.append(
+                    UserMistake(
+                        user_id=row["attempt__user_id"],
+                        question_id=row["question_id"],
+                        miss_count=row["miss_count"],
+                        last_missed_at=row["last_missed_at"],
+                        last_chosen_index=row["last_chosen_index"],
+                    )
+                )
+                if len(batch) >= options["batch_size"]:
+                    UserMistake.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = []
+            UserMistake.objects.bulk_create(batch)
+            total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} user mistake rows."))
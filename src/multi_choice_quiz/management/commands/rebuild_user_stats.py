@@ -0,0 +1,31 @@
+# src/multi_choice_quiz/management/commands/rebuild_user_stats.py
+
+from django.core.management.base import BaseCommand
+
+from multi_choice_quiz.counters import refresh_user_stats
+from multi_choice_quiz.models import QuizAttempt
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the UserStats and UserQuizStats rows behind the profile page "
+        "from the stored attempts. Submits keep them up to date afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "user_ids", nargs="*", type=int, help="Only rebuild these users"
+        )
+
+    def handle(self, *args, **options):
+        user_ids = options["user_ids"] or (
+            QuizAttempt.objects.filter(user__isnull=False)
+            .order_by()
+            .values_list("user_id", flat=True)
+            .distinct()
+        )
+        user_ids = list(user_ids)
+        refresh_user_stats(user_ids)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt stats for {len(user_ids)} users.")
+        )
@@ -0,0 +1,26 @@
+# src/multi_choice_quiz/management/commands/recount.py
+
+from django.core.management.base import BaseCommand
+
+from multi_choice_quiz.counters import recount_quizzes
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the denormalized counters on Quiz (active question count, "
+        "attempt count, average percentage) and fix the quizzes that drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "quiz_ids", nargs="*", type=int, help="Only recount these quizzes"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Quizzes per UPDATE"
+        )
+
+    def handle(self, *args, **options):
+        fixed = recount_quizzes(options["quiz_ids"] or None, options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Recounted quizzes: {fixed} had drifted and were fixed.")
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-16 20:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizattempt',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, help_text='Set when the attempt is ingested via the spool, so a replayed batch is not inserted twice', max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.15 on 2026-10-16 20:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0002_quizattempt_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='quizattempt',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, help_text='Client- or spool-generated key, so a retried or replayed insert is not stored twice', max_length=64, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='QuestionResponse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chosen_index', models.SmallIntegerField(blank=True, help_text='Chosen option (0-based), if valid', null=True)),
+                ('is_correct', models.BooleanField()),
+                ('attempt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='responses', to='multi_choice_quiz.quizattempt')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='responses', to='multi_choice_quiz.question')),
+            ],
+            options={
+                'verbose_name': 'Question Response',
+                'verbose_name_plural': 'Question Responses',
+                'indexes': [models.Index(fields=['question', 'is_correct'], name='response_question_correct')],
+                'constraints': [models.UniqueConstraint(fields=('attempt', 'question'), name='unique_response_per_attempt')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0003_questionresponse'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizattempt',
+            name='answers_version',
+            field=models.CharField(blank=True, editable=False, help_text='Quiz content version the packed answers were scored against', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='quizattempt',
+            name='packed_answers',
+            field=models.BinaryField(blank=True, help_text='Every answer in quiz question order, one byte per question (see scoring.pack_answers)', null=True),
+        ),
+    ]
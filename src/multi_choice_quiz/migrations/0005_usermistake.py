@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0004_quizattempt_packed_answers'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserMistake',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('miss_count', models.PositiveIntegerField(default=1)),
+                ('last_missed_at', models.DateTimeField()),
+                ('last_chosen_index', models.SmallIntegerField(blank=True, help_text='Option chosen on the last miss (0-based)', null=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_mistakes', to='multi_choice_quiz.question')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mistakes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Mistake',
+                'verbose_name_plural': 'User Mistakes',
+                'ordering': ['-last_missed_at', '-id'],
+                'indexes': [models.Index(fields=['user', '-last_missed_at', '-id'], name='mistake_user_recent')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'question'), name='unique_mistake_per_user_question')],
+            },
+        ),
+    ]
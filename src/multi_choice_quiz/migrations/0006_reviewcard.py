@@ -0,0 +1,37 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0005_usermistake'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewCard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('interval_days', models.PositiveIntegerField(default=0, help_text='Days until the next review after the last one')),
+                ('ease', models.FloatField(default=2.5, help_text='SM-2 ease factor')),
+                ('repetitions', models.PositiveIntegerField(default=0, help_text='Consecutive correct reviews')),
+                ('lapses', models.PositiveIntegerField(default=0)),
+                ('next_due', models.DateTimeField()),
+                ('last_reviewed_at', models.DateTimeField()),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_cards', to='multi_choice_quiz.question')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_cards', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Review Card',
+                'verbose_name_plural': 'Review Cards',
+                'ordering': ['next_due', 'id'],
+                'indexes': [models.Index(fields=['user', 'next_due'], name='review_card_user_due')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'question'), name='unique_review_card_per_user_question')],
+            },
+        ),
+    ]
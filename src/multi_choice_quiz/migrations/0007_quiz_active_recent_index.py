@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0006_reviewcard'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='quiz_active_recent'),
+        ),
+    ]
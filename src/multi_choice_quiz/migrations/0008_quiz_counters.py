@@ -0,0 +1,59 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:16
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_quiz_counters(apps, schema_editor):
+    Quiz = apps.get_model("multi_choice_quiz", "Quiz")
+    Question = apps.get_model("multi_choice_quiz", "Question")
+    QuizAttempt = apps.get_model("multi_choice_quiz", "QuizAttempt")
+
+    def per_quiz(queryset, aggregate, default):
+        return Coalesce(
+            Subquery(
+                queryset.filter(quiz_id=OuterRef("pk"))
+                .order_by()
+                .values("quiz_id")
+                .annotate(value=aggregate)
+                .values("value")
+            ),
+            Value(default),
+        )
+
+    Quiz.objects.update(
+        active_question_count=per_quiz(
+            Question.objects.filter(is_active=True), Count("id"), 0
+        ),
+        attempt_count=per_quiz(QuizAttempt.objects.all(), Count("id"), 0),
+        average_percentage=per_quiz(
+            QuizAttempt.objects.all(), Avg("percentage"), 0.0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0007_quiz_active_recent_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='active_question_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='attempt_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='average_percentage',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_quiz_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Avg, Count, Max
+from django.db.models.functions import Coalesce
+
+
+def fill_user_stats(apps, schema_editor):
+    QuizAttempt = apps.get_model("multi_choice_quiz", "QuizAttempt")
+    UserStats = apps.get_model("multi_choice_quiz", "UserStats")
+    UserQuizStats = apps.get_model("multi_choice_quiz", "UserQuizStats")
+
+    attempts = QuizAttempt.objects.filter(user__isnull=False).order_by()
+    attempted_at = Coalesce("end_time", "start_time")
+    UserStats.objects.bulk_create(
+        [
+            UserStats(
+                user_id=row["user_id"],
+                attempt_count=row["attempt_count"],
+                average_percentage=row["average_percentage"] or 0,
+                last_attempt_at=row["last_attempt_at"],
+            )
+            for row in attempts.values("user_id").annotate(
+                attempt_count=Count("id"),
+                average_percentage=Avg("percentage"),
+                last_attempt_at=Max(attempted_at),
+            )
+        ],
+        batch_size=1000,
+    )
+    UserQuizStats.objects.bulk_create(
+        [
+            UserQuizStats(**row)
+            for row in attempts.values("user_id", "quiz_id").annotate(
+                attempt_count=Count("id"),
+                best_percentage=Max("percentage"),
+                last_attempt_at=Max(attempted_at),
+            )
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0008_quiz_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='quiz_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('average_percentage', models.FloatField(default=0)),
+                ('last_attempt_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'User Stats',
+                'verbose_name_plural': 'User Stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserQuizStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('best_percentage', models.FloatField(default=0)),
+                ('last_attempt_at', models.DateTimeField()),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_stats', to='multi_choice_quiz.quiz')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quiz_stats_by_quiz', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Quiz Stats',
+                'verbose_name_plural': 'User Quiz Stats',
+                'constraints': [models.UniqueConstraint(fields=('user', 'quiz'), name='unique_stats_per_user_quiz')],
+            },
+        ),
+        migrations.RunPython(fill_user_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0009_userstats_userquizstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['user', '-end_time', '-id'], name='attempt_user_recent'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:50
+
+from django.db import migrations
+
+# Kept in sync with multi_choice_quiz.search, which reads and writes this table.
+TABLE = "multi_choice_quiz_searchindex"
+
+QUESTION_BODY = {
+    "sqlite": (
+        # group_concat has no ORDER BY before SQLite 3.44; aggregate an
+        # ordered subquery instead.
+        "qu.text || COALESCE(char(10) || (SELECT group_concat(text, char(10)) "
+        "FROM (SELECT o.text FROM multi_choice_quiz_option o "
+        "WHERE o.question_id = qu.id ORDER BY o.position)), '')"
+    ),
+    "postgresql": (
+        "qu.text || COALESCE(E'\\n' || (SELECT string_agg(o.text, E'\\n' "
+        "ORDER BY o.position) FROM multi_choice_quiz_option o "
+        "WHERE o.question_id = qu.id), '')"
+    ),
+}
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {TABLE} USING fts5("
+            "title, body, quiz_id UNINDEXED, question_id UNINDEXED, "
+            "tokenize = 'porter unicode61')"
+        )
+        columns = "quiz_id, question_id, title, body"
+        quiz_values = "id, NULL, title, description"
+        question_values = f"qu.quiz_id, qu.id, qz.title, {QUESTION_BODY[vendor]}"
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE TABLE {TABLE} (id bigserial PRIMARY KEY, quiz_id bigint NOT NULL, "
+            "question_id bigint NULL, document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX {TABLE}_document ON {TABLE} USING gin (document)"
+        )
+        schema_editor.execute(f"CREATE INDEX {TABLE}_quiz ON {TABLE} (quiz_id)")
+        schema_editor.execute(f"CREATE INDEX {TABLE}_question ON {TABLE} (question_id)")
+
+        def document(title, body):
+            return (
+                f"setweight(to_tsvector('english', {title}), 'A') || "
+                f"setweight(to_tsvector('english', {body}), 'B')"
+            )
+
+        columns = "quiz_id, question_id, document"
+        quiz_values = f"id, NULL, {document('title', 'description')}"
+        question_values = (
+            f"qu.quiz_id, qu.id, {document('qz.title', QUESTION_BODY[vendor])}"
+        )
+    else:
+        return  # No index; multi_choice_quiz.search falls back to icontains
+
+    schema_editor.execute(
+        f"INSERT INTO {TABLE} ({columns}) SELECT {quiz_values} "
+        "FROM multi_choice_quiz_quiz"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {TABLE} ({columns}) SELECT {question_values} "
+        "FROM multi_choice_quiz_question qu "
+        "JOIN multi_choice_quiz_quiz qz ON qz.id = qu.quiz_id WHERE qu.is_active"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0010_quizattempt_user_recent_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:42
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0011_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='quizattempt',
+            name='attempt_user_recent',
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(models.F('user'), models.OrderBy(django.db.models.functions.comparison.Coalesce('end_time', 'start_time'), descending=True), models.OrderBy(models.F('id'), descending=True), name='attempt_user_recent'),
+        ),
+    ]
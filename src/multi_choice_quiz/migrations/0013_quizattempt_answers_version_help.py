@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0012_quizattempt_user_recent_coalesce'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='quizattempt',
+            name='answers_version',
+            field=models.CharField(blank=True, editable=False, help_text='Digest of the question order the packed answers were stored in (see scoring.question_order_version)', max_length=32),
+        ),
+    ]
@@ -1,7 +1,12 @@
 # src/multi_choice_quiz/models.py
 from django.db import models
 from django.contrib.auth import get_user_model  # <<< Add this import
-from django.db.models import JSONField  # <<< ADD THIS IMPORT
+from django.db.models import F, JSONField  # <<< ADD THIS IMPORT
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
+
+from .scheduling import INITIAL_EASE
+from .scoring import unpack_answers
 
 
 class Topic(models.Model):
@@ -28,13 +33,17 @@ class Quiz(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Denormalized counters, maintained by `counters.py` (see the `recount` command)
+    active_question_count = models.PositiveIntegerField(default=0, editable=False)
+    attempt_count = models.PositiveIntegerField(default=0, editable=False)
+    average_percentage = models.FloatField(default=0, editable=False)
 
     def __str__(self):
         return self.title
 
     def question_count(self):
-        """Return the number of questions in this quiz."""
-        return self.questions.count()
+        """Return the number of active questions in this quiz (stored counter)."""
+        return self.active_question_count
 
     def get_topics_display(self):
         """Return a comma-separated list of topic names."""
@@ -44,6 +53,12 @@ class Quiz(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Quiz"
         verbose_name_plural = "Quizzes"
+        indexes = [
+            # Keyset pagination of the catalog (pages.catalog)
+            models.Index(
+                fields=["is_active", "-created_at", "-id"], name="quiz_active_recent"
+            ),
+        ]
 
 
 class Question(models.Model):
@@ -168,6 +183,49 @@ class QuizAttempt(models.Model):
     )
     # <<< END NEW FIELD ADDITION >>>
 
+    idempotency_key = models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Client- or spool-generated key, so a retried or replayed insert is not stored twice",
+    )
+
+    packed_answers = models.BinaryField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Every answer in quiz question order, one byte per question (see scoring.pack_answers)",
+    )
+    answers_version = models.CharField(
+        max_length=32,
+        blank=True,
+        editable=False,
+        help_text="Digest of the question order the packed answers were stored in (see scoring.question_order_version)",
+    )
+
+    @cached_property
+    def unpacked_answers(self):
+        """
+        Return [(chosen 0-based index or None, is_correct)] in quiz question order,
+        decoded from `packed_answers` on first access (None if not stored).
+        """
+        if self.packed_answers is None:
+            return None
+        return unpack_answers(bytes(self.packed_answers))
+
+    def answer_sheet(self, question_order):
+        """
+        Pair the unpacked answers with question IDs.
+
+        `question_order` must be the question order of `answers_version`; see
+        `caching.get_attempt_answer_sheet` for the version-checked lookup.
+        """
+        if self.unpacked_answers is None:
+            return None
+        return dict(zip(question_order, self.unpacked_answers))
+
     def __str__(self):
         user_str = f"User {self.user.username}" if self.user else "Anonymous User"
         return f"{user_str}'s attempt on {self.quiz.title} ({self.score}/{self.total_questions})"
@@ -176,3 +234,185 @@ class QuizAttempt(models.Model):
         ordering = ["-start_time"]  # Show most recent attempts first
         verbose_name = "Quiz Attempt"
         verbose_name_plural = "Quiz Attempts"
+        indexes = [
+            # Keyset pages of a user's history (pages.history); attempts
+            # without an end_time sort by their start_time.
+            models.Index(
+                F("user"),
+                Coalesce("end_time", "start_time").desc(),
+                F("id").desc(),
+                name="attempt_user_recent",
+            ),
+        ]
+
+
+class QuestionResponse(models.Model):
+    """
+    One answered question of a quiz attempt.
+
+    Normalized companion to `QuizAttempt.attempt_details`, written in bulk
+    when an attempt is saved, so per-question statistics are plain queries.
+    """
+
+    attempt = models.ForeignKey(
+        QuizAttempt, on_delete=models.CASCADE, related_name="responses"
+    )
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name="responses"
+    )
+    chosen_index = models.SmallIntegerField(
+        null=True, blank=True, help_text="Chosen option (0-based), if valid"
+    )
+    is_correct = models.BooleanField()
+
+    def __str__(self):
+        outcome = "correct" if self.is_correct else "incorrect"
+        return f"Attempt {self.attempt_id}, question {self.question_id}: {outcome}"
+
+    class Meta:
+        verbose_name = "Question Response"
+        verbose_name_plural = "Question Responses"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["attempt", "question"], name="unique_response_per_attempt"
+            )
+        ]
+        indexes = [
+            # "How often is this question missed?"
+            models.Index(
+                fields=["question", "is_correct"], name="response_question_correct"
+            ),
+        ]
+
+
+class UserMistake(models.Model):
+    """
+    A question a user has answered incorrectly, across all their attempts.
+
+    Maintained incrementally when attempts are saved (see `recording.py`), so
+    the "My Mistakes" page reads one row per missed question instead of
+    scanning every attempt.
+    """
+
+    user = models.ForeignKey(
+        get_user_model(), on_delete=models.CASCADE, related_name="mistakes"
+    )
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name="user_mistakes"
+    )
+    miss_count = models.PositiveIntegerField(default=1)
+    last_missed_at = models.DateTimeField()
+    last_chosen_index = models.SmallIntegerField(
+        null=True, blank=True, help_text="Option chosen on the last miss (0-based)"
+    )
+
+    def __str__(self):
+        return f"User {self.user_id} missed question {self.question_id} ({self.miss_count}x)"
+
+    class Meta:
+        ordering = ["-last_missed_at", "-id"]
+        verbose_name = "User Mistake"
+        verbose_name_plural = "User Mistakes"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "question"], name="unique_mistake_per_user_question"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-last_missed_at", "-id"], name="mistake_user_recent"
+            ),
+        ]
+
+
+class ReviewCard(models.Model):
+    """
+    Spaced-repetition schedule of one question for one user (SM-2 style).
+
+    Created when the user misses the question and rescheduled whenever it is
+    answered in a review session (see `scheduling.py` and `recording.py`).
+    """
+
+    user = models.ForeignKey(
+        get_user_model(), on_delete=models.CASCADE, related_name="review_cards"
+    )
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name="review_cards"
+    )
+    interval_days = models.PositiveIntegerField(
+        default=0, help_text="Days until the next review after the last one"
+    )
+    ease = models.FloatField(default=INITIAL_EASE, help_text="SM-2 ease factor")
+    repetitions = models.PositiveIntegerField(
+        default=0, help_text="Consecutive correct reviews"
+    )
+    lapses = models.PositiveIntegerField(default=0)
+    next_due = models.DateTimeField()
+    last_reviewed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"User {self.user_id} card for question {self.question_id} (due {self.next_due})"
+
+    class Meta:
+        ordering = ["next_due", "id"]
+        verbose_name = "Review Card"
+        verbose_name_plural = "Review Cards"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "question"], name="unique_review_card_per_user_question"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["user", "next_due"], name="review_card_user_due"),
+        ]
+
+
+class UserStats(models.Model):
+    """
+    Totals over all of a user's quiz attempts, for the profile page.
+
+    Maintained with `UserQuizStats` when attempts are saved (see
+    `counters.py` and `recording.py`); built on first read for users without a
+    row and repaired with `manage.py rebuild_user_stats`.
+    """
+
+    user = models.OneToOneField(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="quiz_stats",
+    )
+    attempt_count = models.PositiveIntegerField(default=0)
+    average_percentage = models.FloatField(default=0)
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"User {self.user_id}: {self.attempt_count} attempts, {self.average_percentage:.1f}% average"
+
+    class Meta:
+        verbose_name = "User Stats"
+        verbose_name_plural = "User Stats"
+
+
+class UserQuizStats(models.Model):
+    """Per-quiz attempt count, best score and last attempt of one user."""
+
+    user = models.ForeignKey(
+        get_user_model(), on_delete=models.CASCADE, related_name="quiz_stats_by_quiz"
+    )
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="user_stats")
+    attempt_count = models.PositiveIntegerField(default=0)
+    best_percentage = models.FloatField(default=0)
+    last_attempt_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"User {self.user_id} on quiz {self.quiz_id}: {self.attempt_count} attempts"
+
+    class Meta:
+        verbose_name = "User Quiz Stats"
+        verbose_name_plural = "User Quiz Stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "quiz"], name="unique_stats_per_user_quiz"
+            )
+        ]
@@ -0,0 +1,316 @@
+# src/multi_choice_quiz/recording.py
+"""
+Persistence of graded quiz attempts.
+
+Every path that stores attempts (`submit_quiz_attempt`, the batch endpoint and
+the spool flusher in `ingestion.py`) goes through these functions, so an
+attempt, its `QuestionResponse` rows, the quiz's attempt counters, the user's
+`UserStats`/`UserQuizStats` rows, `UserMistake` index and `ReviewCard` schedule
+are always written together, in one transaction, with bulk statements. Once
+committed, the user's cached attempted-quiz set is invalidated
+(`caching.invalidate_attempted_quizzes`). Review sessions (`record_review_session`)
+update the same mistake index and review cards.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, DateTimeField, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .caching import invalidate_attempted_quizzes
+from .counters import add_attempt_stats, add_user_stats
+from .models import QuestionResponse, QuizAttempt, ReviewCard, UserMistake
+from .scheduling import reschedule
+from .scoring import GradedResponse
+
+# (user ID, answered at, graded responses) for the per-user tables
+UserResponses = Tuple[int, datetime, Sequence[GradedResponse]]
+
+
+def _question_responses(
+    attempt_id: int, responses: Sequence[GradedResponse]
+) -> List[QuestionResponse]:
+    return [
+        QuestionResponse(
+            attempt_id=attempt_id,
+            question_id=question_id,
+            chosen_index=chosen_index,
+            is_correct=is_correct,
+        )
+        for question_id, chosen_index, is_correct in responses
+    ]
+
+
+def _user_responses(
+    graded_attempts: Sequence[Tuple[QuizAttempt, Sequence[GradedResponse]]],
+) -> List[UserResponses]:
+    """Return the responses of attempts by logged-in users, with their time."""
+    return [
+        (attempt.user_id, attempt.end_time or timezone.now(), responses)
+        for attempt, responses in graded_attempts
+        if attempt.user_id is not None
+    ]
+
+
+def _update_mistake_index(entries: Sequence[UserResponses]) -> None:
+    """
+    Fold incorrect responses into each user's UserMistake rows.
+
+    Per user: one query for the already indexed questions, one UPDATE (with
+    per-question CASE values) for those and one bulk INSERT for new ones.
+    `last_missed_at` and `last_chosen_index` only move forward in time, so an
+    offline batch or spool replay of older attempts does not reorder them.
+    """
+    # {user_id: {question_id: [misses, last_missed_at, last_chosen_index]}}
+    misses_by_user: Dict[int, Dict[int, list]] = {}
+    for user_id, missed_at, responses in entries:
+        user_misses = misses_by_user.setdefault(user_id, {})
+        for question_id, chosen_index, is_correct in responses:
+            if is_correct:
+                continue
+            miss = user_misses.get(question_id)
+            if miss is None:
+                user_misses[question_id] = [1, missed_at, chosen_index]
+            else:
+                miss[0] += 1
+                if missed_at >= miss[1]:
+                    miss[1], miss[2] = missed_at, chosen_index
+
+    for user_id, user_misses in misses_by_user.items():
+        if not user_misses:
+            continue
+        indexed = set(
+            UserMistake.objects.filter(
+                user_id=user_id, question_id__in=user_misses
+            ).values_list("question_id", flat=True)
+        )
+        if indexed:
+
+            def per_question(position, output_field=None):
+                return Case(
+                    *[
+                        When(question_id=q_id, then=Value(user_misses[q_id][position]))
+                        for q_id in indexed
+                    ],
+                    output_field=output_field,
+                )
+
+            UserMistake.objects.filter(user_id=user_id, question_id__in=indexed).update(
+                miss_count=F("miss_count") + per_question(0, IntegerField()),
+                last_missed_at=Greatest(
+                    "last_missed_at", per_question(1, DateTimeField())
+                ),
+                # Compared with the stored (pre-update) last_missed_at.
+                last_chosen_index=Case(
+                    *[
+                        When(
+                            question_id=q_id,
+                            last_missed_at__lte=Value(user_misses[q_id][1]),
+                            then=Value(user_misses[q_id][2]),
+                        )
+                        for q_id in indexed
+                    ],
+                    default=F("last_chosen_index"),
+                    output_field=IntegerField(),
+                ),
+            )
+        UserMistake.objects.bulk_create(
+            [
+                UserMistake(
+                    user_id=user_id,
+                    question_id=q_id,
+                    miss_count=count,
+                    last_missed_at=missed_at,
+                    last_chosen_index=chosen_index,
+                )
+                for q_id, (count, missed_at, chosen_index) in user_misses.items()
+                if q_id not in indexed
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def _update_review_cards(
+    entries: Sequence[UserResponses], review_session: bool = False
+) -> None:
+    """
+    Create and reschedule ReviewCards for graded responses.
+
+    A miss creates the card (due immediately) or lapses an existing one. In a
+    review session correct answers also advance their card; in regular quizzes
+    they leave the schedule alone. One query reads every affected card, then
+    one bulk UPDATE and one bulk INSERT write them.
+    """
+    answers = [
+        (answered_at, user_id, question_id, is_correct)
+        for user_id, answered_at, responses in entries
+        for question_id, _, is_correct in responses
+        if review_session or not is_correct
+    ]
+    if not answers:
+        return
+    answers.sort(key=lambda answer: answer[0])
+
+    cards = {
+        (card.user_id, card.question_id): card
+        for card in ReviewCard.objects.filter(
+            user_id__in={answer[1] for answer in answers},
+            question_id__in={answer[2] for answer in answers},
+        )
+    }
+    new_cards = {}
+    changed_cards = {}
+    for answered_at, user_id, question_id, is_correct in answers:
+        key = (user_id, question_id)
+        card = cards.get(key)
+        if card is None:
+            if is_correct:
+                continue  # Nothing to review for a question never missed
+            card = cards[key] = new_cards[key] = ReviewCard(
+                user_id=user_id,
+                question_id=question_id,
+                next_due=answered_at,
+                last_reviewed_at=answered_at,
+            )
+            continue
+        reschedule(card, is_correct, answered_at)
+        if key not in new_cards:
+            changed_cards[key] = card
+
+    if changed_cards:
+        ReviewCard.objects.bulk_update(
+            changed_cards.values(),
+            [
+                "interval_days",
+                "ease",
+                "repetitions",
+                "lapses",
+                "next_due",
+                "last_reviewed_at",
+            ],
+        )
+    ReviewCard.objects.bulk_create(new_cards.values(), ignore_conflicts=True)
+
+
+def save_attempt(
+    attempt: QuizAttempt, responses: Sequence[GradedResponse]
+) -> QuizAttempt:
+    """Insert an unsaved attempt together with its question responses."""
+    with transaction.atomic():
+        attempt.save()
+        QuestionResponse.objects.bulk_create(_question_responses(attempt.pk, responses))
+        add_attempt_stats([attempt])
+        add_user_stats([attempt])
+        entries = _user_responses([(attempt, responses)])
+        _update_mistake_index(entries)
+        _update_review_cards(entries)
+    if attempt.user_id is not None:
+        invalidate_attempted_quizzes(attempt.user_id)
+    return attempt
+
+
+def _insert_new_attempts(
+    graded_attempts: Sequence[Tuple[QuizAttempt, Sequence[GradedResponse]]],
+) -> List[Tuple[QuizAttempt, Sequence[GradedResponse]]]:
+    """
+    Insert attempts whose keys were not stored and return the ones inserted here.
+
+    Normally one bulk INSERT. If a concurrent request stored one of the keys in
+    the meantime, the attempts are inserted one by one instead and those whose
+    key now exists are left out. Other integrity errors propagate.
+    """
+    attempts = [attempt for attempt, _ in graded_attempts]
+    try:
+        with transaction.atomic():
+            QuizAttempt.objects.bulk_create(attempts)
+    except IntegrityError:
+        inserted = []
+        for attempt, responses in graded_attempts:
+            attempt.pk = None
+            try:
+                with transaction.atomic():
+                    attempt.save(force_insert=True)
+            except IntegrityError:
+                if not QuizAttempt.objects.filter(
+                    idempotency_key=attempt.idempotency_key
+                ).exists():
+                    raise
+                continue
+            inserted.append((attempt, responses))
+        return inserted
+
+    # Backends that cannot return IDs from a bulk INSERT: read them back by key.
+    missing = {
+        attempt.idempotency_key: attempt for attempt in attempts if attempt.pk is None
+    }
+    if missing:
+        for key, attempt_id in QuizAttempt.objects.filter(
+            idempotency_key__in=missing
+        ).values_list("idempotency_key", "id"):
+            missing[key].pk = attempt_id
+    return list(graded_attempts)
+
+
+def save_attempts(
+    graded_attempts: Sequence[Tuple[QuizAttempt, Sequence[GradedResponse]]],
+) -> Dict[str, int]:
+    """
+    Bulk insert unsaved attempts (each with an `idempotency_key`) and their responses.
+
+    Attempts whose key is already stored, or repeated earlier in the batch,
+    are skipped, so a retried or replayed batch is harmless. Only attempts
+    inserted by this call are added to the counters, mistake index and review
+    cards. Returns {idempotency_key: attempt ID} for the given keys.
+    """
+    keys = [attempt.idempotency_key for attempt, _ in graded_attempts]
+    with transaction.atomic():
+        seen_keys = set(
+            QuizAttempt.objects.filter(idempotency_key__in=keys).values_list(
+                "idempotency_key", flat=True
+            )
+        )
+        new_attempts = []
+        for attempt, responses in graded_attempts:
+            if attempt.idempotency_key not in seen_keys:
+                seen_keys.add(attempt.idempotency_key)
+                new_attempts.append((attempt, responses))
+        new_attempts = _insert_new_attempts(new_attempts)
+        QuestionResponse.objects.bulk_create(
+            [
+                question_response
+                for attempt, responses in new_attempts
+                for question_response in _question_responses(attempt.pk, responses)
+            ]
+        )
+        saved_attempts = [attempt for attempt, _ in new_attempts]
+        add_attempt_stats(saved_attempts)
+        add_user_stats(saved_attempts)
+        entries = _user_responses(new_attempts)
+        _update_mistake_index(entries)
+        _update_review_cards(entries)
+        attempt_ids = dict(
+            QuizAttempt.objects.filter(idempotency_key__in=keys).values_list(
+                "idempotency_key", "id"
+            )
+        )
+
+    for user_id in {
+        attempt.user_id for attempt in saved_attempts if attempt.user_id is not None
+    }:
+        invalidate_attempted_quizzes(user_id)
+    return attempt_ids
+
+
+def record_review_session(
+    user_id: int,
+    responses: Sequence[GradedResponse],
+    reviewed_at: Optional[datetime] = None,
+) -> None:
+    """Reschedule the user's review cards (and mistake index) for a review session."""
+    entries = [(user_id, reviewed_at or timezone.now(), responses)]
+    with transaction.atomic():
+        _update_mistake_index(entries)
+        _update_review_cards(entries, review_session=True)
@@ -0,0 +1,155 @@
+# src/multi_choice_quiz/review.py
+"""
+Builders for mistake review pages.
+
+Questions and their options are loaded with one ordered `Prefetch`, and
+answer texts are resolved from the in-memory option lists, so a review costs
+the same number of queries whatever the number of mistakes.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List
+
+from django.db.models import Prefetch
+
+from .models import Option, Question, UserMistake
+
+logger = logging.getLogger(__name__)
+
+
+def _option_text(options: List[Option], index, question_id: int, label: str) -> str:
+    """Return the text of the 0-based option `index`, or "N/A"."""
+    if isinstance(index, int) and 0 <= index < len(options):
+        return options[index].text
+    if index is not None:
+        logger.warning(
+            f"{label} index {index} out of bounds for QID {question_id} options."
+        )
+    return "N/A"
+
+
+def _ordered_options_prefetch(lookup: str) -> Prefetch:
+    return Prefetch(
+        lookup,
+        queryset=Option.objects.order_by("position").only(
+            "id", "question_id", "text", "position", "is_correct"
+        ),
+        to_attr="ordered_options",
+    )
+
+
+def _correct_option_text(options: List[Option]) -> str:
+    return next((option.text for option in options if option.is_correct), "N/A")
+
+
+def mistakes_from_answer_sheet(answer_sheet: Dict[int, Any]) -> Dict[str, Any]:
+    """
+    Convert `caching.get_attempt_answer_sheet` output to the `attempt_details`
+    format taken by `build_mistake_review`: answered, incorrect questions only.
+    """
+    return {
+        str(question_id): {"user_answer_idx": chosen_index}
+        for question_id, (chosen_index, is_correct) in answer_sheet.items()
+        if chosen_index is not None and not is_correct
+    }
+
+
+def build_mistake_review(mistake_details: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Build the template context for the mistakes of one attempt.
+
+    Args:
+        mistake_details: `QuizAttempt.attempt_details`, i.e.
+            {question_id (str): {'user_answer_idx': X, 'correct_answer_idx': Y}}
+
+    Returns:
+        One dict per mistake, in quiz order, with 'question_id', 'question_text',
+        'user_answer', 'correct_answer' and 'question_tag'.
+    """
+    question_ids = [int(q_id) for q_id in mistake_details if str(q_id).isdigit()]
+    questions = (
+        Question.objects.filter(id__in=question_ids)
+        .order_by("position", "id")
+        .only("id", "text", "tag", "position")
+        .prefetch_related(_ordered_options_prefetch("options"))
+    )
+
+    mistakes = []
+    for question in questions:
+        detail = mistake_details.get(str(question.id))
+        if not isinstance(detail, dict):
+            detail = {}
+        options = question.ordered_options
+        correct_idx = detail.get("correct_answer_idx")
+
+        if correct_idx is None:
+            # Older entries may lack the index; use the option flagged correct.
+            correct_answer = _correct_option_text(options)
+        else:
+            correct_answer = _option_text(
+                options, correct_idx, question.id, "Correct answer"
+            )
+
+        mistakes.append(
+            {
+                "question_id": question.id,
+                "question_text": question.text,
+                "user_answer": _option_text(
+                    options, detail.get("user_answer_idx"), question.id, "User answer"
+                ),
+                "correct_answer": correct_answer,
+                "question_tag": question.tag,
+            }
+        )
+    return mistakes
+
+
+def build_mistake_notebook(mistakes: Iterable[UserMistake]) -> List[Dict[str, Any]]:
+    """
+    Build the template context for a page of a user's `UserMistake` rows.
+
+    Args:
+        mistakes: A (sliced) UserMistake queryset, e.g. one Paginator page
+
+    Returns:
+        One dict per mistake, in the given order, with 'question_id',
+        'question_text', 'question_tag', 'quiz', 'user_answer',
+        'correct_answer', 'miss_count' and 'last_missed_at'.
+    """
+    mistakes = (
+        mistakes.select_related("question__quiz")
+        .only(
+            "id",
+            "miss_count",
+            "last_missed_at",
+            "last_chosen_index",
+            "question",
+            "question__id",
+            "question__text",
+            "question__tag",
+            "question__quiz",
+            "question__quiz__id",
+            "question__quiz__title",
+        )
+        .prefetch_related(_ordered_options_prefetch("question__options"))
+    )
+
+    notebook = []
+    for mistake in mistakes:
+        question = mistake.question
+        options = question.ordered_options
+        notebook.append(
+            {
+                "question_id": question.id,
+                "question_text": question.text,
+                "question_tag": question.tag,
+                "quiz": question.quiz,
+                "user_answer": _option_text(
+                    options, mistake.last_chosen_index, question.id, "User answer"
+                ),
+                "correct_answer": _correct_option_text(options),
+                "miss_count": mistake.miss_count,
+                "last_missed_at": mistake.last_missed_at,
+            }
+        )
+    return notebook
@@ -0,0 +1,46 @@
+# src/multi_choice_quiz/scheduling.py
+"""
+Spaced-repetition scheduling of review cards (SM-2 with pass/fail grades).
+
+Answers are only right or wrong, so a correct answer is treated as SM-2
+quality 4 (ease unchanged) and a wrong one as a lapse: the card goes back to
+the first step, is due again immediately and its ease drops by
+`LAPSE_EASE_PENALTY`.
+"""
+
+from datetime import datetime, timedelta
+
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+LAPSE_EASE_PENALTY = 0.2
+# Intervals (days) after the first and second consecutive correct reviews;
+# later ones multiply the previous interval by the ease.
+FIRST_INTERVAL_DAYS = 1
+SECOND_INTERVAL_DAYS = 6
+
+
+def reschedule(card, is_correct: bool, reviewed_at: datetime) -> None:
+    """
+    Update the scheduling fields of a `ReviewCard` (saved or not) after one review.
+
+    Sets interval_days, ease, repetitions, lapses, next_due and last_reviewed_at;
+    the caller saves the card (usually in bulk).
+    """
+    if is_correct:
+        if card.repetitions == 0:
+            card.interval_days = FIRST_INTERVAL_DAYS
+        elif card.repetitions == 1:
+            card.interval_days = SECOND_INTERVAL_DAYS
+        else:
+            card.interval_days = max(
+                card.interval_days + 1, round(card.interval_days * card.ease)
+            )
+        card.repetitions += 1
+    else:
+        card.interval_days = 0
+        card.ease = max(MIN_EASE, round(card.ease - LAPSE_EASE_PENALTY, 2))
+        card.repetitions = 0
+        card.lapses += 1
+
+    card.last_reviewed_at = reviewed_at
+    card.next_due = reviewed_at + timedelta(days=card.interval_days)
@@ -0,0 +1,223 @@
+# src/multi_choice_quiz/scoring.py
+"""
+Validation and grading of submitted quiz attempts.
+
+Shared by the single-attempt endpoint (`submit_quiz_attempt`) and the batch
+endpoint used by offline clients (`submit_quiz_attempts_batch`). Grading works
+on the cached per-quiz answer key (`caching.get_quiz_answer_key`), so it never
+reads questions or options.
+"""
+
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_OPTION_INDEX = 32767  # QuestionResponse.chosen_index is a SmallIntegerField
+
+# (question_id, chosen 0-based index or None, is_correct)
+GradedResponse = Tuple[int, Optional[int], bool]
+
+# Packed answers: one byte per question, in quiz question order. The high bit
+# is the correct flag, the low 7 bits the chosen 0-based index; 0x7F means the
+# question was not answered (or the answer was not a valid index).
+PACKED_CORRECT_BIT = 0x80
+PACKED_UNANSWERED = 0x7F
+
+REQUIRED_ATTEMPT_FIELDS = [
+    "quiz_id",
+    "score",
+    "total_questions",
+    "percentage",
+    "end_time",
+]
+
+
+class AttemptValidationError(ValueError):
+    """Raised when a submitted attempt is missing fields or has invalid values."""
+
+
+def parse_attempt_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate one submitted attempt and convert its fields.
+
+    Returns a dict with 'quiz_id', 'score', 'total_questions', 'percentage',
+    'end_time' (aware datetime) and 'attempt_details' (dict, possibly empty).
+    Raises AttemptValidationError with a client-facing message otherwise.
+    """
+    if not isinstance(data, dict):
+        raise AttemptValidationError("Attempt must be a JSON object.")
+
+    missing_fields = [field for field in REQUIRED_ATTEMPT_FIELDS if field not in data]
+    if missing_fields:
+        raise AttemptValidationError(
+            f"Missing required fields: {', '.join(missing_fields)}"
+        )
+
+    try:
+        attempt = {
+            "quiz_id": int(data["quiz_id"]),
+            "score": int(data["score"]),
+            "total_questions": int(data["total_questions"]),
+            "percentage": float(data["percentage"]),
+            "end_time": datetime.fromisoformat(
+                str(data["end_time"]).replace("Z", "+00:00")
+            ),
+        }
+    except (ValueError, TypeError) as e:
+        raise AttemptValidationError(f"Invalid data type or format for field: {e}")
+
+    attempt_details = data.get("attempt_details", {})
+    if not isinstance(attempt_details, dict):
+        logger.warning(
+            f"Received non-dict attempt_details: {type(attempt_details)}. Ignoring."
+        )
+        attempt_details = {}  # Treat as empty if invalid type
+    attempt["attempt_details"] = attempt_details
+    return attempt
+
+
+def parse_review_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a submitted review session.
+
+    Returns a dict with 'end_time' (aware datetime) and 'attempt_details'
+    ({question_id (str): chosen 0-based index}). Raises AttemptValidationError
+    with a client-facing message otherwise.
+    """
+    if not isinstance(data, dict):
+        raise AttemptValidationError("Review session must be a JSON object.")
+    if "end_time" not in data:
+        raise AttemptValidationError("Missing required fields: end_time")
+    try:
+        end_time = datetime.fromisoformat(str(data["end_time"]).replace("Z", "+00:00"))
+    except ValueError as e:
+        raise AttemptValidationError(f"Invalid data type or format for field: {e}")
+    attempt_details = data.get("attempt_details")
+    if not isinstance(attempt_details, dict):
+        raise AttemptValidationError("attempt_details must be a JSON object.")
+    return {"end_time": end_time, "attempt_details": attempt_details}
+
+
+def chosen_option_index(user_answer_idx: Any) -> Optional[int]:
+    """Return the submitted answer as an option index, or None if it is not one."""
+    if isinstance(user_answer_idx, int) and not isinstance(user_answer_idx, bool):
+        if 0 <= user_answer_idx <= MAX_OPTION_INDEX:
+            return user_answer_idx
+    return None
+
+
+def grade_attempt_details(
+    received_attempt_details: Dict[str, Any], correct_answers: Dict[int, int]
+) -> Tuple[Dict[str, Dict[str, Any]], List[GradedResponse]]:
+    """
+    Grade the submitted answers of an attempt against the answer key.
+
+    Args:
+        received_attempt_details: {question_id (str): chosen 0-based index}
+        correct_answers: {question_id: correct 0-based index} (the answer key)
+
+    Returns:
+        A tuple (mistakes_data, responses):
+        - mistakes_data: {question_id (str): {'user_answer_idx': X, 'correct_answer_idx': Y}}
+          as stored in `QuizAttempt.attempt_details`
+        - responses: (question_id, chosen_index, is_correct) for every answered
+          question in the answer key, for `QuestionResponse` rows
+    """
+    mistakes_data = {}
+    responses = []
+    for q_id_str, user_answer_idx in received_attempt_details.items():
+        try:
+            question_id = int(q_id_str)
+        except (ValueError, TypeError) as e:
+            logger.warning(
+                f"Error processing detail for QID string '{q_id_str}': {e}. Skipping."
+            )
+            continue  # Skip this detail entry
+
+        correct_answer_idx = correct_answers.get(question_id)
+        # Also handle cases where correct answer might be None (bad data) or user answer is None
+        if correct_answer_idx is None:
+            logger.warning(
+                f"Could not find correct answer for QID {question_id} while processing mistakes."
+            )
+            continue
+
+        is_correct = user_answer_idx == correct_answer_idx
+        responses.append((question_id, chosen_option_index(user_answer_idx), is_correct))
+        if not is_correct:
+            mistakes_data[str(question_id)] = {  # Use string ID as key in JSON
+                "user_answer_idx": user_answer_idx,
+                "correct_answer_idx": correct_answer_idx,
+            }
+            logger.debug(
+                f"Mistake recorded for QID {question_id}: User={user_answer_idx}, Correct={correct_answer_idx}"
+            )
+    return mistakes_data, responses
+
+
+def score_responses(
+    responses: Sequence[GradedResponse], total_questions: int
+) -> Tuple[int, float]:
+    """
+    Return (score, percentage) of graded responses out of `total_questions`.
+
+    A question answered twice in one submission counts once. The percentage
+    is rounded to a whole number, as the quiz page shows it.
+    """
+    score = len(
+        {question_id for question_id, _, is_correct in responses if is_correct}
+    )
+    if not total_questions:
+        return score, 0.0
+    return score, float(round(score / total_questions * 100))
+
+
+def pack_answers(
+    question_order: Sequence[int], responses: Sequence[GradedResponse]
+) -> bytes:
+    """
+    Encode graded responses as one byte per question of `question_order`.
+
+    Args:
+        question_order: Question IDs in quiz order (`caching.get_quiz_question_order`)
+        responses: (question_id, chosen_index, is_correct) from `grade_attempt_details`
+    """
+    by_question = {
+        question_id: (chosen_index, is_correct)
+        for question_id, chosen_index, is_correct in responses
+    }
+    packed = bytearray(len(question_order))
+    for i, question_id in enumerate(question_order):
+        chosen_index, is_correct = by_question.get(question_id, (None, False))
+        if chosen_index is None or chosen_index >= PACKED_UNANSWERED:
+            value = PACKED_UNANSWERED
+        else:
+            value = chosen_index
+        packed[i] = value | (PACKED_CORRECT_BIT if is_correct else 0)
+    return bytes(packed)
+
+
+def question_order_version(question_order: Sequence[int]) -> str:
+    """
+    Return a 32-character digest of `question_order`, stored with packed answers
+    so they can be decoded for as long as the quiz keeps the same question order.
+    """
+    joined = ",".join(str(question_id) for question_id in question_order)
+    return hashlib.blake2b(joined.encode(), digest_size=16).hexdigest()
+
+
+def unpack_answers(packed: bytes) -> List[Tuple[Optional[int], bool]]:
+    """Decode `pack_answers` output to [(chosen_index or None, is_correct)]."""
+    answers = []
+    for value in packed:
+        chosen_index = value & PACKED_UNANSWERED
+        answers.append(
+            (
+                None if chosen_index == PACKED_UNANSWERED else chosen_index,
+                bool(value & PACKED_CORRECT_BIT),
+            )
+        )
+    return answers
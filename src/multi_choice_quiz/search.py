@@ -0,0 +1,343 @@
+# src/multi_choice_quiz/search.py
+"""
+Full-text search over quizzes, their questions and options.
+
+The index is one table, `multi_choice_quiz_searchindex`, created and filled by
+migration 0011 for the database in use:
+
+- SQLite: an FTS5 virtual table (porter stemming), ranked with bm25().
+- PostgreSQL: a table with a weighted `tsvector` column and a GIN index,
+  ranked with ts_rank().
+
+Each quiz has one row for its title and description and one row per active
+question (question text plus option texts). The quiz title is part of every
+row and weighted highest. Rows are rewritten per quiz or per question by
+`index_quizzes` / `index_questions`, called from the import pipeline
+(`utils.quiz_bank_to_models`) and the model signals (`signals.py`);
+`manage.py rebuild_search_index` rebuilds everything. Inside `defer_indexing`
+(imports that save row by row) the calls are collected and run once on exit. Inactive quizzes are
+filtered out at query time, so toggling `Quiz.is_active` needs no reindex.
+
+On other databases there is no index table and `search_quizzes` falls back to
+unranked `icontains` lookups over the same fields.
+"""
+
+import logging
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+
+from .models import Option, Question, Quiz
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_TABLE = "multi_choice_quiz_searchindex"
+MAX_SEARCH_RESULTS = 50
+SEARCH_CONFIG = "english"  # PostgreSQL text search configuration
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_deferred = threading.local()
+
+
+class SearchHit(NamedTuple):
+    quiz_id: int
+    question_id: Optional[int]  # Best matching question, None for a title match
+    score: float  # Higher is better; only comparable within one result list
+
+
+def search_backend() -> Optional[str]:
+    """Return "sqlite" or "postgresql" when the search index is available."""
+    if connection.vendor in ("sqlite", "postgresql"):
+        return connection.vendor
+    return None
+
+
+def _insert_rows(cursor, rows: List[tuple]) -> None:
+    """Insert (quiz_id, question_id, title, body) rows into the index."""
+    if not rows:
+        return
+    if search_backend() == "sqlite":
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_INDEX_TABLE} (quiz_id, question_id, title, body) "
+            "VALUES (%s, %s, %s, %s)",
+            rows,
+        )
+    else:
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_INDEX_TABLE} (quiz_id, question_id, document) "
+            f"VALUES (%s, %s, setweight(to_tsvector('{SEARCH_CONFIG}', %s), 'A') "
+            f"|| setweight(to_tsvector('{SEARCH_CONFIG}', %s), 'B'))",
+            rows,
+        )
+
+
+def _question_rows(questions, titles: Dict[int, str]) -> List[tuple]:
+    """Build index rows for questions (id, quiz_id, text), with their options."""
+    question_ids = [question_id for question_id, _, _ in questions]
+    option_texts: Dict[int, List[str]] = {}
+    for question_id, text in (
+        Option.objects.filter(question_id__in=question_ids)
+        .order_by("question_id", "position")
+        .values_list("question_id", "text")
+    ):
+        option_texts.setdefault(question_id, []).append(text)
+    return [
+        (
+            quiz_id,
+            question_id,
+            titles[quiz_id],
+            "\n".join([text, *option_texts.get(question_id, [])]),
+        )
+        for question_id, quiz_id, text in questions
+    ]
+
+
+def _delete_rows(cursor, column: str, ids: List[int]) -> None:
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor.execute(
+        f"DELETE FROM {SEARCH_INDEX_TABLE} WHERE {column} IN ({placeholders})", ids
+    )
+
+
+def _defer(kind: str, ids: List[int]) -> bool:
+    """Record ids for the enclosing `defer_indexing` block; False if none."""
+    pending = getattr(_deferred, "pending", None)
+    if pending is None:
+        return False
+    pending[kind].update(ids)
+    return True
+
+
+@contextmanager
+def defer_indexing():
+    """
+    Collect the index updates requested in the block and run them once on exit.
+
+    Saving a quiz row by row (e.g. `transform.quiz_bank_to_models`) sends a
+    save signal per question and option, each reindexing its question; inside
+    this block they add up to one `index_quizzes` for the saved quizzes, plus
+    `index_questions` for questions of other quizzes. Nested blocks defer to
+    the outermost one; nothing is indexed if the block raises.
+    """
+    if getattr(_deferred, "pending", None) is not None:
+        yield
+        return
+    pending = _deferred.pending = {"quizzes": set(), "questions": set()}
+    try:
+        yield
+    finally:
+        _deferred.pending = None
+    index_quizzes(pending["quizzes"])
+    question_ids = pending["questions"]
+    if pending["quizzes"] and question_ids:
+        # Questions of the reindexed quizzes are already covered.
+        question_ids -= set(
+            Question.objects.filter(
+                pk__in=question_ids, quiz_id__in=pending["quizzes"]
+            ).values_list("id", flat=True)
+        )
+    index_questions(question_ids)
+
+
+def index_quizzes(quiz_ids: Iterable[int]) -> None:
+    """
+    (Re)index the given quizzes: their title row and every active question.
+
+    Three reads (quizzes, questions, options) and one bulk insert, whatever the
+    number of questions.
+    """
+    quiz_ids = list(quiz_ids)
+    if not quiz_ids or search_backend() is None or _defer("quizzes", quiz_ids):
+        return
+    quizzes = list(
+        Quiz.objects.filter(pk__in=quiz_ids).values_list("id", "title", "description")
+    )
+    titles = {quiz_id: title for quiz_id, title, _ in quizzes}
+    questions = list(
+        Question.objects.filter(quiz_id__in=titles, is_active=True).values_list(
+            "id", "quiz_id", "text"
+        )
+    )
+    rows = [
+        (quiz_id, None, title, description) for quiz_id, title, description in quizzes
+    ]
+    rows.extend(_question_rows(questions, titles))
+    with transaction.atomic(), connection.cursor() as cursor:
+        _delete_rows(cursor, "quiz_id", quiz_ids)
+        _insert_rows(cursor, rows)
+    logger.debug(f"Indexed {len(rows)} search rows for quizzes {quiz_ids}.")
+
+
+def index_questions(question_ids: Iterable[int]) -> None:
+    """(Re)index the given questions; inactive or deleted ones are removed."""
+    question_ids = list(question_ids)
+    if (
+        not question_ids
+        or search_backend() is None
+        or _defer("questions", question_ids)
+    ):
+        return
+    questions = list(
+        Question.objects.filter(pk__in=question_ids, is_active=True).values_list(
+            "id", "quiz_id", "text"
+        )
+    )
+    quiz_ids = {quiz_id for _, quiz_id, _ in questions}
+    titles = dict(Quiz.objects.filter(pk__in=quiz_ids).values_list("id", "title"))
+    with transaction.atomic(), connection.cursor() as cursor:
+        _delete_rows(cursor, "question_id", question_ids)
+        _insert_rows(cursor, _question_rows(questions, titles))
+
+
+def remove_quizzes(quiz_ids: Iterable[int]) -> None:
+    """Drop every index row of the given quizzes."""
+    quiz_ids = list(quiz_ids)
+    if not quiz_ids or search_backend() is None:
+        return
+    with connection.cursor() as cursor:
+        _delete_rows(cursor, "quiz_id", quiz_ids)
+
+
+def rebuild_search_index(batch_size: int = 200) -> int:
+    """Rebuild the whole index in batches of quizzes; returns the quiz count."""
+    if search_backend() is None:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_INDEX_TABLE}")
+    quiz_ids = list(Quiz.objects.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(quiz_ids), batch_size):
+        index_quizzes(quiz_ids[start : start + batch_size])
+    return len(quiz_ids)
+
+
+def _query_tokens(query: str) -> List[str]:
+    return _TOKEN_RE.findall(query.lower())
+
+
+def _fts5_query(tokens: List[str]) -> str:
+    # Every token must match; the last one as a prefix (search as you type).
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _tsquery(tokens: List[str]) -> str:
+    return " & ".join([*tokens[:-1], f"{tokens[-1]}:*"])
+
+
+def search_quizzes(query: str, limit: int = 20) -> List[SearchHit]:
+    """
+    Return the active quizzes matching `query`, best match first.
+
+    Every word of the query must appear in the quiz title, description, or in
+    one question of the quiz (its text or options); the last word may be a
+    prefix. One hit per quiz, at most `limit` (capped at MAX_SEARCH_RESULTS).
+    """
+    tokens = _query_tokens(query)
+    if not tokens:
+        return []
+    limit = max(1, min(limit, MAX_SEARCH_RESULTS))
+    backend = search_backend()
+    if backend is None:
+        return _search_fallback(tokens, limit)
+
+    if backend == "sqlite":
+        # The FTS5 rank (bm25, title column weighted 10x) is lower for better
+        # matches. SQLite returns the bare question_id of the row with MIN(rank).
+        sql = (
+            "SELECT s.quiz_id, s.question_id, MIN(s.rank) AS best "
+            f"FROM {SEARCH_INDEX_TABLE} s "
+            "JOIN multi_choice_quiz_quiz q ON q.id = s.quiz_id "
+            f"WHERE s.{SEARCH_INDEX_TABLE} MATCH %s "
+            "AND s.rank MATCH 'bm25(10.0, 1.0)' AND q.is_active "
+            "GROUP BY s.quiz_id ORDER BY best, s.quiz_id LIMIT %s"
+        )
+        params = [_fts5_query(tokens), limit]
+    else:
+        sql = (
+            "SELECT quiz_id, question_id, rank FROM ("
+            "  SELECT DISTINCT ON (s.quiz_id) s.quiz_id, s.question_id, "
+            "         ts_rank(s.document, query) AS rank "
+            f"  FROM {SEARCH_INDEX_TABLE} s "
+            f"  CROSS JOIN to_tsquery('{SEARCH_CONFIG}', %s) query "
+            "  JOIN multi_choice_quiz_quiz q ON q.id = s.quiz_id "
+            "  WHERE q.is_active AND s.document @@ query "
+            "  ORDER BY s.quiz_id, rank DESC"
+            ") best ORDER BY rank DESC, quiz_id LIMIT %s"
+        )
+        params = [_tsquery(tokens), limit]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    sign = -1 if backend == "sqlite" else 1
+    return [
+        SearchHit(quiz_id, question_id, sign * rank)
+        for quiz_id, question_id, rank in rows
+    ]
+
+
+def search_question_ids(query: str, limit: int = 1000) -> Optional[List[int]]:
+    """
+    Return the IDs of the active questions matching `query`, best match first.
+
+    Used by the admin question search. Returns None when there is no search
+    index, so callers can fall back to their own lookups.
+    """
+    backend = search_backend()
+    if backend is None:
+        return None
+    tokens = _query_tokens(query)
+    if not tokens:
+        return []
+    if backend == "sqlite":
+        sql = (
+            f"SELECT question_id FROM {SEARCH_INDEX_TABLE} "
+            f"WHERE {SEARCH_INDEX_TABLE} MATCH %s AND question_id IS NOT NULL "
+            "ORDER BY rank LIMIT %s"
+        )
+        params = [_fts5_query(tokens), limit]
+    else:
+        sql = (
+            f"SELECT question_id FROM {SEARCH_INDEX_TABLE} "
+            f"CROSS JOIN to_tsquery('{SEARCH_CONFIG}', %s) query "
+            "WHERE document @@ query AND question_id IS NOT NULL "
+            "ORDER BY ts_rank(document, query) DESC LIMIT %s"
+        )
+        params = [_tsquery(tokens), limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [question_id for (question_id,) in cursor.fetchall()]
+
+
+def _search_fallback(tokens: List[str], limit: int) -> List[SearchHit]:
+    """
+    Unranked icontains search for databases without a search index.
+
+    Matches the same rows the index would: every token in the quiz title or
+    description, or every token in the quiz title or one active question (its
+    text or options).
+    """
+    quiz_match = Q()
+    questions = Question.objects.filter(quiz=OuterRef("pk"), is_active=True)
+    for token in tokens:
+        quiz_match &= Q(title__icontains=token) | Q(description__icontains=token)
+        questions = questions.filter(
+            Q(quiz__title__icontains=token)
+            | Q(text__icontains=token)
+            | Exists(
+                Option.objects.filter(question=OuterRef("pk"), text__icontains=token)
+            )
+        )
+    quiz_ids = (
+        Quiz.objects.filter(is_active=True)
+        .filter(quiz_match | Exists(questions))
+        .order_by("-created_at", "-id")
+        .values_list("id", flat=True)
+    )
+    return [SearchHit(quiz_id, None, 0.0) for quiz_id in quiz_ids[:limit]]
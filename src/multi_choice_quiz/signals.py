@@ -0,0 +1,105 @@
+# src/multi_choice_quiz/signals.py
+"""
+Signal handlers keeping cached quiz payloads, quiz counters and the search
+index coherent.
+
+Saving or deleting a Question or Option bumps the parent quiz's `updated_at`,
+which is the content version used in the payload cache key (see `caching.py`).
+Saving or deleting a Question also refreshes the quiz's active question count,
+and deleting attempts its attempt stats, the user's stats rows (see
+`counters.py`) and the user's cached attempted-quiz set.
+Quiz, Question and Option changes reindex the affected rows (see `search.py`);
+Quiz and Topic changes also bump the catalog version.
+Bulk paths (`bulk_create`, `QuerySet.update`) do not send signals and must call
+`caching.touch_quiz`, `counters.refresh_question_counts` and
+`search.index_quizzes` themselves.
+"""
+
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+
+from .caching import (
+    bump_catalog_version,
+    invalidate_attempted_quizzes,
+    invalidate_quiz_payload,
+    touch_quiz,
+)
+from .counters import (
+    refresh_attempt_stats,
+    refresh_question_counts,
+    refresh_user_stats,
+)
+from .models import Quiz, Question, Option, QuizAttempt, Topic
+from .search import index_questions, index_quizzes, remove_quizzes
+
+
+def _deleted_via(origin, *models) -> bool:
+    """Return True if a delete cascaded from an instance/queryset of `models`."""
+    origin_model = getattr(origin, "model", type(origin))
+    return origin_model in models
+
+
+@receiver(post_save, sender=Question)
+def question_saved(sender, instance, **kwargs):
+    touch_quiz(instance.quiz_id)
+    refresh_question_counts([instance.quiz_id])
+    index_questions([instance.pk])
+
+
+@receiver(post_delete, sender=Question)
+def question_deleted(sender, instance, origin=None, **kwargs):
+    # Nothing to bump when the whole quiz is being deleted.
+    if not _deleted_via(origin, Quiz):
+        touch_quiz(instance.quiz_id)
+        refresh_question_counts([instance.quiz_id])
+        index_questions([instance.pk])
+
+
+@receiver(post_save, sender=Option)
+def option_saved(sender, instance, **kwargs):
+    touch_quiz(instance.question.quiz_id)
+    index_questions([instance.question_id])
+
+
+@receiver(post_delete, sender=Option)
+def option_deleted(sender, instance, origin=None, **kwargs):
+    # Cascades from a Question/Quiz delete are covered by the handlers above.
+    if not _deleted_via(origin, Quiz, Question):
+        quiz_id = (
+            Question.objects.filter(pk=instance.question_id)
+            .values_list("quiz_id", flat=True)
+            .first()
+        )
+        if quiz_id is not None:
+            touch_quiz(quiz_id)
+            index_questions([instance.question_id])
+
+
+@receiver(post_save, sender=Quiz)
+def quiz_saved(sender, instance, **kwargs):
+    # The title is part of every row of the quiz.
+    index_quizzes([instance.pk])
+    bump_catalog_version()
+
+
+@receiver(post_delete, sender=Quiz)
+def quiz_deleted(sender, instance, **kwargs):
+    invalidate_quiz_payload(instance)
+    remove_quizzes([instance.pk])
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+@receiver(m2m_changed, sender=Quiz.topics.through)
+def topics_changed(sender, **kwargs):
+    bump_catalog_version()
+
+
+@receiver(post_delete, sender=QuizAttempt)
+def attempt_deleted(sender, instance, origin=None, **kwargs):
+    if not _deleted_via(origin, Quiz):
+        refresh_attempt_stats([instance.quiz_id])
+    if instance.user_id is not None:
+        refresh_user_stats([instance.user_id])
+        invalidate_attempted_quizzes(instance.user_id)
@@ -2,6 +2,40 @@
 
 window.quizApp = function () {
   let initialized = false;
+  let pendingWindow = null; // In-flight fetch of the next question window (paged mode)
+  let syncing = false; // Batch upload of offline attempts in progress
+
+  // Attempts that could not be submitted while offline, synced in one batch later
+  const pendingAttemptsStorageKey = "quizPendingAttempts";
+  const submitBatchUrl = "/quiz/submit_attempts/";
+  const maxBatchAttempts = 100; // Matches MAX_BATCH_ATTEMPTS in views.py
+
+  function loadPendingAttempts() {
+    try {
+      return JSON.parse(localStorage.getItem(pendingAttemptsStorageKey)) || [];
+    } catch (e) {
+      return [];
+    }
+  }
+
+  function savePendingAttempts(attempts) {
+    try {
+      if (attempts.length) {
+        localStorage.setItem(pendingAttemptsStorageKey, JSON.stringify(attempts));
+      } else {
+        localStorage.removeItem(pendingAttemptsStorageKey);
+      }
+    } catch (e) {
+      console.error("Could not store pending quiz attempts:", e);
+    }
+  }
+
+  function newIdempotencyKey() {
+    if (window.crypto && crypto.randomUUID) {
+      return crypto.randomUUID();
+    }
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`;
+  }
 
   // Thresholds for star rating calculation (highest first)
   const starRatingThresholds = [
@@ -35,6 +69,9 @@ window.quizApp = function () {
     quizTime: 0,
     detailedAnswers: {}, // <<< STEP 6.1: Object to store {questionId: selectedOptionIndex}
     quizId: null,
+    totalQuestions: 0, // Full quiz length; larger than questions.length while paging
+    questionsUrl: null, // Windowed question endpoint (paged mode only)
+    pageSize: 20,
 
     // --- Computed Properties (Getters) ---
     get currentQuestion() {
@@ -49,7 +86,7 @@ window.quizApp = function () {
     },
     get starRatingDisplay() {
       // ... (no change)
-      const totalQuestions = this.questions.length;
+      const totalQuestions = this.totalQuestions;
       if (totalQuestions === 0) return "☆☆☆☆☆";
 
       const maxPossibleScore = totalQuestions;
@@ -108,7 +145,7 @@ window.quizApp = function () {
       const dataElement = document.getElementById("quiz-data");
       if (dataElement) {
         try {
-          this.questions = JSON.parse(dataElement.textContent || "[]");
+          this.questions = JSON.parse(dataElement.textContent.trim() || "[]");
           console.log("DEBUG: Quiz data loaded successfully:", this.questions);
           this.userAnswers = Array(this.questions.length).fill(null);
         } catch (e) {
@@ -124,7 +161,20 @@ window.quizApp = function () {
 
       const container = document.getElementById("quiz-app-container");
       this.quizId = container ? container.dataset.quizId : null;
-      if (!this.quizId) {
+      // Review sessions post answers to reschedule cards, not as a quiz attempt.
+      this.reviewSubmitUrl = container ? container.dataset.reviewSubmitUrl || null : null;
+
+      // Paged delivery: only the first window is inlined, the rest is fetched.
+      this.questionsUrl = container ? container.dataset.quizQuestionsUrl || null : null;
+      this.totalQuestions = this.questionsUrl
+        ? parseInt(container.dataset.totalQuestions, 10) || this.questions.length
+        : this.questions.length;
+      this.pageSize = this.questionsUrl
+        ? parseInt(container.dataset.pageSize, 10) || this.pageSize
+        : this.pageSize;
+      this.userAnswers = Array(this.totalQuestions).fill(null);
+      pendingWindow = null;
+      if (!this.quizId && !this.reviewSubmitUrl) {
         console.warn(
           "Could not find quiz ID (data-quiz-id attribute on container). Results submission might fail."
         );
@@ -153,7 +203,11 @@ window.quizApp = function () {
         "DEBUG: Alpine instance assigned to window.quizAppInstance for testing."
       );
 
-      if (this.questions.length === 0) {
+      // No inline payload: load it from the JSON endpoint (ETag-revalidated).
+      const dataUrl = container ? container.dataset.quizDataUrl : null;
+      if (this.questions.length === 0 && dataUrl) {
+        this.loadQuizDataFromUrl(dataUrl);
+      } else if (this.questions.length === 0) {
         console.warn("No questions loaded, quiz cannot start.");
       } else {
         console.log(
@@ -163,6 +217,12 @@ window.quizApp = function () {
         );
       }
 
+      // Upload attempts queued while offline, now and whenever we reconnect.
+      window.addEventListener("online", () => this.syncPendingAttempts());
+      if (navigator.onLine) {
+        this.syncPendingAttempts();
+      }
+
       this.emitQuizEvent("quiz-initialized", {
         questionsCount: this.questions.length,
         quizId: this.quizId,
@@ -171,6 +231,83 @@ window.quizApp = function () {
       console.log("DEBUG: quizApp component init() finished.");
     },
 
+    loadQuizDataFromUrl(url) {
+      // The endpoint sends ETag/Last-Modified with "Cache-Control: no-cache", so
+      // the browser revalidates its stored copy and usually gets a 304 back.
+      console.log("DEBUG: Loading quiz data from", url);
+      return fetch(url, { headers: { Accept: "application/json" } })
+        .then((response) => {
+          if (!response.ok) {
+            throw new Error(`HTTP error ${response.status}`);
+          }
+          return response.json();
+        })
+        .then((questions) => {
+          this.questions = Array.isArray(questions) ? questions : [];
+          this.totalQuestions = this.questions.length;
+          this.userAnswers = Array(this.questions.length).fill(null);
+          console.log("Quiz data loaded from URL with", this.questions.length, "questions.");
+          this.emitQuizEvent("quiz-data-loaded", {
+            questionsCount: this.questions.length,
+            quizId: this.quizId,
+          });
+        })
+        .catch((error) => {
+          console.error("Failed to load quiz data from URL:", error);
+          this.emitQuizEvent("quiz-data-load-failed", { error: error.message });
+        });
+    },
+
+    fetchNextWindow() {
+      // Paged mode: load the next window of questions once. Concurrent callers
+      // share the same in-flight request.
+      if (!this.questionsUrl || this.questions.length >= this.totalQuestions) {
+        return Promise.resolve();
+      }
+      if (pendingWindow) {
+        return pendingWindow;
+      }
+      const offset = this.questions.length;
+      const url = `${this.questionsUrl}?offset=${offset}&limit=${this.pageSize}`;
+      console.log("DEBUG: Fetching question window:", url);
+      pendingWindow = fetch(url, { headers: { Accept: "application/json" } })
+        .then((response) => {
+          if (!response.ok) {
+            throw new Error(`HTTP error ${response.status}`);
+          }
+          return response.json();
+        })
+        .then((window_) => {
+          // Ignore stale responses (e.g. after a restart reset the questions).
+          if (window_.offset === this.questions.length) {
+            this.questions.push(...window_.questions);
+            this.totalQuestions = window_.total;
+          }
+          this.emitQuizEvent("question-window-loaded", {
+            offset: window_.offset,
+            count: window_.questions.length,
+            total: window_.total,
+          });
+        })
+        .catch((error) => {
+          console.error("Failed to fetch question window:", error);
+          this.emitQuizEvent("question-window-load-failed", { error: error.message });
+        })
+        .finally(() => {
+          pendingWindow = null;
+        });
+      return pendingWindow;
+    },
+
+    prefetchIfNeeded() {
+      // Start loading the next window when the user gets within half a window
+      // of the last loaded question, so it is ready before they reach it.
+      const remainingLoaded = this.questions.length - 1 - this.currentQuestionIndex;
+      if (remainingLoaded <= Math.ceil(this.pageSize / 2)) {
+        this.fetchNextWindow();
+      }
+    },
+
     selectOption(index) {
       if (this.isAnswered || !this.currentQuestion) {
         console.log(
@@ -220,6 +357,8 @@ window.quizApp = function () {
         isCorrect: wasCorrect,
       });
 
+      this.prefetchIfNeeded();
+
       // Handle feedback timer
       if (this.feedbackTimer) {
         clearTimeout(this.feedbackTimer);
@@ -238,6 +377,21 @@ window.quizApp = function () {
         this.feedbackTimer = null;
       }
 
+      if (
+        this.currentQuestionIndex < this.totalQuestions - 1 &&
+        this.currentQuestionIndex >= this.questions.length - 1
+      ) {
+        // Next question not loaded yet (paged mode): wait for its window.
+        this.fetchNextWindow().then(() => {
+          if (this.currentQuestionIndex < this.questions.length - 1) {
+            this.nextQuestion();
+          } else {
+            console.error("DEBUG: Next question window unavailable; cannot advance.");
+          }
+        });
+        return;
+      }
+
       if (this.currentQuestionIndex < this.questions.length - 1) {
         this.currentQuestionIndex++;
         this.isAnswered = false;
@@ -261,6 +415,10 @@ window.quizApp = function () {
     },
 
     submitResults() {
+      if (this.reviewSubmitUrl) {
+        this.submitReviewSession();
+        return;
+      }
       if (!this.quizId) {
         console.error("Cannot submit results: Quiz ID is missing.");
         return;
@@ -273,14 +431,15 @@ window.quizApp = function () {
       const payload = {
         quiz_id: parseInt(this.quizId, 10),
         score: this.score,
-        total_questions: this.questions.length,
+        total_questions: this.totalQuestions,
         percentage: this.calculatePercentage(),
         end_time: this.endTime
           ? this.endTime.toISOString()
           : new Date().toISOString(),
         // --- START STEP 6.2 CHANGE ---
-        attempt_details: this.detailedAnswers // Add the collected detailed answers
+        attempt_details: this.detailedAnswers, // Add the collected detailed answers
         // --- END STEP 6.2 CHANGE ---
+        idempotency_key: newIdempotencyKey(), // Used if queued for batch sync
       };
 
       console.log("DEBUG: Submitting quiz results (with details):", payload); // Updated log message
@@ -311,6 +470,15 @@ window.quizApp = function () {
         })
         .catch((error) => {
           console.error("DEBUG: Error submitting quiz results:", error);
+          // fetch() rejects with a TypeError on network failure: keep the
+          // attempt and upload it with the next batch sync.
+          if (error instanceof TypeError) {
+            savePendingAttempts([...loadPendingAttempts(), payload]);
+            this.emitQuizEvent("results-queued-offline", {
+              idempotencyKey: payload.idempotency_key,
+            });
+            return;
+          }
           this.emitQuizEvent("results-submission-failed", {
             error: error.message,
           });
@@ -318,6 +486,81 @@ window.quizApp = function () {
         });
     },
 
+    submitReviewSession() {
+      const payload = {
+        end_time: this.endTime
+          ? this.endTime.toISOString()
+          : new Date().toISOString(),
+        attempt_details: this.detailedAnswers,
+      };
+
+      return fetch(this.reviewSubmitUrl, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          "X-CSRFToken": getCookie("csrftoken"), // Session-authenticated POST
+        },
+        body: JSON.stringify(payload),
+      })
+        .then((response) => {
+          if (!response.ok) {
+            throw new Error(`HTTP error ${response.status}`);
+          }
+          return response.json();
+        })
+        .then((result) => {
+          console.log("DEBUG: Review session submitted:", result);
+          this.emitQuizEvent("review-submitted", { reviewed: result.reviewed });
+        })
+        .catch((error) => {
+          console.error("DEBUG: Error submitting review session:", error);
+          this.emitQuizEvent("results-submission-failed", {
+            error: error.message,
+          });
+        });
+    },
+
+    syncPendingAttempts() {
+      const pending = loadPendingAttempts();
+      if (syncing || pending.length === 0) return Promise.resolve();
+      syncing = true;
+      const batch = pending.slice(0, maxBatchAttempts);
+
+      return fetch(submitBatchUrl, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ attempts: batch }),
+      })
+        .then((response) => {
+          if (!response.ok) {
+            throw new Error(`HTTP error ${response.status}`);
+          }
+          return response.json();
+        })
+        .then((result) => {
+          // Drop items with a final status (created, duplicate or a permanent
+          // error); keep "failed" ones and anything queued in the meantime.
+          const handled = new Set(
+            result.results
+              .filter((r) => r.status !== "failed")
+              .map((r) => r.idempotency_key)
+          );
+          savePendingAttempts(
+            loadPendingAttempts().filter((a) => !handled.has(a.idempotency_key))
+          );
+          console.log("DEBUG: Synced pending quiz attempts:", result.results);
+          this.emitQuizEvent("pending-attempts-synced", {
+            results: result.results,
+          });
+        })
+        .catch((error) => {
+          console.error("DEBUG: Error syncing pending quiz attempts:", error);
+        })
+        .finally(() => {
+          syncing = false;
+        });
+    },
+
     restartQuiz() {
       console.log("DEBUG: Restarting quiz...");
       this.detailedAnswers = {}; // <<< STEP 6.1: Reset on restart
@@ -328,8 +571,8 @@ window.quizApp = function () {
 
     // --- Helper Methods for Results ---
     calculatePercentage() {
-      if (this.questions.length === 0) return 0;
-      return Math.round((this.score / this.questions.length) * 100);
+      if (this.totalQuestions === 0) return 0;
+      return Math.round((this.score / this.totalQuestions) * 100);
     },
 
     calculateQuizTime() {
@@ -395,10 +638,18 @@ window.quizApp = function () {
   }; // End of returned object
 }; // End of quizApp function
 
-// --- CSRF Helper (Keep commented) ---
-/*
-function getCookie(name) { ... }
-*/
+// --- CSRF Helper ---
+// Reads the CSRF token cookie for POSTs that require it (review sessions).
+function getCookie(name) {
+  const prefix = `${name}=`;
+  for (const cookie of document.cookie ? document.cookie.split(";") : []) {
+    const trimmed = cookie.trim();
+    if (trimmed.startsWith(prefix)) {
+      return decodeURIComponent(trimmed.slice(prefix.length));
+    }
+  }
+  return null;
+}
 
 console.log(
   "quizApp component function defined. Registered globally via window.quizApp."
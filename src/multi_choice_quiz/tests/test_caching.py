@@ -0,0 +1,277 @@
+# src/multi_choice_quiz/tests/test_caching.py
+
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase
+from django.urls import reverse
+
+from multi_choice_quiz.models import Quiz, Question, Option, QuizAttempt
+from multi_choice_quiz.caching import (
+    _pack_quiz_ids,
+    get_attempted_quiz_ids,
+    get_quiz_answer_key,
+    get_quiz_payload_json,
+    quiz_payload_cache_key,
+    user_attempted_quizzes_cache_key,
+)
+from multi_choice_quiz.utils import quiz_bank_to_models
+
+from .test_logging import setup_test_logging
+
+logger = setup_test_logging(__name__, "multi_choice_quiz")
+
+
+class QuizPayloadCacheTests(TestCase):
+    """Tests for the versioned quiz payload cache and its invalidation."""
+
+    def setUp(self):
+        cache.clear()
+        self.quiz = Quiz.objects.create(title="Cache Test Quiz")
+        self.q1 = Question.objects.create(quiz=self.quiz, text="Cache Q1?", position=1)
+        self.opt1 = Option.objects.create(
+            question=self.q1, text="Opt A", position=1, is_correct=True
+        )
+        Option.objects.create(question=self.q1, text="Opt B", position=2)
+
+    def _fresh_quiz(self):
+        return Quiz.objects.get(pk=self.quiz.pk)
+
+    def test_payload_is_cached_per_version(self):
+        """Second read of an unchanged quiz is served from the cache."""
+        logger.info("Testing quiz payload cache hit")
+        quiz = self._fresh_quiz()
+        payload = get_quiz_payload_json(quiz)
+        self.assertEqual(json.loads(payload)[0]["text"], "Cache Q1?")
+        self.assertEqual(cache.get(quiz_payload_cache_key(quiz)), payload)
+
+        # Only the cache lookup runs, no question/option queries.
+        with self.assertNumQueries(1):
+            self.assertEqual(get_quiz_payload_json(quiz), payload)
+
+    def test_option_save_bumps_version(self):
+        """Editing an option changes the cache key and the served payload."""
+        logger.info("Testing invalidation on Option save")
+        old_key = quiz_payload_cache_key(self._fresh_quiz())
+        get_quiz_payload_json(self._fresh_quiz())
+
+        self.opt1.text = "Opt A (edited)"
+        self.opt1.save()
+
+        quiz = self._fresh_quiz()
+        self.assertNotEqual(quiz_payload_cache_key(quiz), old_key)
+        payload = json.loads(get_quiz_payload_json(quiz))
+        self.assertEqual(payload[0]["options"][0], "Opt A (edited)")
+
+    def test_question_delete_bumps_version(self):
+        """Deleting a question removes it from the next payload."""
+        logger.info("Testing invalidation on Question delete")
+        get_quiz_payload_json(self._fresh_quiz())
+        self.q1.delete()
+        self.assertEqual(json.loads(get_quiz_payload_json(self._fresh_quiz())), [])
+
+    def test_bulk_import_path_bumps_version(self):
+        """utils.quiz_bank_to_models (bulk_create) leaves a fresh version behind."""
+        logger.info("Testing bulk import path sets content version")
+        quiz = quiz_bank_to_models(
+            [{"text": "Bulk Q?", "options": ["X", "Y"], "answerIndex": 2}],
+            "Bulk Cache Quiz",
+        )
+        # The returned instance still holds the pre-bulk_create version.
+        stored = Quiz.objects.get(pk=quiz.pk)
+        self.assertGreater(stored.updated_at, quiz.updated_at)
+        payload = json.loads(get_quiz_payload_json(stored))
+        self.assertEqual(payload[0]["answerIndex"], 1)
+
+    def test_quiz_detail_uses_cached_payload(self):
+        """quiz_detail renders the cached JSON payload."""
+        logger.info("Testing quiz_detail view with payload cache")
+        url = reverse("multi_choice_quiz:quiz_detail", args=[self.quiz.id])
+        first = self.client.get(url)
+        self.client.cookies.clear()  # A repeat visit would load data.json instead
+        second = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(str(first.context["quiz_data"]), str(second.context["quiz_data"]))
+        self.assertIsNotNone(cache.get(quiz_payload_cache_key(self._fresh_quiz())))
+
+
+class QuizAnswerKeyCacheTests(TestCase):
+    """Tests for the cached per-quiz answer key used by submit_quiz_attempt."""
+
+    def setUp(self):
+        cache.clear()
+        self.quiz = Quiz.objects.create(title="Answer Key Quiz")
+        self.q1 = Question.objects.create(quiz=self.quiz, text="AK Q1?", position=1)
+        Option.objects.create(question=self.q1, text="A", position=1)
+        self.q1_correct = Option.objects.create(
+            question=self.q1, text="B", position=2, is_correct=True
+        )
+        self.q2 = Question.objects.create(quiz=self.quiz, text="AK Q2?", position=2)
+        Option.objects.create(question=self.q2, text="C", position=1, is_correct=True)
+        self.q3 = Question.objects.create(quiz=self.quiz, text="AK Q3?", position=3)
+        Option.objects.create(question=self.q3, text="D", position=1)
+
+    def test_answer_key_matches_correct_option_index(self):
+        """The key matches Question.correct_option_index() for every question."""
+        answer_key = get_quiz_answer_key(Quiz.objects.get(pk=self.quiz.pk))
+        for question in self.quiz.questions.all():
+            self.assertEqual(
+                answer_key.get(question.id), question.correct_option_index()
+            )
+        self.assertEqual(answer_key, {self.q1.id: 1, self.q2.id: 0})
+
+    def test_option_change_invalidates_answer_key(self):
+        """Changing which option is correct is reflected on the next lookup."""
+        get_quiz_answer_key(Quiz.objects.get(pk=self.quiz.pk))
+        self.q1_correct.is_correct = False
+        self.q1_correct.save()
+        Option.objects.filter(question=self.q1, position=1).first().delete()
+        Option.objects.create(question=self.q1, text="A2", position=1, is_correct=True)
+        answer_key = get_quiz_answer_key(Quiz.objects.get(pk=self.quiz.pk))
+        self.assertEqual(answer_key[self.q1.id], 0)
+
+    def test_submit_uses_no_question_or_option_queries(self):
+        """With a warm cache, scoring a submission never reads questions/options."""
+        payload = json.dumps(
+            {
+                "quiz_id": self.quiz.id,
+                "score": 1,
+                "total_questions": 3,
+                "percentage": 33.3,
+                "end_time": "2025-01-01T00:00:00Z",
+                "attempt_details": {str(self.q1.id): 0, str(self.q2.id): 0},
+            }
+        )
+        url = reverse("multi_choice_quiz:submit_quiz_attempt")
+        self.client.post(url, data=payload, content_type="application/json")
+
+        executed = []
+
+        def record_query(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        # connection.queries is reset per request, so record via a wrapper.
+        with connection.execute_wrapper(record_query):
+            response = self.client.post(
+                url, data=payload, content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any("multi_choice_quiz_quizattempt" in sql for sql in executed))
+        scoring_queries = [
+            sql
+            for sql in executed
+            if '"multi_choice_quiz_question"' in sql or '"multi_choice_quiz_option"' in sql
+        ]
+        self.assertEqual(scoring_queries, [])
+        attempt = QuizAttempt.objects.get(pk=response.json()["attempt_id"])
+        self.assertEqual(list(attempt.attempt_details.keys()), [str(self.q1.id)])
+
+    def test_benchmark_submit_command_runs(self):
+        """Smoke test: the benchmark patches the live lookup and rolls back."""
+        attempts = QuizAttempt.objects.count()
+        out = StringIO()
+        call_command("benchmark_submit", questions=4, runs=2, stdout=out)
+        output = out.getvalue()
+        self.assertIn("before (per-question scoring):", output)
+        self.assertIn("after (cached answer key):", output)
+        self.assertIn("Benchmark data rolled back.", output)
+        self.assertEqual(QuizAttempt.objects.count(), attempts)
+
+
+class AttemptedQuizSetCacheTests(TestCase):
+    """Tests for the cached per-user set of attempted quizzes."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="attempter", password="pw"
+        )
+        self.quizzes = [
+            quiz_bank_to_models(
+                [{"text": "Set Q?", "options": ["A", "B"], "answerIndex": 1}],
+                f"Set Quiz {i}",
+            )
+            for i in range(3)
+        ]
+
+    def _submit(self, quiz):
+        response = self.client.post(
+            reverse("multi_choice_quiz:submit_quiz_attempt"),
+            data=json.dumps(
+                {
+                    "quiz_id": quiz.id,
+                    "score": 1,
+                    "total_questions": 1,
+                    "percentage": 100,
+                    "end_time": "2025-01-01T00:00:00Z",
+                }
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_set_is_built_once_then_served_from_cache(self):
+        logger.info("Testing attempted-quiz set cache miss and hit")
+        QuizAttempt.objects.create(
+            user=self.user,
+            quiz=self.quizzes[0],
+            score=1,
+            total_questions=1,
+            percentage=100,
+        )
+        self.assertEqual(get_attempted_quiz_ids(self.user.id), {self.quizzes[0].id})
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(
+                get_attempted_quiz_ids(self.user.id), {self.quizzes[0].id}
+            )
+        self.assertFalse(
+            any(
+                '"multi_choice_quiz_quizattempt"' in query["sql"]
+                for query in ctx.captured_queries
+            )
+        )
+
+    def test_submissions_invalidate_cached_set(self):
+        logger.info("Testing attempted-quiz set invalidated on submit")
+        self.client.force_login(self.user)
+        self.assertEqual(get_attempted_quiz_ids(self.user.id), frozenset())
+        self._submit(self.quizzes[1])
+        self._submit(self.quizzes[1])
+        self._submit(self.quizzes[2])
+        self.assertEqual(
+            get_attempted_quiz_ids(self.user.id),
+            {self.quizzes[1].id, self.quizzes[2].id},
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            get_attempted_quiz_ids(self.user.id)
+        self.assertFalse(
+            any(
+                '"multi_choice_quiz_quizattempt"' in query["sql"]
+                for query in ctx.captured_queries
+            )
+        )
+
+    def test_stale_rebuild_is_never_served(self):
+        """A set built from attempts read before a submission is not used."""
+        logger.info("Testing attempted-quiz set rebuild racing a submission")
+        self.client.force_login(self.user)
+        # A concurrent reader picked its key and read the attempts ...
+        stale_key = user_attempted_quizzes_cache_key(self.user.id)
+        self._submit(self.quizzes[0])
+        # ... and stores its (now stale) set after the submission committed.
+        cache.set(stale_key, _pack_quiz_ids([]))
+        self.assertEqual(get_attempted_quiz_ids(self.user.id), {self.quizzes[0].id})
+
+    def test_deleting_attempts_invalidates_set(self):
+        logger.info("Testing attempted-quiz set invalidated on delete")
+        self.client.force_login(self.user)
+        self._submit(self.quizzes[0])
+        self.assertEqual(get_attempted_quiz_ids(self.user.id), {self.quizzes[0].id})
+        QuizAttempt.objects.filter(user=self.user).delete()
+        self.assertEqual(get_attempted_quiz_ids(self.user.id), frozenset())
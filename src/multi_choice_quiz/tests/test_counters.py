@@ -0,0 +1,249 @@
+# src/multi_choice_quiz/tests/test_counters.py
+
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.urls import reverse
+
+from multi_choice_quiz.models import (
+    Question,
+    Quiz,
+    QuizAttempt,
+    UserQuizStats,
+    UserStats,
+)
+from multi_choice_quiz.utils import quiz_bank_to_models
+
+from .test_logging import setup_test_logging
+
+logger = setup_test_logging(__name__, "multi_choice_quiz")
+
+
+class QuizCounterTests(TestCase):
+    """Tests for the denormalized question and attempt counters on Quiz."""
+
+    def setUp(self):
+        cache.clear()
+        self.quiz = quiz_bank_to_models(
+            [
+                {"text": f"Counter Q{i}?", "options": ["A", "B"], "answerIndex": 1}
+                for i in range(1, 4)
+            ],
+            "Counter Quiz",
+        )
+
+    def _submit(self, percentage, **extra):
+        payload = {
+            "quiz_id": self.quiz.id,
+            "score": 1,
+            "total_questions": 3,
+            "percentage": percentage,
+            "end_time": "2025-01-01T00:00:00Z",
+        }
+        payload.update(extra)
+        response = self.client.post(
+            reverse("multi_choice_quiz:submit_quiz_attempt"),
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def _counters(self):
+        quiz = Quiz.objects.get(pk=self.quiz.pk)
+        return quiz.active_question_count, quiz.attempt_count, quiz.average_percentage
+
+    def test_bulk_import_sets_question_count(self):
+        logger.info("Testing question counter after bulk import")
+        self.assertEqual(self.quiz.question_count(), 3)
+        self.assertEqual(self._counters(), (3, 0, 0))
+
+    def test_question_edits_update_count(self):
+        logger.info("Testing question counter after question edits")
+        question = self.quiz.questions.first()
+        question.is_active = False
+        question.save()
+        self.assertEqual(self._counters()[0], 2)
+        extra = Question.objects.create(quiz=self.quiz, text="Extra?", position=4)
+        self.assertEqual(self._counters()[0], 3)
+        extra.delete()
+        self.assertEqual(self._counters()[0], 2)
+
+    def test_submissions_update_attempt_stats_without_bumping_version(self):
+        logger.info("Testing attempt counters on submit")
+        version = Quiz.objects.get(pk=self.quiz.pk).updated_at
+        self._submit(50.0)
+        self._submit(100.0)
+        response = self.client.post(
+            reverse("multi_choice_quiz:submit_quiz_attempts_batch"),
+            data=json.dumps(
+                {
+                    "attempts": [
+                        {
+                            "quiz_id": self.quiz.id,
+                            "score": 0,
+                            "total_questions": 3,
+                            "percentage": 0.0,
+                            "end_time": "2025-01-01T00:00:00Z",
+                            "idempotency_key": "counter-batch-1",
+                        }
+                    ]
+                    * 2  # The duplicate key is only counted once
+                }
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        _, attempts, average = self._counters()
+        self.assertEqual(attempts, 3)
+        self.assertAlmostEqual(average, 50.0)
+        self.assertEqual(Quiz.objects.get(pk=self.quiz.pk).updated_at, version)
+
+        QuizAttempt.objects.filter(percentage=0.0).delete()
+        _, attempts, average = self._counters()
+        self.assertEqual((attempts, average), (2, 75.0))
+
+    def test_recount_command_repairs_drift(self):
+        logger.info("Testing recount command")
+        self._submit(80.0)
+        Quiz.objects.filter(pk=self.quiz.pk).update(
+            active_question_count=99, attempt_count=0, average_percentage=1.0
+        )
+        other = quiz_bank_to_models(
+            [{"text": "Other?", "options": ["A", "B"], "answerIndex": 2}], "Other"
+        )
+
+        out = StringIO()
+        call_command("recount", stdout=out)
+        self.assertIn("1 had drifted", out.getvalue())
+        self.assertEqual(self._counters(), (3, 1, 80.0))
+        self.assertEqual(Quiz.objects.get(pk=other.pk).active_question_count, 1)
+
+        out = StringIO()
+        call_command("recount", stdout=out)
+        self.assertIn("0 had drifted", out.getvalue())
+
+
+class UserStatsTests(TestCase):
+    """Tests for the per-user stats rows behind the profile page."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="statsuser", password="pw"
+        )
+        self.client.force_login(self.user)
+        self.quizzes = [
+            quiz_bank_to_models(
+                [{"text": "Stats Q?", "options": ["A", "B"], "answerIndex": 1}],
+                f"Stats Quiz {i}",
+            )
+            for i in range(2)
+        ]
+
+    def _submit(self, quiz, percentage, end_time="2025-01-01T00:00:00Z"):
+        response = self.client.post(
+            reverse("multi_choice_quiz:submit_quiz_attempt"),
+            data=json.dumps(
+                {
+                    "quiz_id": quiz.id,
+                    "score": 1,
+                    "total_questions": 1,
+                    "percentage": percentage,
+                    "end_time": end_time,
+                }
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def _quiz_stats(self, quiz):
+        row = UserQuizStats.objects.get(user=self.user, quiz=quiz)
+        return row.attempt_count, row.best_percentage, row.last_attempt_at.year
+
+    def test_submissions_update_user_stats(self):
+        logger.info("Testing user stats on submit")
+        self._submit(self.quizzes[0], 40.0)
+        self._submit(self.quizzes[0], 80.0, "2026-01-01T00:00:00Z")
+        self._submit(self.quizzes[1], 90.0)
+
+        stats = UserStats.objects.get(user=self.user)
+        self.assertEqual(stats.attempt_count, 3)
+        self.assertAlmostEqual(stats.average_percentage, 70.0)
+        self.assertEqual(stats.last_attempt_at.year, 2026)
+        self.assertEqual(self._quiz_stats(self.quizzes[0]), (2, 80.0, 2026))
+        self.assertEqual(self._quiz_stats(self.quizzes[1]), (1, 90.0, 2025))
+
+        QuizAttempt.objects.filter(percentage=80.0).delete()
+        stats = UserStats.objects.get(user=self.user)
+        self.assertEqual((stats.attempt_count, stats.average_percentage), (2, 65.0))
+        self.assertEqual(self._quiz_stats(self.quizzes[0]), (1, 40.0, 2025))
+
+    def test_concurrent_first_attempts_on_a_quiz_share_its_row(self):
+        logger.info("Testing a concurrent first attempt on a quiz")
+        self._submit(self.quizzes[0], 40.0)  # Builds the user's stats rows
+        concurrent = []
+
+        def insert_after_lookup(execute, sql, params, many, context):
+            # The other request inserts the row right after this one looked it up.
+            result = execute(sql, params, many, context)
+            if not concurrent and sql.startswith(
+                'SELECT "multi_choice_quiz_userquizstats"."quiz_id"'
+            ):
+                concurrent.append(True)
+                UserQuizStats.objects.create(
+                    user=self.user,
+                    quiz=self.quizzes[1],
+                    attempt_count=1,
+                    best_percentage=30.0,
+                    last_attempt_at=timezone.now(),
+                )
+            return result
+
+        with connection.execute_wrapper(insert_after_lookup):
+            self._submit(self.quizzes[1], 90.0)
+        self.assertEqual(concurrent, [True])
+        self.assertEqual(self._quiz_stats(self.quizzes[1])[:2], (2, 90.0))
+
+    def test_profile_reads_stats_without_aggregating_attempts(self):
+        logger.info("Testing profile page reads user stats")
+        for percentage in (50.0, 100.0):
+            self._submit(self.quizzes[0], percentage)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("pages:profile"))
+        self.assertEqual(response.context["stats"]["total_taken"], 2)
+        self.assertEqual(response.context["stats"]["avg_score_percent"], 75)
+        self.assertEqual(
+            response.context["quiz_attempt_counts"], {self.quizzes[0].id: 2}
+        )
+        # Collection summaries may COUNT; attempts must not be aggregated.
+        attempt_aggregates = [
+            query["sql"]
+            for query in ctx.captured_queries
+            if '"multi_choice_quiz_quizattempt"' in query["sql"]
+            and any(fn in query["sql"].upper() for fn in ("COUNT(", "AVG("))
+        ]
+        self.assertEqual(attempt_aggregates, [])
+
+    def test_stats_are_built_on_first_read_and_by_command(self):
+        logger.info("Testing user stats rebuild")
+        QuizAttempt.objects.create(
+            user=self.user, quiz=self.quizzes[1], score=1, total_questions=1, percentage=60
+        )
+        response = self.client.get(reverse("pages:profile"))
+        self.assertEqual(response.context["stats"]["total_taken"], 1)
+
+        UserStats.objects.filter(user=self.user).update(attempt_count=7)
+        UserQuizStats.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_user_stats", stdout=out)
+        self.assertIn("1 users", out.getvalue())
+        self.assertEqual(UserStats.objects.get(user=self.user).attempt_count, 1)
+        self.assertEqual(self._quiz_stats(self.quizzes[1])[:2], (1, 60.0))
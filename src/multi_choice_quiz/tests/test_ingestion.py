@@ -0,0 +1,268 @@
+# src/multi_choice_quiz/tests/test_ingestion.py
+
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, OperationalError, connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from multi_choice_quiz.models import (
+    Quiz,
+    Question,
+    Option,
+    QuizAttempt,
+    QuestionResponse,
+    UserMistake,
+    UserQuizStats,
+)
+from multi_choice_quiz.recording import save_attempts
+from multi_choice_quiz.ingestion import (
+    _spool_connection,
+    flush_spool,
+    spooled_attempt_count,
+)
+
+from .test_logging import setup_test_logging
+
+logger = setup_test_logging(__name__, "multi_choice_quiz")
+
+
+class AttemptSpoolTests(TestCase):
+    """Tests for write-behind ingestion of quiz attempts via the local spool."""
+
+    def setUp(self):
+        cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        spool_settings = override_settings(
+            ATTEMPT_INGESTION_MODE="spool",
+            ATTEMPT_SPOOL_PATH=os.path.join(self.tmpdir.name, "spool.sqlite3"),
+        )
+        spool_settings.enable()
+        self.addCleanup(spool_settings.disable)
+
+        self.quiz = Quiz.objects.create(title="Spool Quiz")
+        self.question = Question.objects.create(
+            quiz=self.quiz, text="Spool Q?", position=1
+        )
+        Option.objects.create(question=self.question, text="A", position=1)
+        Option.objects.create(
+            question=self.question, text="B", position=2, is_correct=True
+        )
+        self.url = reverse("multi_choice_quiz:submit_quiz_attempt")
+
+    def _submit(self, answer_idx=0):
+        payload = {
+            "quiz_id": self.quiz.id,
+            "score": 0,
+            "total_questions": 1,
+            "percentage": 0.0,
+            "end_time": "2025-01-01T12:00:00Z",
+            "attempt_details": {str(self.question.id): answer_idx},
+        }
+        return self.client.post(
+            self.url, data=json.dumps(payload), content_type="application/json"
+        )
+
+    def test_submit_spools_instead_of_inserting(self):
+        """In spool mode the request only appends to the spool."""
+        logger.info("Testing submission in spool mode")
+        response = self._submit()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"status": "success", "attempt_id": None, "queued": True}
+        )
+        self.assertEqual(QuizAttempt.objects.count(), 0)
+        self.assertEqual(spooled_attempt_count(), 1)
+
+    def test_flush_bulk_inserts_scored_attempts(self):
+        """The flusher inserts spooled attempts with their processed mistakes."""
+        logger.info("Testing spool flush")
+        for _ in range(5):
+            self._submit(answer_idx=0)
+
+        self.assertEqual(flush_spool(batch_size=2), 5)
+        self.assertEqual(spooled_attempt_count(), 0)
+        attempts = QuizAttempt.objects.filter(quiz=self.quiz)
+        self.assertEqual(attempts.count(), 5)
+        attempt = attempts.first()
+        self.assertEqual(
+            attempt.attempt_details,
+            {str(self.question.id): {"user_answer_idx": 0, "correct_answer_idx": 1}},
+        )
+        self.assertEqual(attempt.end_time.isoformat(), "2025-01-01T12:00:00+00:00")
+        self.assertEqual(
+            QuestionResponse.objects.filter(attempt__quiz=self.quiz).count(), 5
+        )
+        self.assertEqual(flush_spool(), 0)
+
+    def test_replay_after_crash_does_not_duplicate(self):
+        """Entries inserted but not removed from the spool are skipped on replay."""
+        logger.info("Testing spool replay idempotency")
+        self._submit()
+        self._submit()
+        conn = _spool_connection()
+        rows = conn.execute("SELECT id, payload FROM spooled_attempt").fetchall()
+
+        flush_spool()
+        # Simulate a crash between the database commit and the spool delete.
+        conn.executemany(
+            "INSERT INTO spooled_attempt (id, payload, spooled_at) VALUES (?, ?, 0)",
+            rows,
+        )
+        self.assertEqual(flush_spool(), 2)
+        self.assertEqual(QuizAttempt.objects.filter(quiz=self.quiz).count(), 2)
+
+    def test_unavailable_database_keeps_spooled_attempts(self):
+        """Operational errors release the claim; nothing is dropped."""
+        logger.info("Testing spool flush while the database is unavailable")
+        self._submit()
+        self._submit()
+        with patch(
+            "multi_choice_quiz.ingestion.save_attempts",
+            side_effect=OperationalError("server closed the connection"),
+        ):
+            with self.assertRaises(OperationalError):
+                flush_spool()
+        self.assertEqual(spooled_attempt_count(), 2)
+        claimed = _spool_connection().execute(
+            "SELECT COUNT(*) FROM spooled_attempt WHERE claim IS NOT NULL"
+        ).fetchone()[0]
+        self.assertEqual(claimed, 0)
+
+        self.assertEqual(flush_spool(), 2)
+        self.assertEqual(QuizAttempt.objects.filter(quiz=self.quiz).count(), 2)
+
+    def test_rejected_attempts_are_dropped(self):
+        """Entries the database rejects as invalid do not block the spool."""
+        logger.info("Testing spool flush of invalid entries")
+        self._submit()
+        with patch(
+            "multi_choice_quiz.ingestion.save_attempts",
+            side_effect=IntegrityError("FOREIGN KEY constraint failed"),
+        ):
+            self.assertEqual(flush_spool(), 1)
+        self.assertEqual(spooled_attempt_count(), 0)
+
+    def test_undecodable_entries_are_dropped(self):
+        """Corrupt or incomplete entries are dropped; the rest of the batch is saved."""
+        logger.info("Testing spool flush of undecodable entries")
+        self._submit()
+        conn = _spool_connection()
+        conn.executemany(
+            "INSERT INTO spooled_attempt (payload, spooled_at) VALUES (?, 0)",
+            [
+                ("{not json",),
+                (json.dumps({"idempotency_key": "no-quiz", "score": 0}),),
+                (json.dumps({"quiz_id": self.quiz.id, "end_time": "yesterday"}),),
+                (json.dumps(["not", "an", "object"]),),
+            ],
+        )
+        self._submit()
+
+        self.assertEqual(flush_spool(), 6)
+        self.assertEqual(spooled_attempt_count(), 0)
+        self.assertEqual(QuizAttempt.objects.filter(quiz=self.quiz).count(), 2)
+
+    def test_spool_is_writable_while_a_batch_is_inserted(self):
+        """The spool lock is released before the database insert."""
+        logger.info("Testing spool writes during a flush")
+        self._submit()
+
+        spooled_during_flush = []
+
+        def save_while_spooling(graded_attempts):
+            # Same thread, same connection: only succeeds outside a transaction.
+            self.assertFalse(_spool_connection().in_transaction)
+            if not spooled_during_flush:
+                spooled_during_flush.append(self._submit().status_code)
+            return save_attempts(graded_attempts)
+
+        with patch(
+            "multi_choice_quiz.ingestion.save_attempts",
+            side_effect=save_while_spooling,
+        ):
+            self.assertEqual(flush_spool(batch_size=1), 2)
+        self.assertEqual(spooled_during_flush, [200])
+        self.assertEqual(spooled_attempt_count(), 0)
+
+    @override_settings(ATTEMPT_INGESTION_MODE="direct")
+    def test_direct_mode_inserts_immediately(self):
+        """The default mode keeps inserting in the request."""
+        response = self._submit()
+        self.assertIsNotNone(response.json()["attempt_id"])
+        self.assertEqual(QuizAttempt.objects.count(), 1)
+
+
+class SaveAttemptsTests(TestCase):
+    """Only attempts a save_attempts call inserts are folded into the read models."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="saver", password="pw")
+        cls.quiz = Quiz.objects.create(title="Save Attempts Quiz")
+        cls.question = Question.objects.create(quiz=cls.quiz, text="Q?", position=1)
+        Option.objects.create(question=cls.question, text="A", position=1)
+        Option.objects.create(
+            question=cls.question, text="B", position=2, is_correct=True
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def _graded(self, key):
+        attempt = QuizAttempt(
+            quiz=self.quiz,
+            user=self.user,
+            score=0,
+            total_questions=1,
+            percentage=0.0,
+            end_time=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            idempotency_key=key,
+        )
+        return attempt, [(self.question.id, 0, False)]
+
+    def _assert_counted_once(self):
+        self.assertEqual(QuizAttempt.objects.filter(quiz=self.quiz).count(), 1)
+        self.assertEqual(Quiz.objects.get(pk=self.quiz.pk).attempt_count, 1)
+        self.assertEqual(
+            UserQuizStats.objects.get(user=self.user, quiz=self.quiz).attempt_count, 1
+        )
+        self.assertEqual(
+            UserMistake.objects.get(user=self.user, question=self.question).miss_count,
+            1,
+        )
+
+    def test_repeated_key_in_one_batch_is_counted_once(self):
+        logger.info("Testing a key repeated within one batch")
+        ids = save_attempts([self._graded("repeated-key"), self._graded("repeated-key")])
+        self.assertEqual(list(ids), ["repeated-key"])
+        self._assert_counted_once()
+        self.assertEqual(QuestionResponse.objects.count(), 1)
+
+    def test_concurrently_stored_key_is_not_counted_again(self):
+        logger.info("Testing a key stored by a concurrent request")
+        # The other request inserts right before this call's bulk INSERT.
+        concurrent = []
+
+        def insert_first(execute, sql, params, many, context):
+            if not concurrent and sql.startswith(
+                'INSERT INTO "multi_choice_quiz_quizattempt"'
+            ):
+                concurrent.append(True)
+                save_attempts([self._graded("racing-key")])
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(insert_first):
+            ids = save_attempts([self._graded("racing-key")])
+        self.assertEqual(concurrent, [True])
+        self.assertEqual(
+            ids["racing-key"], QuizAttempt.objects.get(idempotency_key="racing-key").pk
+        )
+        self._assert_counted_once()
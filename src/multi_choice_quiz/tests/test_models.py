@@ -7,6 +7,7 @@ from multi_choice_quiz.transform import (
     quiz_bank_to_models,
     models_to_frontend,
     frontend_to_models,
+    quiz_to_frontend,
 )
 import json  # Needed for some tests
 from django.db import IntegrityError  # <<< ADDED for test_unique_position
@@ -72,7 +73,8 @@ class QuizModelTests(TestCase):
             quiz=self.quiz, topic=self.topic, text="Question 2", position=2
         )
 
-        # Now should have 2 questions
+        # Now should have 2 questions (stored counter, updated by the save signals)
+        self.quiz.refresh_from_db()
         self.assertEqual(self.quiz.question_count(), 2)
 
 
@@ -249,6 +251,48 @@ class TransformationTests(TestCase):
         )  # <<< VERIFY tag included >>>
         # Chapter_no is not part of the frontend format per `Question.to_dict()`, so no need to check here.
 
+    def test_quiz_to_frontend_matches_to_dict(self):
+        """Test the single-query serializer produces the same output as to_dict()."""
+        test_data = [
+            {
+                "text": f"Bulk question {i}?",
+                "options": ["A", "B", "C", "D"],
+                "answerIndex": (i % 4) + 1,  # 1-based index
+                "tag": f"tag-{i}",
+            }
+            for i in range(25)
+        ]
+        quiz = quiz_bank_to_models(test_data, "Serializer Quiz", "Serializer Topic")
+
+        # Edge cases: a question without options, one without a correct option,
+        # and an inactive question that must be left out.
+        Question.objects.create(quiz=quiz, text="No options?", position=26)
+        q_no_correct = Question.objects.create(
+            quiz=quiz, text="No correct?", position=27
+        )
+        Option.objects.create(question=q_no_correct, text="X", position=1)
+        Question.objects.create(
+            quiz=quiz, text="Inactive?", position=28, is_active=False
+        )
+
+        expected = [
+            q.to_dict()
+            for q in quiz.questions.filter(is_active=True).order_by("position")
+        ]
+
+        with self.assertNumQueries(1):
+            frontend_data = quiz_to_frontend(quiz)
+
+        self.assertEqual(frontend_data, expected)
+        self.assertEqual(len(frontend_data), 27)
+        self.assertEqual(frontend_data[25]["options"], [])
+        self.assertIsNone(frontend_data[25]["answerIndex"])
+        self.assertIsNone(frontend_data[26]["answerIndex"])
+
+        # Query count stays fixed regardless of quiz size
+        with self.assertNumQueries(1):
+            quiz_to_frontend(quiz.id, include_inactive=True)
+
     def test_frontend_to_models(self):
         """Test converting frontend format (0-based) to models (1-based)."""
         frontend_test = [
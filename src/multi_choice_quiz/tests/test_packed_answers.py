@@ -0,0 +1,158 @@
+# src/multi_choice_quiz/tests/test_packed_answers.py
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from multi_choice_quiz.caching import get_attempt_answer_sheet, get_quiz_question_order
+from multi_choice_quiz.models import Quiz, Question, Option, QuizAttempt
+from multi_choice_quiz.scoring import (
+    pack_answers,
+    question_order_version,
+    unpack_answers,
+)
+
+from .test_logging import setup_test_logging
+
+logger = setup_test_logging(__name__, "multi_choice_quiz")
+
+
+class PackAnswersTests(SimpleTestCase):
+    """Tests for the one-byte-per-question answer encoding."""
+
+    def test_round_trip(self):
+        """Chosen index and correct flag survive packing, in question order."""
+        packed = pack_answers(
+            [30, 10, 20, 40],
+            [(10, 2, True), (20, 0, False), (40, None, False)],
+        )
+        self.assertEqual(len(packed), 4)
+        self.assertEqual(
+            unpack_answers(packed),
+            [(None, False), (2, True), (0, False), (None, False)],
+        )
+
+    def test_out_of_range_index_is_unanswered(self):
+        """Indexes that do not fit in 7 bits keep only the correct flag."""
+        self.assertEqual(
+            unpack_answers(pack_answers([1], [(1, 500, False)])), [(None, False)]
+        )
+
+
+class PackedAnswersOnSubmitTests(TestCase):
+    """Tests for packed answers stored by submit_quiz_attempt."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.quiz = Quiz.objects.create(title="Packed Quiz")
+        cls.questions = []
+        # Positions deliberately differ from ID order.
+        for position in (2, 1, 3):
+            question = Question.objects.create(
+                quiz=cls.quiz, text=f"Packed Q{position}?", position=position
+            )
+            Option.objects.create(question=question, text="A", position=1)
+            Option.objects.create(
+                question=question, text="B", position=2, is_correct=True
+            )
+            cls.questions.append(question)
+
+    def setUp(self):
+        cache.clear()
+
+    def _submit(self, answers):
+        response = self.client.post(
+            reverse("multi_choice_quiz:submit_quiz_attempt"),
+            data=json.dumps(
+                {
+                    "quiz_id": self.quiz.id,
+                    "score": 1,
+                    "total_questions": 3,
+                    "percentage": 33.3,
+                    "end_time": "2025-01-01T00:00:00Z",
+                    "attempt_details": {str(q.id): idx for q, idx in answers},
+                }
+            ),
+            content_type="application/json",
+        )
+        return QuizAttempt.objects.get(pk=response.json()["attempt_id"])
+
+    def test_submit_stores_full_answer_sheet(self):
+        """All answers, including correct ones, are packed in quiz order."""
+        logger.info("Testing packed answers written on submit")
+        by_position, first_by_position, _ = self.questions
+        attempt = self._submit([(by_position, 1), (first_by_position, 0)])
+
+        self.assertEqual(bytes(attempt.packed_answers), bytes([0x00, 0x81, 0x7F]))
+        self.assertEqual(
+            attempt.answers_version,
+            question_order_version(
+                [first_by_position.id, by_position.id, self.questions[2].id]
+            ),
+        )
+        self.assertEqual(
+            get_attempt_answer_sheet(attempt),
+            {
+                first_by_position.id: (0, False),
+                by_position.id: (1, True),
+                self.questions[2].id: (None, False),
+            },
+        )
+
+    def test_answer_sheet_requires_matching_version(self):
+        """After the quiz changes, the packed order is no longer trusted."""
+        attempt = self._submit([(self.questions[0], 1)])
+        Question.objects.create(quiz=self.quiz, text="New first?", position=0)
+        attempt = QuizAttempt.objects.select_related("quiz").get(pk=attempt.pk)
+        self.assertIsNone(get_attempt_answer_sheet(attempt))
+        # The raw decode is still available for callers that know the order.
+        self.assertEqual(len(attempt.unpacked_answers), 3)
+
+    def test_answer_sheet_survives_edits_that_keep_question_order(self):
+        """Editing the quiz title or a question's text keeps old sheets decodable."""
+        attempt = self._submit([(self.questions[0], 1)])
+        Quiz.objects.filter(pk=self.quiz.pk).update(title="Renamed Packed Quiz")
+        question = self.questions[1]
+        question.text = "Reworded?"
+        question.save()
+        attempt = QuizAttempt.objects.select_related("quiz").get(pk=attempt.pk)
+        self.assertEqual(
+            get_attempt_answer_sheet(attempt)[self.questions[0].id], (1, True)
+        )
+
+    def test_mistake_review_reads_the_answer_sheet(self):
+        """The review page lists mistakes from the packed answers when present."""
+        logger.info("Testing mistake review built from packed answers")
+        user = get_user_model().objects.create_user(
+            username="packed_reviewer", password="password"
+        )
+        by_position, first_by_position, last = self.questions
+        question_order = get_quiz_question_order(self.quiz)
+        attempt = QuizAttempt.objects.create(
+            user=user,
+            quiz=self.quiz,
+            score=1,
+            total_questions=3,
+            percentage=33.3,
+            attempt_details=None,
+            packed_answers=pack_answers(
+                question_order,
+                [(by_position.id, 1, True), (last.id, 0, False)],
+            ),
+            answers_version=question_order_version(question_order),
+        )
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse("multi_choice_quiz:attempt_mistake_review", args=[attempt.id])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [
+                (mistake["question_id"], mistake["user_answer"])
+                for mistake in response.context["mistakes"]
+            ],
+            [(last.id, "A")],
+        )
@@ -0,0 +1,133 @@
+# src/multi_choice_quiz/tests/test_question_responses.py
+
+import json
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from multi_choice_quiz.models import Quiz, Question, Option, QuizAttempt, QuestionResponse
+
+from .test_logging import setup_test_logging
+
+logger = setup_test_logging(__name__, "multi_choice_quiz")
+
+
+class QuestionResponseTests(TestCase):
+    """Tests for the normalized per-question responses of attempts."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.quiz = Quiz.objects.create(title="Response Quiz")
+        cls.questions = []
+        for position in range(1, 4):
+            question = Question.objects.create(
+                quiz=cls.quiz, text=f"Response Q{position}?", position=position
+            )
+            Option.objects.create(question=question, text="A", position=1)
+            Option.objects.create(
+                question=question, text="B", position=2, is_correct=True
+            )
+            cls.questions.append(question)
+
+    def setUp(self):
+        cache.clear()
+
+    def _payload(self, answers, **extra):
+        payload = {
+            "quiz_id": self.quiz.id,
+            "score": 1,
+            "total_questions": 3,
+            "percentage": 33.3,
+            "end_time": "2025-01-01T00:00:00Z",
+            "attempt_details": {str(q.id): idx for q, idx in answers},
+        }
+        payload.update(extra)
+        return payload
+
+    def test_submit_writes_response_per_answered_question(self):
+        """Correct and incorrect answers are both stored, wrong answers as mistakes."""
+        logger.info("Testing QuestionResponse rows written on submit")
+        q1, q2, q3 = self.questions
+        response = self.client.post(
+            reverse("multi_choice_quiz:submit_quiz_attempt"),
+            data=json.dumps(self._payload([(q1, 1), (q2, 0), (q3, "bogus")])),
+            content_type="application/json",
+        )
+        attempt = QuizAttempt.objects.get(pk=response.json()["attempt_id"])
+        rows = set(
+            attempt.responses.values_list("question_id", "chosen_index", "is_correct")
+        )
+        self.assertEqual(
+            rows, {(q1.id, 1, True), (q2.id, 0, False), (q3.id, None, False)}
+        )
+        self.assertEqual(set(attempt.attempt_details), {str(q2.id), str(q3.id)})
+
+    def test_batch_submission_writes_responses_once(self):
+        """Batch inserts write responses, and a retried batch adds none."""
+        logger.info("Testing QuestionResponse rows written by batch submission")
+        q1 = self.questions[0]
+        body = json.dumps(
+            {"attempts": [self._payload([(q1, 0)], idempotency_key="resp-key-0001")]}
+        )
+        url = reverse("multi_choice_quiz:submit_quiz_attempts_batch")
+        for _ in range(2):
+            self.client.post(url, data=body, content_type="application/json")
+        self.assertEqual(
+            list(QuestionResponse.objects.values_list("question_id", "is_correct")),
+            [(q1.id, False)],
+        )
+
+    def test_miss_count_is_a_plain_query(self):
+        """Per-question statistics no longer need attempt_details parsing."""
+        q1 = self.questions[0]
+        url = reverse("multi_choice_quiz:submit_quiz_attempt")
+        for answer in (0, 0, 1):
+            self.client.post(
+                url,
+                data=json.dumps(self._payload([(q1, answer)])),
+                content_type="application/json",
+            )
+        self.assertEqual(
+            QuestionResponse.objects.filter(question=q1, is_correct=False).count(), 2
+        )
+
+    def test_backfill_command_converts_attempt_details(self):
+        """Legacy attempts get incorrect responses from their stored mistakes."""
+        logger.info("Testing backfill_question_responses command")
+        q1, q2, _ = self.questions
+        legacy = [
+            QuizAttempt.objects.create(
+                quiz=self.quiz,
+                score=1,
+                total_questions=3,
+                percentage=33.3,
+                attempt_details={
+                    str(q1.id): {"user_answer_idx": 0, "correct_answer_idx": 1},
+                    str(q2.id): {"user_answer_idx": 2, "correct_answer_idx": 1},
+                    "999999": {"user_answer_idx": 0, "correct_answer_idx": 1},
+                },
+            )
+            for _ in range(3)
+        ]
+        QuizAttempt.objects.create(
+            quiz=self.quiz, score=3, total_questions=3, percentage=100
+        )
+
+        out = StringIO()
+        call_command("backfill_question_responses", batch_size=2, stdout=out)
+        self.assertIn("6 responses for 3 attempts", out.getvalue())
+        self.assertEqual(
+            set(
+                legacy[0].responses.values_list(
+                    "question_id", "chosen_index", "is_correct"
+                )
+            ),
+            {(q1.id, 0, False), (q2.id, 2, False)},
+        )
+
+        # Re-running finds nothing left to do.
+        call_command("backfill_question_responses", stdout=StringIO())
+        self.assertEqual(QuestionResponse.objects.count(), 6)
@@ -0,0 +1,199 @@
+# src/multi_choice_quiz/tests/test_review_cards.py
+
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from multi_choice_quiz.models import ReviewCard, UserMistake
+from multi_choice_quiz.scheduling import MIN_EASE, reschedule
+from multi_choice_quiz.transform import review_queue_to_frontend
+from multi_choice_quiz.utils import quiz_bank_to_models
+
+from .test_logging import setup_test_logging
+
+logger = setup_test_logging(__name__, "multi_choice_quiz")
+
+User = get_user_model()
+
+T0 = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class RescheduleTests(TestCase):
+    """Tests for the SM-2 pass/fail scheduling rules."""
+
+    def test_correct_reviews_grow_interval(self):
+        logger.info("Testing review intervals for consecutive correct answers")
+        card = ReviewCard(next_due=T0, last_reviewed_at=T0)
+        intervals = []
+        for _ in range(4):
+            reschedule(card, True, T0)
+            intervals.append(card.interval_days)
+        self.assertEqual(intervals, [1, 6, 15, 38])
+        self.assertEqual(card.next_due, T0 + timedelta(days=38))
+
+    def test_lapse_resets_card_and_lowers_ease(self):
+        logger.info("Testing review lapse")
+        card = ReviewCard(
+            next_due=T0, last_reviewed_at=T0, interval_days=15, repetitions=3
+        )
+        reschedule(card, False, T0)
+        self.assertEqual(
+            (card.interval_days, card.repetitions, card.lapses, card.ease),
+            (0, 0, 1, 2.3),
+        )
+        self.assertEqual(card.next_due, T0)
+
+        for _ in range(10):
+            reschedule(card, False, T0)
+        self.assertEqual(card.ease, MIN_EASE)
+
+
+class ReviewQueueTests(TestCase):
+    """Tests for review cards maintained on submit and the review session endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="reviewer", password="pw")
+        cls.quiz = quiz_bank_to_models(
+            [
+                {"text": f"Card Q{i}?", "options": ["A", "B", "C"], "answerIndex": 2}
+                for i in range(1, 4)
+            ],
+            "Review Card Quiz",
+        )
+        cls.q1, cls.q2, cls.q3 = cls.quiz.questions.order_by("position")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def _submit_quiz(self, answers, end_time="2025-01-01T00:00:00Z"):
+        response = self.client.post(
+            reverse("multi_choice_quiz:submit_quiz_attempt"),
+            data=json.dumps(
+                {
+                    "quiz_id": self.quiz.id,
+                    "score": 0,
+                    "total_questions": 3,
+                    "percentage": 0,
+                    "end_time": end_time,
+                    # Option index 1 ("B") is correct
+                    "attempt_details": {str(q.id): idx for q, idx in answers},
+                }
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def _submit_review(self, answers, end_time):
+        return self.client.post(
+            reverse("multi_choice_quiz:submit_review_session"),
+            data=json.dumps(
+                {
+                    "end_time": end_time,
+                    "attempt_details": {str(q.id): idx for q, idx in answers},
+                }
+            ),
+            content_type="application/json",
+        )
+
+    def test_quiz_misses_create_due_cards(self):
+        """Missed questions get a card due immediately; correct ones none."""
+        logger.info("Testing review cards created on quiz submit")
+        self._submit_quiz([(self.q1, 0), (self.q2, 1)])
+        card = ReviewCard.objects.get(user=self.user)
+        self.assertEqual(card.question_id, self.q1.id)
+        self.assertEqual(card.next_due, T0)
+        self.assertEqual((card.repetitions, card.lapses), (0, 0))
+
+    def test_review_session_reschedules_cards(self):
+        logger.info("Testing review session rescheduling")
+        self._submit_quiz([(self.q1, 0), (self.q2, 2)])
+        response = self._submit_review(
+            [(self.q1, 1), (self.q2, 0), (self.q3, 0)], "2025-01-02T00:00:00Z"
+        )
+        self.assertEqual(response.status_code, 200)
+        # q3 has no card (never missed in a quiz), so its answer is not graded.
+        self.assertEqual(response.json(), {"status": "success", "reviewed": 2})
+
+        cards = {c.question_id: c for c in ReviewCard.objects.filter(user=self.user)}
+        self.assertEqual(set(cards), {self.q1.id, self.q2.id})
+        self.assertFalse(
+            UserMistake.objects.filter(user=self.user, question=self.q3).exists()
+        )
+        reviewed_at = T0 + timedelta(days=1)
+        self.assertEqual(cards[self.q1.id].next_due, reviewed_at + timedelta(days=1))
+        self.assertEqual(cards[self.q1.id].repetitions, 1)
+        self.assertEqual(cards[self.q2.id].next_due, reviewed_at)
+        self.assertEqual(cards[self.q2.id].lapses, 1)
+
+    def test_review_submit_requires_login(self):
+        logger.info("Testing review submit rejects anonymous users")
+        self.client.logout()
+        response = self._submit_review([(self.q1, 1)], "2025-01-02T00:00:00Z")
+        self.assertEqual(response.status_code, 403)
+
+    def test_review_submit_requires_csrf_token(self):
+        logger.info("Testing review submit CSRF protection")
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        response = client.post(
+            reverse("multi_choice_quiz:submit_review_session"),
+            data=json.dumps(
+                {"end_time": "2025-01-02T00:00:00Z", "attempt_details": {}}
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_review_submit_rejects_invalid_payload(self):
+        logger.info("Testing review submit validation")
+        response = self._submit_review([(self.q1, 1)], "not-a-date")
+        self.assertEqual(response.status_code, 400)
+
+    def test_due_queue_is_single_query_in_quizapp_format(self):
+        logger.info("Testing due review queue payload and query count")
+        self._submit_quiz([(self.q2, 0)], "2025-01-01T00:00:00Z")
+        self._submit_quiz([(self.q1, 0)], "2025-01-03T00:00:00Z")
+        self._submit_quiz([(self.q3, 0)], "2099-01-01T00:00:00Z")  # Not due yet
+
+        with CaptureQueriesContext(connection) as ctx:
+            questions = review_queue_to_frontend(self.user.id, timezone.now(), 50)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual([q["id"] for q in questions], [self.q2.id, self.q1.id])
+        self.assertEqual(
+            questions[0],
+            {
+                "id": self.q2.id,
+                "text": "Card Q2?",
+                "options": ["A", "B", "C"],
+                "answerIndex": 1,
+                "tag": "",
+            },
+        )
+        self.assertEqual(
+            len(review_queue_to_frontend(self.user.id, timezone.now(), 1)), 1
+        )
+
+        response = self.client.get(reverse("multi_choice_quiz:review_due"))
+        self.assertEqual(response.json()["questions"], questions)
+
+    def test_review_page_inlines_due_questions(self):
+        logger.info("Testing review session page")
+        response = self.client.get(reverse("multi_choice_quiz:review_session"))
+        self.assertRedirects(response, reverse("multi_choice_quiz:my_mistakes"))
+
+        self._submit_quiz([(self.q1, 0)])
+        response = self.client.get(reverse("multi_choice_quiz:review_session"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Card Q1?")
+        self.assertContains(
+            response, reverse("multi_choice_quiz:submit_review_session")
+        )
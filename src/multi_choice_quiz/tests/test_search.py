@@ -0,0 +1,234 @@
+# src/multi_choice_quiz/tests/test_search.py
+
+from importlib import import_module
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from multi_choice_quiz.models import Option, Question, Quiz
+from multi_choice_quiz.search import (
+    SEARCH_INDEX_TABLE,
+    index_quizzes,
+    search_backend,
+    search_question_ids,
+    search_quizzes,
+)
+from multi_choice_quiz.transform import (
+    quiz_bank_to_models as transform_quiz_bank_to_models,
+)
+from multi_choice_quiz.utils import quiz_bank_to_models
+
+from .test_logging import setup_test_logging
+
+logger = setup_test_logging(__name__, "multi_choice_quiz")
+
+
+class SearchIndexTests(TestCase):
+    """Tests for the full-text search index over quizzes, questions and options."""
+
+    def setUp(self):
+        self.decorators = quiz_bank_to_models(
+            [
+                {
+                    "text": "What does a Python decorator return?",
+                    "options": ["A wrapped function", "A module"],
+                    "answerIndex": 1,
+                },
+                {
+                    "text": "Which keyword defines a generator?",
+                    "options": ["yield", "emit"],
+                    "answerIndex": 1,
+                },
+            ],
+            "Python Functions",
+        )
+        self.history = quiz_bank_to_models(
+            [
+                {
+                    "text": "Who crossed the Rubicon?",
+                    "options": ["Caesar", "Pompey"],
+                    "answerIndex": 1,
+                }
+            ],
+            "Roman Republic",
+        )
+
+    def _quiz_ids(self, query):
+        return [hit.quiz_id for hit in search_quizzes(query)]
+
+    def test_imported_quizzes_are_searchable(self):
+        logger.info("Testing search over imported questions and options")
+        self.assertEqual(self._quiz_ids("decorator"), [self.decorators.id])
+        self.assertEqual(self._quiz_ids("Caesar"), [self.history.id])  # Option text
+        self.assertEqual(self._quiz_ids("roman"), [self.history.id])  # Title
+        self.assertEqual(self._quiz_ids("python gen"), [self.decorators.id])  # Prefix
+        self.assertEqual(self._quiz_ids("caesar python"), [])
+        self.assertEqual(self._quiz_ids("  ?! "), [])
+
+        hit = search_quizzes("rubicon")[0]
+        self.assertEqual(hit.question_id, self.history.questions.get().id)
+
+    def test_title_matches_rank_first(self):
+        logger.info("Testing search ranking")
+        mention = quiz_bank_to_models(
+            [
+                {
+                    "text": "Was the Roman army large?",
+                    "options": ["Yes", "No"],
+                    "answerIndex": 1,
+                }
+            ],
+            "Ancient Armies",
+        )
+        self.assertEqual(self._quiz_ids("roman"), [self.history.id, mention.id])
+
+    def test_model_changes_update_index(self):
+        logger.info("Testing incremental search indexing on saves")
+        question = self.history.questions.get()
+        question.text = "Who was assassinated on the Ides of March?"
+        question.save()
+        self.assertEqual(self._quiz_ids("rubicon"), [])
+        self.assertEqual(self._quiz_ids("ides march"), [self.history.id])
+
+        Option.objects.create(question=question, text="Brutus", position=3)
+        self.assertEqual(self._quiz_ids("brutus"), [self.history.id])
+
+        self.decorators.title = "Advanced Callables"
+        self.decorators.save()
+        # The new title is part of every question row of the quiz.
+        self.assertEqual(self._quiz_ids("callables yield"), [self.decorators.id])
+
+        Quiz.objects.filter(pk=self.history.pk).update(is_active=False)
+        self.assertEqual(self._quiz_ids("brutus"), [])
+
+        question.delete()
+        self.decorators.delete()
+        if search_backend():
+            self.assertEqual(search_question_ids("brutus"), [])
+            self.assertEqual(search_question_ids("decorator"), [])
+
+    def test_rebuild_command(self):
+        logger.info("Testing rebuild_search_index command")
+        if search_backend() is None:
+            self.skipTest("No search index on this database")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_INDEX_TABLE}")
+        self.assertEqual(self._quiz_ids("decorator"), [])
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("Indexed 2 quizzes", out.getvalue())
+        self.assertEqual(self._quiz_ids("decorator"), [self.decorators.id])
+
+    def test_quizzes_page_search(self):
+        logger.info("Testing search on the quizzes page")
+        response = self.client.get(reverse("pages:quizzes"), {"q": "wrapped function"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["quizzes"]), [self.decorators])
+        self.assertContains(response, 'data-testid="search-summary"')
+
+    def test_admin_question_search_uses_index(self):
+        logger.info("Testing admin question search")
+        admin = get_user_model().objects.create_superuser(
+            username="searchadmin", password="pw", email="admin@example.com"
+        )
+        self.client.force_login(admin)
+        response = self.client.get(
+            reverse("admin:multi_choice_quiz_question_changelist"), {"q": "caesar"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [q.id for q in response.context["cl"].result_list],
+            [self.history.questions.get().id],
+        )
+
+    def test_admin_question_search_keeps_search_fields(self):
+        """Tag matches and inactive questions are still found through search_fields."""
+        logger.info("Testing admin question search over search_fields")
+        admin = get_user_model().objects.create_superuser(
+            username="searchadmin", password="pw", email="admin@example.com"
+        )
+        self.client.force_login(admin)
+        question = self.history.questions.get()
+        Question.objects.filter(pk=question.pk).update(
+            tag="antiquity", is_active=False
+        )
+        url = reverse("admin:multi_choice_quiz_question_changelist")
+        for term in ("antiquity", "rubicon"):
+            response = self.client.get(url, {"q": term})
+            self.assertEqual(
+                [q.id for q in response.context["cl"].result_list], [question.id]
+            )
+
+    def test_row_by_row_import_reindexes_once(self):
+        """transform.quiz_bank_to_models saves rows one by one but indexes once."""
+        logger.info("Testing deferred indexing during row-by-row imports")
+        if search_backend() is None:
+            self.skipTest("No search index on this database")
+        with CaptureQueriesContext(connection) as ctx:
+            quiz = transform_quiz_bank_to_models(
+                [
+                    {
+                        "text": f"Which legion was number {i}?",
+                        "options": ["First", "Second", "Third"],
+                        "answerIndex": 1,
+                    }
+                    for i in range(5)
+                ],
+                "Roman Legions",
+            )
+        index_writes = [
+            query["sql"]
+            for query in ctx.captured_queries
+            if SEARCH_INDEX_TABLE in query["sql"]
+            and query["sql"].lstrip().startswith("DELETE")
+        ]
+        self.assertEqual(len(index_writes), 1, index_writes)
+        self.assertEqual(self._quiz_ids("legion"), [quiz.id])
+
+    def test_fallback_matches_the_indexed_fields(self):
+        """Without an index, descriptions and option texts are still searched."""
+        logger.info("Testing icontains search fallback")
+        Quiz.objects.filter(pk=self.history.pk).update(description="Late Republic")
+        Question.objects.create(
+            quiz=self.decorators, text="Inactive metaclass question", is_active=False
+        )
+        queries = {
+            "late republic": [self.history.id],  # Description
+            "pompey": [self.history.id],  # Option text
+            "python wrapped": [self.decorators.id],  # Title plus option
+            "yield decorator": [],  # Words from two different questions
+            "metaclass": [],  # Inactive question
+        }
+        if search_backend():
+            index_quizzes([self.history.pk])
+            for query, expected in queries.items():
+                self.assertEqual(self._quiz_ids(query), expected, query)
+        with patch("multi_choice_quiz.search.search_backend", return_value=None):
+            for query, expected in queries.items():
+                self.assertEqual(self._quiz_ids(query), expected, query)
+
+    def test_initial_index_orders_option_texts(self):
+        """Migration 0011 indexes options in position order, like index_questions."""
+        if connection.vendor != "sqlite":
+            self.skipTest("Checks the SQLite migration SQL")
+        question = Question.objects.create(quiz=self.history, text="Order?")
+        for position in (3, 1, 2):
+            Option.objects.create(
+                question=question, text=f"Option {position}", position=position
+            )
+        migration = import_module("multi_choice_quiz.migrations.0011_search_index")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {migration.QUESTION_BODY['sqlite']} "
+                "FROM multi_choice_quiz_question qu WHERE qu.id = %s",
+                [question.id],
+            )
+            self.assertEqual(
+                cursor.fetchone()[0], "Order?\nOption 1\nOption 2\nOption 3"
+            )
@@ -0,0 +1,238 @@
+# src/multi_choice_quiz/tests/test_user_mistakes.py
+
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from multi_choice_quiz.models import UserMistake
+from multi_choice_quiz.utils import quiz_bank_to_models
+
+from .test_logging import setup_test_logging
+
+logger = setup_test_logging(__name__, "multi_choice_quiz")
+
+User = get_user_model()
+
+
+class UserMistakeIndexTests(TestCase):
+    """Tests for the per-user mistake index maintained on submit."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="forgetful", password="pw")
+        cls.quiz = quiz_bank_to_models(
+            [
+                {"text": f"Index Q{i}?", "options": ["A", "B", "C"], "answerIndex": 2}
+                for i in range(1, 4)
+            ],
+            "Mistake Index Quiz",
+        )
+        cls.q1, cls.q2, cls.q3 = cls.quiz.questions.order_by("position")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def _attempt(self, answers, end_time, **extra):
+        attempt = {
+            "quiz_id": self.quiz.id,
+            "score": 0,
+            "total_questions": 3,
+            "percentage": 0,
+            "end_time": end_time,
+            # answerIndex is 1-based, so option index 1 ("B") is correct
+            "attempt_details": {str(q.id): idx for q, idx in answers},
+        }
+        attempt.update(extra)
+        return attempt
+
+    def _submit(self, answers, end_time):
+        response = self.client.post(
+            reverse("multi_choice_quiz:submit_quiz_attempt"),
+            data=json.dumps(self._attempt(answers, end_time)),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def _index(self):
+        return {
+            m.question_id: (m.miss_count, m.last_chosen_index, m.last_missed_at.year)
+            for m in UserMistake.objects.filter(user=self.user)
+        }
+
+    def test_submit_updates_index_incrementally(self):
+        """Misses are counted per question, keeping the latest chosen option."""
+        logger.info("Testing incremental UserMistake updates")
+        self._submit([(self.q1, 0), (self.q2, 1)], "2024-01-01T00:00:00Z")
+        self.assertEqual(self._index(), {self.q1.id: (1, 0, 2024)})
+
+        self._submit([(self.q1, 2), (self.q2, 0), (self.q3, 1)], "2025-01-01T00:00:00Z")
+        self.assertEqual(
+            self._index(), {self.q1.id: (2, 2, 2025), self.q2.id: (1, 0, 2025)}
+        )
+
+    def test_older_attempt_does_not_move_last_miss_back(self):
+        """An offline attempt synced late counts, but keeps the newer last miss."""
+        logger.info("Testing out-of-order attempts in the mistake index")
+        self._submit([(self.q1, 2)], "2025-01-01T00:00:00Z")
+        self._submit([(self.q1, 0)], "2024-01-01T00:00:00Z")
+        self.assertEqual(self._index(), {self.q1.id: (2, 2, 2025)})
+
+    def test_anonymous_attempts_are_not_indexed(self):
+        logger.info("Testing anonymous attempts skip the mistake index")
+        self.client.logout()
+        self._submit([(self.q1, 0)], "2025-01-01T00:00:00Z")
+        self.assertFalse(UserMistake.objects.exists())
+
+    def test_replayed_batch_is_not_counted_twice(self):
+        """Attempts skipped as duplicates do not add to the index again."""
+        logger.info("Testing batch replay leaves the mistake index unchanged")
+        batch = {
+            "attempts": [
+                self._attempt(
+                    [(self.q1, 0)], "2025-01-01T00:00:00Z", idempotency_key="mistake-a"
+                ),
+                self._attempt(
+                    [(self.q1, 2)], "2025-02-01T00:00:00Z", idempotency_key="mistake-b"
+                ),
+            ]
+        }
+        for _ in range(2):
+            response = self.client.post(
+                reverse("multi_choice_quiz:submit_quiz_attempts_batch"),
+                data=json.dumps(batch),
+                content_type="application/json",
+            )
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._index(), {self.q1.id: (2, 2, 2025)})
+
+
+class MyMistakesPageTests(TestCase):
+    """Tests for the paginated "My Mistakes" page."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="notebook", password="pw")
+        cls.other = User.objects.create_user(username="someoneelse", password="pw")
+        cls.quiz = quiz_bank_to_models(
+            [
+                {"text": f"Page Q{i}?", "options": ["A", "B", "C"], "answerIndex": 1}
+                for i in range(1, 46)
+            ],
+            "Many Mistakes Quiz",
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def _miss_questions(self, user, count):
+        for question in self.quiz.questions.order_by("position")[:count]:
+            UserMistake.objects.create(
+                user=user,
+                question=question,
+                last_missed_at=self.quiz.created_at,
+                last_chosen_index=1,
+            )
+
+    def _page_queries(self, page=1):
+        executed = []
+
+        def record_query(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        # connection.queries is reset per request, so record via a wrapper.
+        with connection.execute_wrapper(record_query):
+            response = self.client.get(
+                reverse("multi_choice_quiz:my_mistakes"), {"page": page}
+            )
+        self.assertEqual(response.status_code, 200)
+        return response, len(executed)
+
+    def test_anonymous_user_redirected_to_login(self):
+        logger.info("Testing My Mistakes requires login")
+        response = self.client.get(reverse("multi_choice_quiz:my_mistakes"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_page_lists_only_own_mistakes_with_answers(self):
+        logger.info("Testing My Mistakes page content")
+        self._miss_questions(self.user, 1)
+        self._miss_questions(self.other, 3)
+        self.client.force_login(self.user)
+        response, _ = self._page_queries()
+        mistakes = response.context["mistakes"]
+        self.assertEqual(len(mistakes), 1)
+        self.assertEqual(mistakes[0]["question_text"], "Page Q1?")
+        self.assertEqual(mistakes[0]["user_answer"], "B")
+        self.assertEqual(mistakes[0]["correct_answer"], "A")
+        self.assertEqual(mistakes[0]["quiz"].title, "Many Mistakes Quiz")
+        self.assertContains(response, "Missed 1x")
+
+    def test_query_count_is_flat_and_paginated(self):
+        """A page costs session, user, count, mistakes+questions+quizzes, options."""
+        logger.info("Testing My Mistakes query count")
+        self.client.force_login(self.user)
+        self._miss_questions(self.user, 2)
+        _, few = self._page_queries()
+        UserMistake.objects.all().delete()
+        self._miss_questions(self.user, 45)
+        response, many = self._page_queries()
+        self.assertEqual(few, 5)
+        self.assertEqual(many, 5)
+        self.assertEqual(len(response.context["mistakes"]), 20)
+        self.assertEqual(response.context["page_obj"].paginator.num_pages, 3)
+
+        response, _ = self._page_queries(page=3)
+        self.assertEqual(len(response.context["mistakes"]), 5)
+
+    def test_rebuild_command_matches_incremental_index(self):
+        logger.info("Testing rebuild_user_mistakes command")
+        self.client.force_login(self.user)
+        for idx, end_time in [(0, "2024-01-01T00:00:00Z"), (2, "2025-01-01T00:00:00Z")]:
+            self.client.post(
+                reverse("multi_choice_quiz:submit_quiz_attempt"),
+                data=json.dumps(
+                    {
+                        "quiz_id": self.quiz.id,
+                        "score": 0,
+                        "total_questions": 45,
+                        "percentage": 0,
+                        "end_time": end_time,
+                        "attempt_details": {
+                            str(q.id): idx
+                            for q in self.quiz.questions.order_by("position")[:2]
+                        },
+                    }
+                ),
+                content_type="application/json",
+            )
+        incremental = set(
+            UserMistake.objects.values_list(
+                "user_id",
+                "question_id",
+                "miss_count",
+                "last_chosen_index",
+                "last_missed_at",
+            )
+        )
+        self.assertEqual(len(incremental), 2)
+
+        call_command("rebuild_user_mistakes", stdout=StringIO())
+        self.assertEqual(
+            set(
+                UserMistake.objects.values_list(
+                    "user_id",
+                    "question_id",
+                    "miss_count",
+                    "last_chosen_index",
+                    "last_missed_at",
+                )
+            ),
+            incremental,
+        )
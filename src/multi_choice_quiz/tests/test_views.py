@@ -3,7 +3,8 @@
 
 import json
 from datetime import datetime, timezone
-from django.test import TestCase, Client
+from django.db import connection
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.utils.safestring import mark_safe
@@ -19,6 +20,9 @@ from multi_choice_quiz.models import (
 )
 
 # --- Replace existing logger setup with this ---
+from multi_choice_quiz.utils import quiz_bank_to_models
+from multi_choice_quiz.views import QUIZ_DATA_SEEN_COOKIE
+
 from .test_logging import setup_test_logging
 
 logger = setup_test_logging(__name__, "multi_choice_quiz")
@@ -324,6 +328,66 @@ class SubmitQuizAttemptViewTests(TestCase):
         self.assertEqual(response.status_code, 405)
         self.assertEqual(QuizAttempt.objects.count(), 0)
 
+    async def test_submit_via_async_client(self):
+        """The async view saves the attempt and resolves the session user (ASGI)."""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.post(
+            self.submit_url,
+            data=json.dumps(self.valid_payload),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        attempt = await QuizAttempt.objects.select_related("user").aget(
+            pk=response.json()["attempt_id"]
+        )
+        self.assertEqual(attempt.user, self.user)
+        self.assertEqual(attempt.end_time, self.fixed_end_time)
+
+    def test_replayed_idempotency_key_is_not_inserted_again(self):
+        """A replayed submission (e.g. from the offline queue) is a duplicate."""
+        self.client.force_login(self.user)
+        payload = dict(self.valid_payload, idempotency_key="single-key-0001")
+        first = self.client.post(
+            self.submit_url, data=json.dumps(payload), content_type="application/json"
+        ).json()
+        replay = self.client.post(
+            self.submit_url, data=json.dumps(payload), content_type="application/json"
+        ).json()
+        self.assertEqual(
+            replay,
+            {"status": "success", "attempt_id": first["attempt_id"], "duplicate": True},
+        )
+        self.assertEqual(QuizAttempt.objects.count(), 1)
+        self.assertEqual(
+            QuizAttempt.objects.get().idempotency_key, "single-key-0001"
+        )
+
+    def test_invalid_idempotency_key_rejected(self):
+        payload = dict(self.valid_payload, idempotency_key="bad key")
+        response = self.client.post(
+            self.submit_url, data=json.dumps(payload), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(QuizAttempt.objects.count(), 0)
+
+    def test_score_is_graded_from_submitted_answers(self):
+        """The stored score comes from the answer key, not the submitted score."""
+        question = self.quiz.questions.get()
+        payload = dict(
+            self.valid_payload,
+            score=1,
+            total_questions=5,
+            percentage=100.0,
+            attempt_details={str(question.id): 1},  # Wrong: Opt A is correct
+        )
+        response = self.client.post(
+            self.submit_url, data=json.dumps(payload), content_type="application/json"
+        )
+        attempt = QuizAttempt.objects.get(pk=response.json()["attempt_id"])
+        self.assertEqual(
+            (attempt.score, attempt.total_questions, attempt.percentage), (0, 1, 0.0)
+        )
+
 
 # === Tests for attempt_mistake_review view ===
 class AttemptMistakeReviewViewTests(TestCase):
@@ -487,3 +551,339 @@ class AttemptMistakeReviewViewTests(TestCase):
         self.assertEqual(
             mistake3["correct_answer"], "Q3 Opt 3 (Correct)"
         )  # Correct is index 2
+
+
+class MistakeReviewQueryCountTests(TestCase):
+    """Regression test: the mistake review runs a fixed number of queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="manymistakes", password="pw")
+        cls.quiz = quiz_bank_to_models(
+            [
+                {
+                    "text": f"Review Q{i}?",
+                    "options": ["A", "B", "C", "D"],
+                    "answerIndex": 1,
+                }
+                for i in range(100)
+            ],
+            "Large Review Quiz",
+        )
+
+    def _review_queries(self, num_mistakes):
+        question_ids = list(
+            self.quiz.questions.order_by("position").values_list("id", flat=True)
+        )[:num_mistakes]
+        attempt = QuizAttempt.objects.create(
+            user=self.user,
+            quiz=self.quiz,
+            score=100 - num_mistakes,
+            total_questions=100,
+            percentage=100 - num_mistakes,
+            attempt_details={
+                str(q_id): {"user_answer_idx": 2, "correct_answer_idx": 0}
+                for q_id in question_ids
+            },
+        )
+        executed = []
+
+        def record_query(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        # connection.queries is reset per request, so record via a wrapper.
+        with connection.execute_wrapper(record_query):
+            response = self.client.get(
+                reverse("multi_choice_quiz:attempt_mistake_review", args=[attempt.id])
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["mistakes"]), num_mistakes)
+        return len(executed)
+
+    def test_query_count_is_constant(self):
+        """100 mistakes cost the same queries as 1: session, user, attempt+quiz,
+        questions, options."""
+        logger.info("Testing mistake review query count")
+        self.client.force_login(self.user)
+        self.assertEqual(self._review_queries(100), 5)
+        self.assertEqual(self._review_queries(1), 5)
+
+
+class QuizDataEndpointTests(TestCase):
+    """Tests for the conditional-GET quiz data JSON endpoint."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.quiz = Quiz.objects.create(title="Data Endpoint Quiz")
+        cls.q1 = Question.objects.create(quiz=cls.quiz, text="Data Q1?", position=1)
+        cls.opt1 = Option.objects.create(
+            question=cls.q1, text="Data Opt1", position=1, is_correct=True
+        )
+        Option.objects.create(question=cls.q1, text="Data Opt2", position=2)
+        cls.inactive_quiz = Quiz.objects.create(title="Inactive Data", is_active=False)
+
+    def setUp(self):
+        self.url = reverse("multi_choice_quiz:quiz_data", args=[self.quiz.id])
+
+    def test_returns_payload_with_validators(self):
+        """Endpoint returns the frontend payload with ETag and Last-Modified."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+        self.assertIn("no-cache", response["Cache-Control"])
+        data = response.json()
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["text"], "Data Q1?")
+        self.assertEqual(data[0]["answerIndex"], 0)
+
+    async def test_async_client_conditional_get(self):
+        """Under ASGI the endpoint serves the payload and honours If-None-Match."""
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["text"], "Data Q1?")
+        revalidated = await self.async_client.get(
+            self.url, headers={"if-none-match": response["ETag"]}
+        )
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_if_none_match_returns_304(self):
+        """A matching If-None-Match is answered with an empty 304."""
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_etag_changes_when_content_changes(self):
+        """Editing an option yields a new ETag and a full 200 response."""
+        etag = self.client.get(self.url)["ETag"]
+        self.opt1.text = "Data Opt1 (edited)"
+        self.opt1.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()[0]["options"][0], "Data Opt1 (edited)")
+
+    def test_inactive_quiz_returns_404(self):
+        """Inactive quizzes are not exposed."""
+        url = reverse("multi_choice_quiz:quiz_data", args=[self.inactive_quiz.id])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_quiz_detail_exposes_data_url(self):
+        """The quiz page tells app.js where to load/revalidate the data."""
+        response = self.client.get(
+            reverse("multi_choice_quiz:quiz_detail", args=[self.quiz.id])
+        )
+        self.assertContains(response, f'data-quiz-data-url="{self.url}"')
+
+    def test_repeat_visit_loads_data_endpoint(self):
+        """Only the first visit inlines the payload; later ones use data.json."""
+        detail_url = reverse("multi_choice_quiz:quiz_detail", args=[self.quiz.id])
+        first = self.client.get(detail_url)
+        self.assertContains(first, "Data Q1?")
+        cookie = first.cookies[QUIZ_DATA_SEEN_COOKIE]
+        self.assertEqual(cookie["path"], detail_url)
+
+        repeat = self.client.get(detail_url)
+        self.assertEqual(json.loads(str(repeat.context["quiz_data"])), [])
+        self.assertNotContains(repeat, "Data Q1?")
+        self.assertContains(repeat, f'data-quiz-data-url="{self.url}"')
+
+
+@override_settings(QUIZ_PAGED_DELIVERY_THRESHOLD=5, QUIZ_PAGE_SIZE=3)
+class QuizPagedDeliveryTests(TestCase):
+    """Tests for paged delivery of large quizzes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.big_quiz = Quiz.objects.create(title="Big Paged Quiz")
+        for i in range(1, 9):
+            q = Question.objects.create(quiz=cls.big_quiz, text=f"Paged Q{i}?", position=i)
+            Option.objects.create(question=q, text="Right", position=1, is_correct=True)
+            Option.objects.create(question=q, text="Wrong", position=2)
+        cls.small_quiz = Quiz.objects.create(title="Small Quiz")
+        q = Question.objects.create(quiz=cls.small_quiz, text="Small Q1?", position=1)
+        Option.objects.create(question=q, text="Right", position=1, is_correct=True)
+
+    def _inline_data(self, response):
+        return json.loads(str(response.context["quiz_data"]))
+
+    def test_large_quiz_inlines_first_window_only(self):
+        """Quizzes above the threshold inline one window and expose the endpoint."""
+        response = self.client.get(
+            reverse("multi_choice_quiz:quiz_detail", args=[self.big_quiz.id])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["paged_delivery"])
+        self.assertEqual(response.context["total_questions"], 8)
+        inline = self._inline_data(response)
+        self.assertEqual([q["text"] for q in inline], ["Paged Q1?", "Paged Q2?", "Paged Q3?"])
+        window_url = reverse(
+            "multi_choice_quiz:quiz_questions_window", args=[self.big_quiz.id]
+        )
+        self.assertContains(response, f'data-quiz-questions-url="{window_url}"')
+        self.assertContains(response, 'data-total-questions="8"')
+
+    def test_small_quiz_is_not_paged(self):
+        """Quizzes at or below the threshold inline every question."""
+        response = self.client.get(
+            reverse("multi_choice_quiz:quiz_detail", args=[self.small_quiz.id])
+        )
+        self.assertFalse(response.context["paged_delivery"])
+        self.assertEqual(len(self._inline_data(response)), 1)
+        self.assertNotContains(response, "data-quiz-questions-url")
+
+    def test_window_endpoint_returns_slice(self):
+        """The window endpoint returns the requested slice and the total."""
+        url = reverse("multi_choice_quiz:quiz_questions_window", args=[self.big_quiz.id])
+        response = self.client.get(url, {"offset": 6, "limit": 3})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["offset"], 6)
+        self.assertEqual(data["total"], 8)
+        self.assertEqual([q["text"] for q in data["questions"]], ["Paged Q7?", "Paged Q8?"])
+        self.assertEqual(data["questions"][0]["answerIndex"], 0)
+
+        # Windows revalidate like the full payload.
+        not_modified = self.client.get(
+            url, {"offset": 6, "limit": 3}, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_window_endpoint_rejects_bad_parameters(self):
+        """Non-integer or negative bounds are rejected."""
+        url = reverse("multi_choice_quiz:quiz_questions_window", args=[self.big_quiz.id])
+        self.assertEqual(self.client.get(url, {"offset": "x"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"offset": -1}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"limit": 0}).status_code, 400)
+        # Offsets past the last question (8 questions) are rejected.
+        self.assertEqual(self.client.get(url, {"offset": 8}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"offset": 50}).status_code, 400)
+
+    def test_window_bounds_snap_to_page_size(self):
+        """Offsets snap down and limits up to page boundaries (page size 3)."""
+        url = reverse("multi_choice_quiz:quiz_questions_window", args=[self.big_quiz.id])
+        data = self.client.get(url, {"offset": 4, "limit": 4}).json()
+        self.assertEqual((data["offset"], data["limit"]), (3, 6))
+        self.assertEqual(
+            [q["text"] for q in data["questions"]],
+            ["Paged Q4?", "Paged Q5?", "Paged Q6?", "Paged Q7?", "Paged Q8?"],
+        )
+        # Oversized limits are capped at the largest whole number of pages.
+        data = self.client.get(url, {"limit": 1000}).json()
+        self.assertEqual(data["limit"], 99)
+
+
+class SubmitQuizAttemptsBatchTests(TestCase):
+    """Tests for the batch submission endpoint used for offline sync."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.quiz = Quiz.objects.create(title="Batch Submission Quiz")
+        cls.question = Question.objects.create(
+            quiz=cls.quiz, text="Batch Q1", position=1
+        )
+        Option.objects.create(
+            question=cls.question, text="Opt A", position=1, is_correct=True
+        )
+        Option.objects.create(question=cls.question, text="Opt B", position=2)
+        cls.user = User.objects.create_user(username="syncer", password="password123")
+        cls.url = reverse("multi_choice_quiz:submit_quiz_attempts_batch")
+
+    def _attempt(self, key, **overrides):
+        attempt = {
+            "idempotency_key": key,
+            "quiz_id": self.quiz.id,
+            "score": 0,
+            "total_questions": 1,
+            "percentage": 0.0,
+            "end_time": "2024-05-15T10:30:00Z",
+            "attempt_details": {str(self.question.id): 1},
+        }
+        attempt.update(overrides)
+        return attempt
+
+    def _post(self, attempts):
+        return self.client.post(
+            self.url,
+            data=json.dumps({"attempts": attempts}),
+            content_type="application/json",
+        )
+
+    def test_batch_creates_attempts_with_per_item_status(self):
+        """Valid items are created and graded; invalid ones get an error status."""
+        logger.info("Testing batch submission with mixed items")
+        self.client.force_login(self.user)
+        response = self._post(
+            [
+                self._attempt("offline-key-0001"),
+                self._attempt("offline-key-0002", score="not-a-number"),
+                self._attempt("offline-key-0003", quiz_id=999999),
+                self._attempt("bad key"),
+                self._attempt("offline-key-0004"),
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(
+            [r["status"] for r in results],
+            ["created", "error", "error", "error", "created"],
+        )
+        self.assertIn("Invalid data type", results[1]["message"])
+        self.assertEqual(results[2]["message"], "Quiz not found.")
+
+        attempt = QuizAttempt.objects.get(pk=results[0]["attempt_id"])
+        self.assertEqual(attempt.user, self.user)
+        self.assertEqual(attempt.idempotency_key, "offline-key-0001")
+        self.assertEqual(
+            attempt.attempt_details,
+            {str(self.question.id): {"user_answer_idx": 1, "correct_answer_idx": 0}},
+        )
+        self.assertEqual(QuizAttempt.objects.count(), 2)
+
+    def test_retried_batch_does_not_duplicate(self):
+        """Resending a batch (or a key twice) reports duplicates, inserts nothing."""
+        logger.info("Testing batch submission idempotency")
+        self.client.force_login(self.user)
+        first = self._post([self._attempt("offline-key-0001")]).json()["results"]
+        retry = self._post(
+            [self._attempt("offline-key-0001"), self._attempt("offline-key-0001")]
+        ).json()["results"]
+        self.assertEqual([r["status"] for r in retry], ["duplicate", "duplicate"])
+        self.assertEqual(retry[0]["attempt_id"], first[0]["attempt_id"])
+        self.assertEqual(QuizAttempt.objects.count(), 1)
+
+    def test_batch_uses_single_insert(self):
+        """All new attempts are written with one INSERT."""
+        executed = []
+
+        def record_query(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        # connection.queries is reset per request, so record via a wrapper.
+        with connection.execute_wrapper(record_query):
+            response = self._post(
+                [self._attempt(f"offline-key-{i:04d}") for i in range(10)]
+            )
+        self.assertEqual(response.status_code, 200)
+        inserts = [
+            sql
+            for sql in executed
+            if sql.startswith("INSERT") and "multi_choice_quiz_quizattempt" in sql
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(QuizAttempt.objects.count(), 10)
+
+    def test_rejects_malformed_batches(self):
+        """The body must be an object with an 'attempts' list of bounded size."""
+        self.assertEqual(self._post_raw("[]").status_code, 400)
+        self.assertEqual(self._post_raw("{not json").status_code, 400)
+        too_many = [self._attempt(f"offline-key-{i:04d}") for i in range(101)]
+        self.assertEqual(self._post(too_many).status_code, 400)
+
+    def _post_raw(self, body):
+        return self.client.post(self.url, data=body, content_type="application/json")
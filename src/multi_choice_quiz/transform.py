@@ -13,7 +13,8 @@ import json
 from django.db import transaction
 from django.db.models import QuerySet
 
-from .models import Quiz, Question, Option, Topic
+from .models import Quiz, Question, Option, ReviewCard, Topic
+from .search import defer_indexing
 
 
 def quiz_bank_to_models(
@@ -36,8 +37,8 @@ def quiz_bank_to_models(
     if topic_name:
         topic, _ = Topic.objects.get_or_create(name=topic_name)
 
-    # Create the quiz
-    with transaction.atomic():
+    # Create the quiz; the search index is updated once, not per saved row
+    with transaction.atomic(), defer_indexing():
         quiz = Quiz.objects.create(title=quiz_title)
 
         if topic:
@@ -74,6 +75,8 @@ def quiz_bank_to_models(
                     is_correct=(j == correct_index),  # Compare 1-based positions
                 )
 
+    # The question signals updated the stored counter, not this instance.
+    quiz.refresh_from_db(fields=["active_question_count"])
     return quiz
 
 
@@ -94,6 +97,113 @@ def models_to_frontend(
     return result
 
 
+def _quiz_question_rows(quiz_id: int, include_inactive: bool) -> QuerySet:
+    """Return the single LEFT JOIN query of questions and options of a quiz."""
+    questions = Question.objects.filter(quiz_id=quiz_id)
+    if not include_inactive:
+        questions = questions.filter(is_active=True)
+
+    return questions.order_by("position", "id", "options__position").values_list(
+        "id",
+        "text",
+        "tag",
+        "options__text",
+        "options__position",
+        "options__is_correct",
+    )
+
+
+def _group_question_rows(rows) -> List[Dict[str, Any]]:
+    """Group the rows of `_quiz_question_rows` into frontend question dicts."""
+    result = []
+    current = None
+    for q_id, q_text, q_tag, opt_text, opt_position, opt_is_correct in rows:
+        if current is None or current["id"] != q_id:
+            current = {
+                "id": q_id,
+                "text": q_text,
+                "options": [],
+                "answerIndex": None,
+                "tag": q_tag,
+            }
+            result.append(current)
+        if opt_position is None:
+            continue  # Question without options (LEFT JOIN row)
+        current["options"].append(opt_text)
+        # Rows are ordered by position, so the first correct option wins,
+        # matching Question.correct_option() when several are marked correct.
+        if opt_is_correct and current["answerIndex"] is None:
+            current["answerIndex"] = opt_position - 1  # Convert to 0-based for JS
+
+    return result
+
+
+def quiz_to_frontend(
+    quiz: Union[Quiz, int], include_inactive: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Transform all questions of a quiz to frontend format with a single query.
+
+    Produces the same output as calling `Question.to_dict()` for each question,
+    but reads questions and their options through one LEFT JOIN `values()` query
+    instead of 2-3 queries per question.
+
+    Args:
+        quiz: Quiz instance or quiz ID
+        include_inactive: Include questions with is_active=False (default: False)
+
+    Returns:
+        List of dictionaries in the format expected by the Alpine.js component
+    """
+    quiz_id = quiz.pk if isinstance(quiz, Quiz) else quiz
+    return _group_question_rows(_quiz_question_rows(quiz_id, include_inactive))
+
+
+async def aquiz_to_frontend(
+    quiz: Union[Quiz, int], include_inactive: bool = False
+) -> List[Dict[str, Any]]:
+    """Async version of `quiz_to_frontend` for async views."""
+    quiz_id = quiz.pk if isinstance(quiz, Quiz) else quiz
+    rows = [row async for row in _quiz_question_rows(quiz_id, include_inactive)]
+    return _group_question_rows(rows)
+
+
+def review_queue_to_frontend(user_id: int, due_by, limit: int) -> List[Dict[str, Any]]:
+    """
+    Transform the user's review cards due by `due_by` to frontend format.
+
+    Returns at most `limit` questions, the most overdue first, in the same
+    format as `quiz_to_frontend`. One query: the due cards are picked with a
+    range scan of the (user, next_due) index in a LIMIT subquery, and their
+    questions and options are read through the same LEFT JOIN.
+    """
+    due_question_ids = (
+        ReviewCard.objects.filter(
+            user_id=user_id,
+            next_due__lte=due_by,
+            question__is_active=True,
+            question__quiz__is_active=True,
+        )
+        .order_by("next_due", "id")
+        .values("question_id")[:limit]
+    )
+    rows = (
+        Question.objects.filter(
+            id__in=due_question_ids, review_cards__user_id=user_id
+        )
+        .order_by("review_cards__next_due", "id", "options__position")
+        .values_list(
+            "id",
+            "text",
+            "tag",
+            "options__text",
+            "options__position",
+            "options__is_correct",
+        )
+    )
+    return _group_question_rows(rows)
+
+
 def frontend_to_models(
     frontend_data: List[Dict[str, Any]],
     quiz_title: str,
@@ -8,7 +8,18 @@ app_name = "multi_choice_quiz"
 urlpatterns = [
     path("", views.home, name="home"),
     path("<int:quiz_id>/", views.quiz_detail, name="quiz_detail"),
+    path("<int:quiz_id>/data.json", views.quiz_data, name="quiz_data"),
+    path(
+        "<int:quiz_id>/questions/",
+        views.quiz_questions_window,
+        name="quiz_questions_window",
+    ),
     path("submit_attempt/", views.submit_quiz_attempt, name="submit_quiz_attempt"),
+    path(
+        "submit_attempts/",
+        views.submit_quiz_attempts_batch,
+        name="submit_quiz_attempts_batch",
+    ),
     # <<< START NEW URL PATTERN (Step 7.1) >>>
     path(
         "attempt/<int:attempt_id>/review/",
@@ -16,4 +27,12 @@ urlpatterns = [
         name="attempt_mistake_review",
     ),
     # <<< END NEW URL PATTERN >>>
+    path("mistakes/", views.my_mistakes, name="my_mistakes"),
+    path("review/", views.review_session, name="review_session"),
+    path("review/due.json", views.review_due, name="review_due"),
+    path(
+        "review/submit/",
+        views.submit_review_session,
+        name="submit_review_session",
+    ),
 ]
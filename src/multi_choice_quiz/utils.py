@@ -11,6 +11,9 @@ from django.db import transaction, IntegrityError
 # --- SystemCategory IMPORT ---
 from pages.models import SystemCategory
 from .models import Quiz, Question, Option, Topic
+from .caching import touch_quiz
+from .counters import refresh_question_counts
+from .search import defer_indexing, index_quizzes
 
 # --- END SystemCategory IMPORT ---
 
@@ -46,7 +49,8 @@ def quiz_bank_to_models(
 
     quiz_instance = None  # Initialize quiz_instance
 
-    with transaction.atomic():
+    # The Quiz save signal and the explicit call below share one reindex.
+    with transaction.atomic(), defer_indexing():
         quiz_instance = Quiz.objects.create(title=quiz_title)
         if topic_instance:
             quiz_instance.topics.add(topic_instance)
@@ -145,6 +149,13 @@ def quiz_bank_to_models(
                 f"No options to create for quiz '{quiz_title}' (either no questions or questions had no options)."
             )
 
+        # bulk_create bypasses the save signals, so bump the payload cache version,
+        # refresh the question counter and index the questions here.
+        touch_quiz(quiz_instance.pk)
+        refresh_question_counts([quiz_instance.pk])
+        index_quizzes([quiz_instance.pk])
+        quiz_instance.refresh_from_db(fields=["active_question_count"])
+
     return quiz_instance
 
 
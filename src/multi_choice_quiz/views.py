@@ -1,31 +1,73 @@
 # src/multi_choice_quiz/views.py (Modified for Step 6.3)
 
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render, get_object_or_404, aget_object_or_404
 from django.contrib import messages  # <<< THIS LINE MUST BE PRESENT
 from django.shortcuts import redirect
 
 from django.http import (
+    HttpResponse,
     JsonResponse,
     HttpResponseBadRequest,
     Http404,
     HttpResponseForbidden,
 )  # Added Http404, HttpResponseForbidden
 
-from django.views.decorators.http import require_POST
-from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST, require_GET
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 from django.core.exceptions import ObjectDoesNotExist
 from django.contrib.auth.decorators import login_required  # Added login_required
+from django.conf import settings
+from django.core.paginator import Paginator
 from django.utils.safestring import mark_safe
+from django.utils import timezone
+from asgiref.sync import sync_to_async
 
 import json
 import logging
-from datetime import datetime
-
-from .models import Quiz, Question, QuizAttempt  # Added Question
-from .transform import models_to_frontend
+import re
+import uuid
+
+from .models import Quiz, QuizAttempt, ReviewCard, UserMistake
+from .caching import (
+    get_quiz_payload_json,
+    get_quiz_payload_etag,
+    get_quiz_payload_window,
+    get_quiz_answer_key,
+    aget_quiz_payload_json,
+    aget_quiz_payload_etag,
+    build_question_answer_key,
+    get_attempt_answer_sheet,
+    get_quiz_question_order,
+)
+from .ingestion import attempt_spool_enabled, spool_attempt
+from .scoring import (
+    AttemptValidationError,
+    grade_attempt_details,
+    pack_answers,
+    parse_attempt_payload,
+    parse_review_payload,
+    question_order_version,
+    score_responses,
+)
+from .recording import record_review_session, save_attempts
+from .review import (
+    build_mistake_notebook,
+    build_mistake_review,
+    mistakes_from_answer_sheet,
+)
+from .transform import review_queue_to_frontend
 
 logger = logging.getLogger(__name__)
 
+MISTAKES_PER_PAGE = 20
+REVIEW_SESSION_SIZE = 50
+# Set (scoped to the quiz page's path) once a quiz page has been served with
+# its payload inlined; repeat visits load data.json instead and revalidate it.
+QUIZ_DATA_SEEN_COOKIE = "quiz_data_seen"
+QUIZ_DATA_SEEN_MAX_AGE = 30 * 24 * 60 * 60
+
 
 def home(request):
     try:
@@ -39,36 +81,35 @@ def home(request):
             .first()
         )
         quiz_id_to_pass = None
-        quiz_data = []
+        quiz_data_json = "[]"
         quiz_title_for_log = "Demo Quiz"
         # log view and name of file:
         logger.info(f"View: home, File: {__file__}")
 
         if quiz:
-            questions = quiz.questions.filter(is_active=True).order_by("position")
-            quiz_data = models_to_frontend(questions)
+            quiz_data_json = get_quiz_payload_json(quiz)
             quiz_id_to_pass = quiz.id
             quiz_title_for_log = quiz.title
             logger.info(
-                f"Loaded quiz '{quiz_title_for_log}' (ID: {quiz_id_to_pass}) with {len(quiz_data)} questions for generic home view."
+                f"Loaded quiz '{quiz_title_for_log}' (ID: {quiz_id_to_pass}) for generic home view."
             )
         else:
             logger.warning(
                 "No active quizzes with questions found in database, using demo questions for generic home view."
             )
-            quiz_data = get_demo_questions()
+            quiz_data_json = json.dumps(get_demo_questions())
 
     except Exception as e:
         logger.error(
             f"Error loading quiz from database for generic home view: {str(e)}",
             exc_info=True,
         )
-        quiz_data = get_demo_questions()
+        quiz_data_json = json.dumps(get_demo_questions())
         quiz_id_to_pass = None
         quiz_title_for_log = "Demo Quiz (Error Fallback)"
 
     context = {
-        "quiz_data": mark_safe(json.dumps(quiz_data)),
+        "quiz_data": mark_safe(quiz_data_json),
         "quiz_id": quiz_id_to_pass,
         "quiz_title": quiz_title_for_log,
     }
@@ -78,20 +119,49 @@ def home(request):
 def quiz_detail(request, quiz_id):
     try:
         quiz = get_object_or_404(Quiz, id=quiz_id, is_active=True)
-        questions = quiz.questions.filter(is_active=True).order_by("position")
-        if not questions.exists():
+        page_size = settings.QUIZ_PAGE_SIZE
+        first_window = get_quiz_payload_window(quiz, 0, page_size)
+        total_questions = first_window["total"]
+        if total_questions == 0:
             logger.warning(
                 f"Quiz ID {quiz_id} ('{quiz.title}') exists but has no active questions."
             )
 
-        quiz_data = models_to_frontend(questions)
+        paged = total_questions > settings.QUIZ_PAGED_DELIVERY_THRESHOLD
+        inline_payload = True
+        if paged:
+            # Large quiz: inline only the first window, app.js fetches the rest.
+            quiz_data_json = json.dumps(first_window["questions"])
+            logger.info(
+                f"Quiz ID {quiz_id} has {total_questions} questions; using paged delivery ({page_size} per window)."
+            )
+        elif QUIZ_DATA_SEEN_COOKIE in request.COOKIES:
+            # Repeat visit: app.js loads data.json, which the browser revalidates
+            # with its ETag (usually a 304) instead of the page carrying it again.
+            quiz_data_json = "[]"
+            inline_payload = False
+        else:
+            quiz_data_json = get_quiz_payload_json(quiz)
+
         context = {
             "quiz": quiz,
-            "quiz_data": mark_safe(json.dumps(quiz_data)),
+            "quiz_data": mark_safe(quiz_data_json),
             "quiz_id": quiz.id,
             "quiz_title": quiz.title,
+            "paged_delivery": paged,
+            "total_questions": total_questions,
+            "page_size": page_size,
         }
-        return render(request, "multi_choice_quiz/index.html", context)
+        response = render(request, "multi_choice_quiz/index.html", context)
+        if inline_payload and not paged:
+            response.set_cookie(
+                QUIZ_DATA_SEEN_COOKIE,
+                "1",
+                max_age=QUIZ_DATA_SEEN_MAX_AGE,
+                path=request.path,
+                samesite="Lax",
+            )
+        return response
 
     except ObjectDoesNotExist:
         logger.warning(f"Quiz with ID {quiz_id} not found or not active.")
@@ -107,11 +177,220 @@ def quiz_detail(request, quiz_id):
         return render(request, "multi_choice_quiz/error.html", context, status=500)
 
 
+@require_GET
+async def quiz_data(request, quiz_id):
+    """
+    JSON endpoint returning the frontend payload of a quiz.
+
+    Sends a strong ETag (hash of the payload) and Last-Modified so browsers and
+    the PWA can revalidate with If-None-Match / If-Modified-Since and get a 304
+    without the payload being loaded or transferred again.
+
+    Async: under ASGI (uvicorn workers) waiting on the database or cache does
+    not hold a worker thread.
+    """
+    quiz = await aget_object_or_404(Quiz, id=quiz_id, is_active=True)
+    etag = quote_etag(await aget_quiz_payload_etag(quiz))
+    last_modified = int(quiz.updated_at.timestamp())
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = HttpResponse(
+            await aget_quiz_payload_json(quiz), content_type="application/json"
+        )
+    else:
+        logger.debug(
+            f"Quiz data for quiz ID {quiz_id} not modified (status {response.status_code})."
+        )
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # Clients may store the payload but must revalidate before each use.
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+MAX_QUIZ_WINDOW_SIZE = 100
+
+
+@require_GET
+def quiz_questions_window(request, quiz_id):
+    """
+    JSON endpoint returning a window of questions for paged quiz delivery.
+
+    Query parameters: 'offset' (0-based, default 0) and 'limit' (default
+    QUIZ_PAGE_SIZE). Both are snapped to QUIZ_PAGE_SIZE boundaries (offset
+    down, limit up, capped at MAX_QUIZ_WINDOW_SIZE) so only a bounded set of
+    windows is cached per quiz version; offsets past the last question are
+    rejected. The response holds the questions plus 'offset', 'limit' and
+    'total'.
+    """
+    try:
+        offset = int(request.GET.get("offset", 0))
+        limit = int(request.GET.get("limit", settings.QUIZ_PAGE_SIZE))
+    except ValueError:
+        return HttpResponseBadRequest("offset and limit must be integers.")
+    if offset < 0 or limit < 1:
+        return HttpResponseBadRequest("offset must be >= 0 and limit >= 1.")
+    requested_offset = offset
+    page_size = settings.QUIZ_PAGE_SIZE
+    max_pages = max(1, MAX_QUIZ_WINDOW_SIZE // page_size)
+    offset -= offset % page_size
+    limit = min(-(-limit // page_size), max_pages) * page_size
+
+    quiz = get_object_or_404(Quiz, id=quiz_id, is_active=True)
+    window = get_quiz_payload_window(quiz, offset, limit)
+    if requested_offset and requested_offset >= window["total"]:
+        return HttpResponseBadRequest("offset is past the last question.")
+    # Quiz content hash plus the window bounds identifies this response.
+    etag = quote_etag(f"{get_quiz_payload_etag(quiz)}-{offset}-{limit}")
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse(window)
+    response["ETag"] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+MAX_BATCH_ATTEMPTS = 100
+IDEMPOTENCY_KEY_RE = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+def _graded_attempt(quiz, attempt_user, attempt, idempotency_key):
+    """
+    Return (unsaved QuizAttempt, graded responses) for validated attempt fields.
+
+    Answers are graded against the cached answer key, and score, total and
+    percentage are computed from that grading. Submissions without answers
+    (older clients) cannot be graded and keep the submitted figures.
+    """
+    mistakes_data, responses = grade_attempt_details(
+        attempt["attempt_details"], get_quiz_answer_key(quiz)
+    )
+    question_order = get_quiz_question_order(quiz)
+    score = attempt["score"]
+    total_questions = attempt["total_questions"]
+    percentage = attempt["percentage"]
+    if attempt["attempt_details"]:
+        total_questions = len(question_order)
+        score, percentage = score_responses(responses, total_questions)
+        if score != attempt["score"]:
+            logger.warning(
+                f"Submitted score {attempt['score']} for quiz ID {quiz.id} does not "
+                f"match the graded score {score}; storing the graded score."
+            )
+    quiz_attempt = QuizAttempt(
+        quiz=quiz,
+        user=attempt_user,
+        score=score,
+        total_questions=total_questions,
+        percentage=percentage,
+        end_time=attempt["end_time"],
+        attempt_details=mistakes_data if mistakes_data else None,
+        packed_answers=pack_answers(question_order, responses),
+        answers_version=question_order_version(question_order),
+        idempotency_key=idempotency_key,
+    )
+    return quiz_attempt, responses
+
+
+def _record_attempts(parsed, attempt_user, spool=False):
+    """
+    Grade and store validated attempts; return one result dict per attempt.
+
+    `parsed` is a list of (idempotency_key, `parse_attempt_payload` output).
+    Keys already stored are reported as "duplicate" (with the attempt ID only
+    for its owner), unknown quizzes as "error". New attempts are inserted with
+    one `save_attempts` call ("created", with the attempt ID) or, with
+    `spool=True`, appended to the attempt spool ("queued"). An attempt that is
+    not stored after the insert is reported as "failed" and may be retried.
+    """
+    quizzes = Quiz.objects.in_bulk({attempt["quiz_id"] for _, attempt in parsed})
+    existing = {
+        key: (attempt_id, user_id)
+        for key, attempt_id, user_id in QuizAttempt.objects.filter(
+            idempotency_key__in=[key for key, _ in parsed]
+        ).values_list("idempotency_key", "id", "user_id")
+    }
+
+    results = []
+    new_attempts = []
+    for key, attempt in parsed:
+        if key in existing:
+            attempt_id, user_id = existing[key]
+            same_owner = attempt_user is not None and user_id == attempt_user.id
+            results.append(
+                {
+                    "idempotency_key": key,
+                    "status": "duplicate",
+                    "attempt_id": attempt_id if same_owner else None,
+                }
+            )
+            continue
+        quiz = quizzes.get(attempt["quiz_id"])
+        if quiz is None:
+            results.append(
+                {
+                    "idempotency_key": key,
+                    "status": "error",
+                    "message": "Quiz not found.",
+                }
+            )
+            continue
+        quiz_attempt, responses = _graded_attempt(quiz, attempt_user, attempt, key)
+        if spool:
+            # Write-behind: durable local spool now, bulk insert by the flusher.
+            spool_attempt(
+                quiz_id=quiz_attempt.quiz_id,
+                user_id=quiz_attempt.user_id,
+                score=quiz_attempt.score,
+                total_questions=quiz_attempt.total_questions,
+                percentage=quiz_attempt.percentage,
+                end_time=quiz_attempt.end_time,
+                attempt_details=quiz_attempt.attempt_details,
+                responses=responses,
+                packed_answers=quiz_attempt.packed_answers,
+                answers_version=quiz_attempt.answers_version,
+                idempotency_key=key,
+            )
+            results.append({"idempotency_key": key, "status": "queued"})
+            continue
+        new_attempts.append((quiz_attempt, responses))
+        results.append({"idempotency_key": key, "status": "created"})
+
+    if new_attempts:
+        # One bulk insert; keys stored by a concurrent retry are skipped.
+        attempt_ids = save_attempts(new_attempts)
+        for result in results:
+            if result["status"] != "created":
+                continue
+            attempt_id = attempt_ids.get(result["idempotency_key"])
+            if attempt_id is None:
+                result["status"] = "failed"
+                result["message"] = "The attempt could not be stored."
+            else:
+                result["attempt_id"] = attempt_id
+    return results
+
+
 @csrf_exempt
 @require_POST
-def submit_quiz_attempt(request):
+async def submit_quiz_attempt(request):
     """
     API endpoint to receive and save quiz attempt results, including detailed mistakes.
+
+    Takes the fields of one batch item (see `submit_quiz_attempts_batch`); the
+    'idempotency_key' is optional for older clients. A key that is already
+    stored (e.g. an attempt queued offline and replayed) is not inserted again:
+    the response then has "duplicate": true. With the attempt spool enabled the
+    attempt is queued and the response has "queued": true and no attempt_id.
+
+    Async, using the async cache API, so slow round trips do not pin a worker
+    thread when served by ASGI (uvicorn workers). Grading and saving are shared
+    with the batch endpoint and run in one sync_to_async call.
     """
     try:
         try:
@@ -121,117 +400,130 @@ def submit_quiz_attempt(request):
             logger.warning("Received invalid JSON in submit_quiz_attempt.")
             return HttpResponseBadRequest("Invalid JSON data.")
 
-        required_fields = [
-            "quiz_id",
-            "score",
-            "total_questions",
-            "percentage",
-            "end_time",
-        ]
-        missing_fields = [field for field in required_fields if field not in data]
-        if missing_fields:
-            logger.warning(
-                f"Missing fields in submit_quiz_attempt data: {missing_fields}"
+        try:
+            attempt_data = parse_attempt_payload(data)
+        except AttemptValidationError as e:
+            logger.warning(f"Invalid attempt received: {e}. Data: {data}")
+            return HttpResponseBadRequest(str(e))
+        key = data.get("idempotency_key")
+        if key is None:
+            key = uuid.uuid4().hex  # Older clients do not send a key
+        elif not isinstance(key, str) or not IDEMPOTENCY_KEY_RE.match(key):
+            return HttpResponseBadRequest("Invalid idempotency_key.")
+
+        request_user = await request.auser()
+        attempt_user = request_user if request_user.is_authenticated else None
+        user_log_str = (
+            f"User ID: {attempt_user.id}" if attempt_user else "Anonymous User"
+        )
+        if not attempt_data["attempt_details"]:
+            logger.info(
+                "No attempt_details received in payload or it was empty/invalid."
             )
-            return HttpResponseBadRequest(
-                f"Missing required fields: {', '.join(missing_fields)}"
+
+        # The attempt and its QuestionResponse rows are saved in one transaction,
+        # which the async ORM cannot span, hence sync_to_async.
+        (result,) = await sync_to_async(_record_attempts)(
+            [(key, attempt_data)], attempt_user, spool=attempt_spool_enabled()
+        )
+        status = result["status"]
+        logger.info(
+            f"Attempt {key} for Quiz ID: {attempt_data['quiz_id']} by {user_log_str}: {status}."
+        )
+        if status == "error":
+            return HttpResponseBadRequest(result["message"])
+        if status == "failed":
+            return JsonResponse(
+                {"status": "error", "message": result["message"]}, status=500
             )
+        response_data = {"status": "success", "attempt_id": result.get("attempt_id")}
+        if status == "queued":
+            response_data["queued"] = True
+        elif status == "duplicate":
+            response_data["duplicate"] = True
+        return JsonResponse(response_data)
 
-        try:
-            quiz_id = int(data["quiz_id"])
-            score = int(data["score"])
-            total_questions = int(data["total_questions"])
-            percentage = float(data["percentage"])
-            end_time_str = str(data["end_time"])
-            end_time_dt = datetime.fromisoformat(end_time_str.replace("Z", "+00:00"))
-            received_attempt_details = data.get("attempt_details", {})
-            if not isinstance(received_attempt_details, dict):
-                logger.warning(
-                    f"Received non-dict attempt_details: {type(received_attempt_details)}. Ignoring."
-                )
-                received_attempt_details = {}  # Treat as empty if invalid type
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Invalid data type or format received: {e}. Data: {data}")
-            return HttpResponseBadRequest(f"Invalid data type or format for field: {e}")
+    except Exception as e:
+        logger.error(f"Unexpected error in submit_quiz_attempt: {e}", exc_info=True)
+        return JsonResponse(
+            {"status": "error", "message": "An internal server error occurred."},
+            status=500,
+        )
 
+
+@csrf_exempt
+@require_POST
+def submit_quiz_attempts_batch(request):
+    """
+    API endpoint for offline clients to upload several queued attempts at once.
+
+    Expects {"attempts": [{...submit_quiz_attempt fields..., "idempotency_key": "..."}]}.
+    Every item is validated and graded like a single submission; valid new ones
+    are inserted with one bulk_create. Returns {"status": "success", "results": [...]}
+    with one entry per item, in order: status "created" or "duplicate" (key
+    already stored, e.g. a retried sync) with its attempt_id, "error" with a
+    message, or "failed" if it could not be stored. Items with an error should
+    not be retried; failed ones may be.
+    """
+    try:
         try:
-            quiz = Quiz.objects.get(id=quiz_id)
-            correct_answers = {
-                q.id: q.correct_option_index()
-                for q in Question.objects.filter(quiz=quiz)
-            }
-        except ObjectDoesNotExist:
-            logger.warning(f"Quiz with ID {quiz_id} not found during submission.")
-            return HttpResponseBadRequest("Quiz not found.")
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            logger.warning("Received invalid JSON in submit_quiz_attempts_batch.")
+            return HttpResponseBadRequest("Invalid JSON data.")
+
+        items = data.get("attempts") if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            return HttpResponseBadRequest("Expected an 'attempts' list.")
+        if len(items) > MAX_BATCH_ATTEMPTS:
+            return HttpResponseBadRequest(
+                f"At most {MAX_BATCH_ATTEMPTS} attempts per batch."
+            )
 
         attempt_user = request.user if request.user.is_authenticated else None
+        results = [None] * len(items)
+        parsed = {}  # index -> (idempotency_key, validated attempt fields)
+        seen_keys = set()
+        for index, item in enumerate(items):
+            key = item.get("idempotency_key") if isinstance(item, dict) else None
+            if not isinstance(key, str) or not IDEMPOTENCY_KEY_RE.match(key):
+                results[index] = {
+                    "idempotency_key": key if isinstance(key, str) else None,
+                    "status": "error",
+                    "message": "Missing or invalid idempotency_key.",
+                }
+                continue
+            if key in seen_keys:
+                results[index] = {"idempotency_key": key, "status": "duplicate"}
+                continue
+            seen_keys.add(key)
+            try:
+                parsed[index] = (key, parse_attempt_payload(item))
+            except AttemptValidationError as e:
+                results[index] = {
+                    "idempotency_key": key,
+                    "status": "error",
+                    "message": str(e),
+                }
+
+        recorded = _record_attempts(list(parsed.values()), attempt_user)
+        for index, result in zip(parsed, recorded):
+            results[index] = result
+
         user_log_str = (
             f"User ID: {attempt_user.id}" if attempt_user else "Anonymous User"
         )
-
-        # --- START STEP 6.3: Process Mistakes ---
-        mistakes_data = {}
-        if received_attempt_details:  # Only process if we received details
-            logger.debug(
-                f"Processing received attempt_details for {len(received_attempt_details)} questions."
-            )
-            for q_id_str, user_answer_idx in received_attempt_details.items():
-                try:
-                    question_id = int(q_id_str)
-                    correct_answer_idx = correct_answers.get(question_id)
-
-                    # Check if the answer was incorrect
-                    # Also handle cases where correct answer might be None (bad data) or user answer is None
-                    if (
-                        correct_answer_idx is not None
-                        and user_answer_idx != correct_answer_idx
-                    ):
-                        mistakes_data[str(question_id)] = (
-                            {  # Use string ID as key in JSON
-                                "user_answer_idx": user_answer_idx,
-                                "correct_answer_idx": correct_answer_idx,
-                            }
-                        )
-                        logger.debug(
-                            f"Mistake recorded for QID {question_id}: User={user_answer_idx}, Correct={correct_answer_idx}"
-                        )
-                    elif correct_answer_idx is None:
-                        logger.warning(
-                            f"Could not find correct answer for QID {question_id} while processing mistakes."
-                        )
-
-                except (ValueError, TypeError) as e:
-                    logger.warning(
-                        f"Error processing detail for QID string '{q_id_str}': {e}. Skipping."
-                    )
-                    continue  # Skip this detail entry
-        else:
-            logger.info(
-                "No attempt_details received in payload or it was empty/invalid."
-            )
-        # --- END STEP 6.3: Process Mistakes ---
-
-        # --- START STEP 6.3: Save Attempt with Processed Mistakes ---
-        attempt = QuizAttempt.objects.create(
-            quiz=quiz,
-            user=attempt_user,
-            score=score,
-            total_questions=total_questions,
-            percentage=percentage,
-            end_time=end_time_dt,
-            attempt_details=(
-                mistakes_data if mistakes_data else None
-            ),  # Save processed mistakes, or None if empty
-        )
-        # --- END STEP 6.3: Save Attempt ---
-
+        created = sum(1 for result in recorded if result["status"] == "created")
         logger.info(
-            f"Saved QuizAttempt ID: {attempt.id} for Quiz ID: {quiz_id} by {user_log_str}. Score: {score}/{total_questions}. Mistakes recorded: {len(mistakes_data)}"
+            f"Batch submission by {user_log_str}: {len(items)} items, "
+            f"{created} attempts created."
         )
-        return JsonResponse({"status": "success", "attempt_id": attempt.id})
+        return JsonResponse({"status": "success", "results": results})
 
     except Exception as e:
-        logger.error(f"Unexpected error in submit_quiz_attempt: {e}", exc_info=True)
+        logger.error(
+            f"Unexpected error in submit_quiz_attempts_batch: {e}", exc_info=True
+        )
         return JsonResponse(
             {"status": "error", "message": "An internal server error occurred."},
             status=500,
@@ -246,18 +538,28 @@ def attempt_mistake_review(request, attempt_id):
     """
     logger.info(f"User {request.user.id} requesting review for attempt ID {attempt_id}")
     try:
-        attempt = get_object_or_404(QuizAttempt, id=attempt_id)
+        attempt = get_object_or_404(
+            QuizAttempt.objects.select_related("quiz"), id=attempt_id
+        )
 
         # --- Security Check: Ensure the user owns this attempt ---
-        if attempt.user != request.user:
+        if attempt.user_id != request.user.id:
             logger.warning(
                 f"User {request.user.id} attempted to access attempt {attempt_id} owned by user {attempt.user_id}."
             )
             # Option 1: Return 404 (as if it doesn't exist for them)
             raise Http404("Quiz attempt not found.")
 
+        # Prefer the packed answer sheet; attempts stored without one (or scored
+        # against a different question order) fall back to attempt_details.
+        answer_sheet = get_attempt_answer_sheet(attempt)
+        if answer_sheet is not None:
+            mistake_details = mistakes_from_answer_sheet(answer_sheet)
+        else:
+            mistake_details = attempt.attempt_details
+
         # --- Check if there are mistakes to review ---
-        if not attempt.attempt_details or not isinstance(attempt.attempt_details, dict):
+        if not mistake_details or not isinstance(mistake_details, dict):
             logger.info(
                 f"Attempt {attempt_id} has no mistake details to review. Redirecting user {request.user.id} to profile."
             )
@@ -266,65 +568,8 @@ def attempt_mistake_review(request, attempt_id):
             )  # Optional message
             return redirect("pages:profile")  # Redirect to profile page
 
-        mistake_details = attempt.attempt_details
-        question_ids = [int(qid) for qid in mistake_details.keys()]
-
-        # Fetch all relevant questions and their options in bulk to optimize DB access
-        questions = (
-            Question.objects.filter(id__in=question_ids)
-            .prefetch_related("options")
-            .order_by("position")
-        )
-
-        # Prepare context for the template
-        mistakes_context = []
-        for question in questions:
-            q_id_str = str(question.id)
-            if q_id_str in mistake_details:
-                detail = mistake_details[q_id_str]
-                user_idx = detail.get("user_answer_idx")
-                correct_idx = detail.get("correct_answer_idx")
-
-                options_list = list(question.options.order_by("position"))
-                user_answer_text = "N/A"
-                correct_answer_text = "N/A"
-
-                # Get user answer text (0-based index from JSON -> 1-based position)
-                if user_idx is not None and 0 <= user_idx < len(options_list):
-                    user_answer_text = options_list[user_idx].text
-                elif user_idx is not None:
-                    logger.warning(
-                        f"User answer index {user_idx} out of bounds for QID {question.id} options."
-                    )
-
-                # Get correct answer text (0-based index from JSON -> 1-based position)
-                if correct_idx is not None and 0 <= correct_idx < len(options_list):
-                    correct_answer_text = options_list[correct_idx].text
-                elif correct_idx is not None:
-                    logger.warning(
-                        f"Correct answer index {correct_idx} out of bounds for QID {question.id} options."
-                    )
-                elif (
-                    question.correct_option()
-                ):  # Fallback if index missing but model has it
-                    correct_answer_text = question.correct_option().text
-                    logger.warning(
-                        f"Used fallback correct option text for QID {question.id}."
-                    )
-
-                mistakes_context.append(
-                    {
-                        "question_id": question.id,
-                        "question_text": question.text,
-                        "user_answer": user_answer_text,
-                        "correct_answer": correct_answer_text,
-                        "question_tag": question.tag,  # Include tag if needed
-                    }
-                )
-            else:
-                logger.warning(
-                    f"Question ID {question.id} was fetched but not found in mistake_details keys for attempt {attempt_id}."
-                )
+        # Two queries (questions + ordered options) regardless of mistake count
+        mistakes_context = build_mistake_review(mistake_details)
 
         context = {
             "attempt": attempt,
@@ -350,6 +595,96 @@ def attempt_mistake_review(request, attempt_id):
         return redirect("pages:profile")
 
 
+@login_required
+def my_mistakes(request):
+    """
+    Lists every question the logged-in user has missed, most recent miss first.
+
+    Reads the user's UserMistake index (maintained on submit), so a page costs
+    the same few queries however many attempts the user has made.
+    """
+    paginator = Paginator(UserMistake.objects.filter(user=request.user), MISTAKES_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get("page"))
+    context = {
+        "page_obj": page_obj,
+        "mistakes": build_mistake_notebook(page_obj.object_list),
+    }
+    return render(request, "multi_choice_quiz/my_mistakes.html", context)
+
+
+@login_required
+@ensure_csrf_cookie
+def review_session(request):
+    """
+    Runs a spaced-repetition review of the user's due cards in the quiz app.
+
+    The due questions are inlined like a regular quiz; app.js posts the answers
+    to `submit_review_session` (with the CSRF cookie set here) instead of
+    recording a quiz attempt.
+    """
+    questions = review_queue_to_frontend(
+        request.user.id, timezone.now(), REVIEW_SESSION_SIZE
+    )
+    if not questions:
+        messages.info(request, "Nothing is due for review right now.")
+        return redirect("multi_choice_quiz:my_mistakes")
+
+    context = {
+        "quiz_data": mark_safe(json.dumps(questions)),
+        "quiz_title": "Review Session",
+        "review_session": True,
+    }
+    return render(request, "multi_choice_quiz/index.html", context)
+
+
+@login_required
+@require_GET
+def review_due(request):
+    """JSON endpoint returning the user's due review questions (quizApp format)."""
+    questions = review_queue_to_frontend(
+        request.user.id, timezone.now(), REVIEW_SESSION_SIZE
+    )
+    return JsonResponse({"questions": questions})
+
+
+@require_POST
+def submit_review_session(request):
+    """
+    Grades a review session and reschedules the user's review cards.
+
+    Expects {"end_time": ISO timestamp, "attempt_details": {question_id: chosen
+    0-based index}} and the CSRF token (session-authenticated). Only questions
+    the user has a review card for are graded; other answers are ignored.
+    Grading uses the same path as `submit_quiz_attempt`.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse(
+            {"status": "error", "message": "Login required."}, status=403
+        )
+    try:
+        session = parse_review_payload(json.loads(request.body))
+    except json.JSONDecodeError:
+        return JsonResponse(
+            {"status": "error", "message": "Invalid JSON format."}, status=400
+        )
+    except AttemptValidationError as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+    attempt_details = session["attempt_details"]
+    answered_ids = [int(q_id) for q_id in attempt_details if str(q_id).isdigit()]
+    carded_ids = ReviewCard.objects.filter(
+        user=request.user, question_id__in=answered_ids
+    ).values_list("question_id", flat=True)
+    answer_key = build_question_answer_key(list(carded_ids))
+    _, responses = grade_attempt_details(attempt_details, answer_key)
+    record_review_session(request.user.id, responses, session["end_time"])
+    logger.info(
+        f"User {request.user.id} reviewed {len(responses)} cards "
+        f"({sum(1 for *_, is_correct in responses if is_correct)} correct)."
+    )
+    return JsonResponse({"status": "success", "reviewed": len(responses)})
+
+
 # --- get_demo_questions remains unchanged ---
 def get_demo_questions():
     return [
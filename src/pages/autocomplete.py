@@ -0,0 +1,141 @@
+# src/pages/autocomplete.py
+"""
+In-process prefix index for search-as-you-type on the quizzes page.
+
+Quiz titles, topic names and SystemCategory names are normalized and kept in
+one sorted list of keys, one key per word start ("python functions",
+"functions"), so a lookup is a bisect plus a short scan with no database
+access. The index is built lazily on first use and rebuilt when the catalog
+version (`multi_choice_quiz.caching.get_catalog_version`) changes. The
+version is re-read at most every AUTOCOMPLETE_VERSION_CHECK_INTERVAL seconds,
+so most keystrokes do not touch the shared cache either.
+"""
+
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import List, NamedTuple, Optional
+
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from multi_choice_quiz.caching import get_catalog_version
+from multi_choice_quiz.models import Topic
+
+from .catalog import catalog_queryset
+from .models import SystemCategory
+
+AUTOCOMPLETE_VERSION_CHECK_INTERVAL = 5.0  # seconds
+MAX_AUTOCOMPLETE_RESULTS = 20
+
+
+class Suggestion(NamedTuple):
+    kind: str  # "quiz", "category" or "topic"
+    label: str
+    url: str
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return " ".join(
+        "".join(ch for ch in decomposed if not unicodedata.combining(ch)).split()
+    )
+
+
+class PrefixIndex:
+    """Sorted word-start keys over a list of suggestions."""
+
+    def __init__(self, suggestions: List[Suggestion]):
+        self.suggestions = suggestions
+        entries = []
+        for position, suggestion in enumerate(suggestions):
+            words = normalize(suggestion.label).split(" ")
+            for start in range(len(words)):
+                entries.append((" ".join(words[start:]), start, position))
+        entries.sort()
+        self._keys = [key for key, _, _ in entries]
+        # Matches on the first word rank above matches further in.
+        self._positions = [(start > 0, position) for _, start, position in entries]
+
+    def __len__(self):
+        return len(self.suggestions)
+
+    def lookup(self, prefix: str, limit: int = 10) -> List[Suggestion]:
+        """Return up to `limit` suggestions with a word starting with `prefix`."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        found = {}
+        index = bisect_left(self._keys, prefix)
+        while index < len(self._keys) and self._keys[index].startswith(prefix):
+            later_word, position = self._positions[index]
+            found[position] = min(found.get(position, later_word), later_word)
+            index += 1
+        ranked = sorted(found, key=lambda position: (found[position], position))
+        return [self.suggestions[position] for position in ranked[:limit]]
+
+
+def build_prefix_index() -> PrefixIndex:
+    """Build the index from the catalog: three queries."""
+    quizzes_url = reverse("pages:quizzes")
+    suggestions = [
+        Suggestion(
+            "quiz", title, reverse("multi_choice_quiz:quiz_detail", args=[quiz_id])
+        )
+        for quiz_id, title in catalog_queryset()
+        .order_by("title", "id")
+        .values_list("id", "title")
+    ]
+    suggestions.extend(
+        Suggestion("category", name, f"{quizzes_url}?{urlencode({'category': slug})}")
+        for name, slug in SystemCategory.objects.order_by("name").values_list(
+            "name", "slug"
+        )
+    )
+    suggestions.extend(
+        Suggestion("topic", name, f"{quizzes_url}?{urlencode({'q': name})}")
+        for name in Topic.objects.order_by("name").values_list("name", flat=True)
+    )
+    return PrefixIndex(suggestions)
+
+
+_lock = threading.Lock()
+_index: Optional[PrefixIndex] = None
+_index_version = None
+_version_checked_at = 0.0
+
+
+def _version_check_due() -> bool:
+    elapsed = time.monotonic() - _version_checked_at
+    return elapsed >= AUTOCOMPLETE_VERSION_CHECK_INTERVAL
+
+
+def get_prefix_index() -> PrefixIndex:
+    """Return this process's index, rebuilding it if the catalog changed."""
+    global _index, _index_version, _version_checked_at
+    if _index is not None and not _version_check_due():
+        return _index
+    with _lock:
+        if _index is not None and not _version_check_due():
+            return _index
+        version = get_catalog_version()
+        if _index is None or version != _index_version:
+            _index = build_prefix_index()
+            _index_version = version
+        _version_checked_at = time.monotonic()
+        return _index
+
+
+def reset_prefix_index() -> None:
+    """Drop this process's index (tests)."""
+    global _index, _index_version, _version_checked_at
+    with _lock:
+        _index, _index_version, _version_checked_at = None, None, 0.0
+
+
+def autocomplete(prefix: str, limit: int = 10) -> List[Suggestion]:
+    """Return the top `limit` suggestions for a typed prefix."""
+    limit = max(1, min(limit, MAX_AUTOCOMPLETE_RESULTS))
+    return get_prefix_index().lookup(prefix, limit)
@@ -0,0 +1,102 @@
+# src/pages/caching.py
+"""
+Response caching for the anonymous catalog pages (home, quizzes, about).
+
+Anonymous visitors all see the same HTML, so `cache_anonymous_page` stores the
+rendered response in the shared cache, keyed on the catalog version
+(`multi_choice_quiz.caching.get_catalog_version`) and the request path. Any
+catalog change bumps the version, so stale pages are simply never read again.
+
+Logged-in users get per-user pages; their templates cache the shared parts
+(quiz cards, category lists) with `{% cache %}` fragments keyed on the same
+`catalog_version` context variable. Fragments go to the per-process
+"template_fragments" cache (see `settings.CACHES`): the version key makes them
+safe to keep per process, and a hit costs no query.
+"""
+
+import hashlib
+import logging
+from functools import wraps
+from typing import Iterable
+
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from multi_choice_quiz.caching import get_catalog_version
+
+logger = logging.getLogger(__name__)
+
+ANONYMOUS_PAGE_CACHE_PREFIX = "anonymous_page"
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 60 * 60  # 1 hour; stale versions are never read
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24  # `{% cache %}` fragments, version-keyed
+
+
+def request_catalog_version(request) -> int:
+    """Return the catalog version, read from the cache once per request."""
+    if not hasattr(request, "_catalog_version"):
+        request._catalog_version = get_catalog_version()
+    return request._catalog_version
+
+
+def anonymous_page_cache_key(request) -> str:
+    """Return the cache key for the anonymous page at this request's URL."""
+    path_hash = hashlib.sha256(request.get_full_path().encode("utf-8")).hexdigest()
+    version = request_catalog_version(request)
+    return f"{ANONYMOUS_PAGE_CACHE_PREFIX}:{version}:{path_hash}"
+
+
+def _is_cacheable_request(request, params: Iterable[str]) -> bool:
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        # Pending flash messages are rendered into the page.
+        and CookieStorage.cookie_name not in request.COOKIES
+        and all(name in params for name in request.GET)
+    )
+
+
+def cache_anonymous_page(params: Iterable[str] = ()):
+    """
+    Cache a view's response for anonymous users.
+
+    Only requests whose query parameters are all in `params` are cached, so
+    free-form input (e.g. `?q=` searches) does not fill the cache. Responses
+    that are not 200 or that set cookies (a CSRF token, a session) are never
+    stored.
+    """
+    params = frozenset(params)
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not _is_cacheable_request(request, params):
+                return view_func(request, *args, **kwargs)
+
+            key = anonymous_page_cache_key(request)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                patch_vary_headers(response, ("Cookie",))
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if (
+                response.status_code == 200
+                and not response.streaming
+                and not response.cookies
+            ):
+                cache.set(
+                    key,
+                    (response.content, response["Content-Type"]),
+                    ANONYMOUS_PAGE_CACHE_TIMEOUT,
+                )
+                logger.debug(f"Stored anonymous page {request.path} ({key}).")
+            patch_vary_headers(response, ("Cookie",))
+            return response
+
+        return wrapper
+
+    return decorator
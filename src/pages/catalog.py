@@ -0,0 +1,211 @@
+# src/pages/catalog.py
+"""
+Listing of the public quiz catalog.
+
+Besides the offset pagination of the quizzes page, the catalog can be read
+with keyset (cursor) pagination, newest first: each page is a range scan of
+the (is_active, -created_at, -id) index starting after the last quiz of the
+previous page, so deep pages cost the same as the first one, quizzes imported
+meanwhile do not shift pages, and no COUNT of the catalog is needed.
+
+The home page reads a materialized summary of the catalog instead of
+aggregating it: the popular categories (`PopularCategory`) and a pool of the
+newest quizzes to feature (`FeaturedQuiz`). `refresh_catalog_summaries`
+rebuilds both, never on the request path: the catalog signal handlers
+(`pages.signals`) schedule it for when the transaction changing quizzes,
+questions or categories commits (imports, admin edits), and `manage.py
+refresh_catalog_summaries` runs it on demand. Until then the home page serves
+the rows as they are.
+"""
+
+import base64
+import binascii
+import threading
+from datetime import datetime
+from typing import AbstractSet, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, Q, QuerySet
+
+from multi_choice_quiz.caching import bump_catalog_version
+from multi_choice_quiz.models import Quiz
+
+from .models import FeaturedQuiz, PopularCategory, SystemCategory
+
+MAX_CATALOG_PAGE_SIZE = 50
+POPULAR_CATEGORY_LIMIT = 16
+FEATURED_QUIZ_POOL_SIZE = 24  # Enough to skip a user's attempted quizzes
+
+_pending_refresh = threading.local()
+
+
+class InvalidCursor(ValueError):
+    """Raised when a catalog cursor cannot be decoded."""
+
+
+def encode_cursor(quiz: Quiz) -> str:
+    """Return the opaque cursor pointing just after `quiz`."""
+    raw = f"{quiz.created_at.isoformat()}|{quiz.pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Return the (created_at, id) position encoded by `encode_cursor`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, quiz_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(quiz_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+def catalog_queryset(category_slug: Optional[str] = None) -> QuerySet:
+    """Active quizzes with at least one active question."""
+    quizzes = Quiz.objects.filter(is_active=True, active_question_count__gt=0)
+    if category_slug:
+        quizzes = quizzes.filter(system_categories__slug=category_slug)
+    return quizzes
+
+
+def catalog_page(
+    category_slug: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 9,
+) -> Tuple[List[Quiz], Optional[str]]:
+    """
+    Return one keyset page of the catalog, newest first.
+
+    Args:
+        category_slug: Only list quizzes of this SystemCategory
+        cursor: `next_cursor` of the previous page (None for the first page)
+        limit: Page size, capped at MAX_CATALOG_PAGE_SIZE
+
+    Returns:
+        (quizzes with system_categories prefetched, next_cursor or None on the
+        last page). Raises InvalidCursor for a malformed cursor.
+    """
+    limit = max(1, min(limit, MAX_CATALOG_PAGE_SIZE))
+    quizzes = catalog_queryset(category_slug)
+    if cursor:
+        created_at, quiz_id = decode_cursor(cursor)
+        quizzes = quizzes.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=quiz_id)
+        )
+    # One extra row tells whether another page follows.
+    page = list(
+        quizzes.order_by("-created_at", "-id").prefetch_related("system_categories")[
+            : limit + 1
+        ]
+    )
+    next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+    return page[:limit], next_cursor
+
+
+def refresh_catalog_summaries() -> Tuple[int, int]:
+    """
+    Rebuild the PopularCategory and FeaturedQuiz rows from the catalog.
+
+    Rows are upserted and only rows that dropped out are deleted, so
+    concurrent refreshes (e.g. two workers committing catalog changes) do not
+    collide on the primary keys. Once the rows are committed the catalog
+    version is bumped, so pages and fragments cached from the old rows under a
+    version bumped earlier by a signal handler are not served any longer.
+    Returns (popular category count, featured quiz count).
+    """
+    popular = list(
+        SystemCategory.objects.annotate(
+            num_active_quizzes=Count(
+                "quizzes",
+                filter=Q(
+                    quizzes__is_active=True, quizzes__active_question_count__gt=0
+                ),
+                distinct=True,
+            )
+        )
+        .filter(num_active_quizzes__gt=0)
+        .order_by("-num_active_quizzes", "name")
+        .values_list("id", "num_active_quizzes")[:POPULAR_CATEGORY_LIMIT]
+    )
+    featured = list(
+        catalog_queryset()
+        .order_by("-created_at", "-id")
+        .values_list("id", flat=True)[:FEATURED_QUIZ_POOL_SIZE]
+    )
+    with transaction.atomic():
+        PopularCategory.objects.exclude(
+            category_id__in=[category_id for category_id, _ in popular]
+        ).delete()
+        PopularCategory.objects.bulk_create(
+            [
+                PopularCategory(
+                    category_id=category_id, active_quiz_count=count, rank=rank
+                )
+                for rank, (category_id, count) in enumerate(popular, start=1)
+            ],
+            update_conflicts=True,
+            unique_fields=["category"],
+            update_fields=["active_quiz_count", "rank"],
+        )
+        FeaturedQuiz.objects.exclude(quiz_id__in=featured).delete()
+        FeaturedQuiz.objects.bulk_create(
+            [
+                FeaturedQuiz(quiz_id=quiz_id, rank=rank)
+                for rank, quiz_id in enumerate(featured, start=1)
+            ],
+            update_conflicts=True,
+            unique_fields=["quiz"],
+            update_fields=["rank"],
+        )
+    transaction.on_commit(bump_catalog_version)
+    return len(popular), len(featured)
+
+
+def _refresh_after_commit() -> None:
+    # Every change of a transaction queued this callback; the first one rebuilds.
+    if getattr(_pending_refresh, "pending", False):
+        _pending_refresh.pending = False
+        refresh_catalog_summaries()
+
+
+def refresh_catalog_summaries_on_commit() -> None:
+    """
+    Rebuild the catalog summaries once the current transaction commits.
+
+    Called by the catalog signal handlers: all changes of one transaction (an
+    admin save with its inlines, an imported quiz) share one rebuild. Outside
+    a transaction the rebuild runs immediately.
+    """
+    _pending_refresh.pending = True
+    transaction.on_commit(_refresh_after_commit, robust=True)
+
+
+def popular_categories(limit: int = POPULAR_CATEGORY_LIMIT) -> QuerySet:
+    """SystemCategories by rank, annotated with `num_active_quizzes`."""
+    return (
+        SystemCategory.objects.filter(popularity__isnull=False)
+        .annotate(num_active_quizzes=F("popularity__active_quiz_count"))
+        .order_by("popularity__rank")[:limit]
+    )
+
+
+def featured_quizzes(
+    attempted_quiz_ids: AbstractSet[int] = frozenset(), count: int = 3
+) -> Optional[List[Quiz]]:
+    """
+    Return the quizzes to feature, newest first, with system_categories prefetched.
+
+    Quizzes in `attempted_quiz_ids` go after the others, each annotated with
+    `has_attempted`. Returns None when the featured pool is full and has fewer
+    than `count` unattempted quizzes, so the caller can query the catalog.
+    """
+    pool = list(FeaturedQuiz.objects.order_by("rank").values_list("quiz_id", flat=True))
+    unattempted = [quiz_id for quiz_id in pool if quiz_id not in attempted_quiz_ids]
+    if len(unattempted) < count and len(pool) >= FEATURED_QUIZ_POOL_SIZE:
+        return None
+    attempted = [quiz_id for quiz_id in pool if quiz_id in attempted_quiz_ids]
+    chosen = (unattempted + attempted)[:count]
+    quizzes = catalog_queryset().prefetch_related("system_categories").in_bulk(chosen)
+    featured = [quizzes[quiz_id] for quiz_id in chosen if quiz_id in quizzes]
+    for quiz in featured:
+        quiz.has_attempted = quiz.pk in attempted_quiz_ids
+    return featured
@@ -0,0 +1,65 @@
+# src/pages/collection_membership.py
+"""
+Set-based membership changes for UserCollections.
+
+Memberships are rows of the `UserCollection.quizzes` through table, which has
+a unique index on (usercollection_id, quiz_id). Membership checks filter that
+index for the given quiz IDs only, and adds/removes are one bulk INSERT or one
+DELETE whatever the number of quizzes. Going through the table directly skips
+`m2m_changed`, which nothing listens to for collections.
+"""
+
+from typing import Iterable, List, Set
+
+from multi_choice_quiz.models import Quiz
+
+from .models import UserCollection
+
+MAX_BULK_COLLECTION_QUIZZES = 500
+
+CollectionQuiz = UserCollection.quizzes.through
+
+
+def collection_quiz_ids(collection: UserCollection, quiz_ids: Iterable[int]) -> Set[int]:
+    """Return which of `quiz_ids` are in the collection (one indexed lookup)."""
+    return set(
+        CollectionQuiz.objects.filter(
+            usercollection_id=collection.pk, quiz_id__in=set(quiz_ids)
+        ).values_list("quiz_id", flat=True)
+    )
+
+
+def add_quizzes_to_collection(
+    collection: UserCollection, quiz_ids: Iterable[int]
+) -> List[int]:
+    """
+    Add the active quizzes among `quiz_ids` to the collection.
+
+    Returns the IDs actually added, in the given order; unknown, inactive and
+    already present quizzes are skipped. Three queries: the active quizzes,
+    the membership check and one bulk insert.
+    """
+    quiz_ids = list(dict.fromkeys(quiz_ids))
+    active = set(
+        Quiz.objects.filter(pk__in=quiz_ids, is_active=True).values_list(
+            "pk", flat=True
+        )
+    )
+    present = collection_quiz_ids(collection, active)
+    added = [quiz_id for quiz_id in quiz_ids if quiz_id in active - present]
+    # ignore_conflicts: a concurrent request may have added some meanwhile.
+    CollectionQuiz.objects.bulk_create(
+        [CollectionQuiz(usercollection_id=collection.pk, quiz_id=q) for q in added],
+        ignore_conflicts=True,
+    )
+    return added
+
+
+def remove_quizzes_from_collection(
+    collection: UserCollection, quiz_ids: Iterable[int]
+) -> int:
+    """Remove `quiz_ids` from the collection in one DELETE; returns the count."""
+    removed, _ = CollectionQuiz.objects.filter(
+        usercollection_id=collection.pk, quiz_id__in=set(quiz_ids)
+    ).delete()
+    return removed
@@ -0,0 +1,95 @@
+# src/pages/history.py
+"""
+Keyset-paginated quiz attempt history for the profile page.
+
+Attempts are listed newest first by (end_time, id); attempts without an
+end_time are placed by their start_time. Each page starts after the last
+attempt of the previous one with a plain descending range scan of the
+(user, COALESCE(end_time, start_time), id) index, so a user with thousands of
+attempts costs the same per page as a new one. The profile renders the first page and
+`attempt_history_json` serves the rest as the user scrolls.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+
+from multi_choice_quiz.models import QuizAttempt, UserQuizStats
+
+from .catalog import InvalidCursor
+
+ATTEMPT_HISTORY_PAGE_SIZE = 20
+MAX_ATTEMPT_HISTORY_PAGE_SIZE = 50
+
+
+def _attempted_at(attempt: QuizAttempt) -> datetime:
+    return attempt.end_time or attempt.start_time
+
+
+def encode_attempt_cursor(attempt: QuizAttempt) -> str:
+    """Return the opaque cursor pointing just after `attempt`."""
+    raw = f"{_attempted_at(attempt).isoformat()}|{attempt.pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_attempt_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Return the (attempted_at, id) position encoded by `encode_attempt_cursor`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        attempted_at, attempt_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(attempted_at), int(attempt_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+def attempt_history_page(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = ATTEMPT_HISTORY_PAGE_SIZE,
+) -> Tuple[List[QuizAttempt], Optional[str]]:
+    """
+    Return one keyset page of a user's attempts, newest first.
+
+    Args:
+        user_id: Owner of the attempts
+        cursor: `next_cursor` of the previous page (None for the first page)
+        limit: Page size, capped at MAX_ATTEMPT_HISTORY_PAGE_SIZE
+
+    Returns:
+        (attempts with `quiz` loaded and `individual_quiz_attempt_count` set
+        from `UserQuizStats`, next_cursor or None on the last page). Raises
+        InvalidCursor for a malformed cursor.
+    """
+    limit = max(1, min(limit, MAX_ATTEMPT_HISTORY_PAGE_SIZE))
+    # Same expression as the attempt_user_recent index, so the page is a range
+    # scan of it.
+    attempts = QuizAttempt.objects.filter(user_id=user_id).alias(
+        attempted_at=Coalesce("end_time", "start_time")
+    )
+    if cursor:
+        attempted_at, attempt_id = decode_attempt_cursor(cursor)
+        attempts = attempts.filter(
+            Q(attempted_at__lt=attempted_at)
+            | Q(attempted_at=attempted_at, id__lt=attempt_id)
+        )
+    # One extra row tells whether another page follows.
+    page = list(
+        attempts.order_by("-attempted_at", "-id").select_related("quiz")[
+            : limit + 1
+        ]
+    )
+    next_cursor = encode_attempt_cursor(page[limit - 1]) if len(page) > limit else None
+    page = page[:limit]
+
+    attempt_counts = dict(
+        UserQuizStats.objects.filter(
+            user_id=user_id, quiz_id__in={attempt.quiz_id for attempt in page}
+        ).values_list("quiz_id", "attempt_count")
+    )
+    for attempt in page:
+        attempt.individual_quiz_attempt_count = attempt_counts.get(attempt.quiz_id, 0)
+    return page, next_cursor
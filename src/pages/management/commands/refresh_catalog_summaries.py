@@ -0,0 +1,20 @@
+# src/pages/management/commands/refresh_catalog_summaries.py
+
+from django.core.management.base import BaseCommand
+
+from pages.catalog import refresh_catalog_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the PopularCategory and FeaturedQuiz rows read by the home page. "
+        "Catalog changes (imports, admin edits) refresh them when they commit."
+    )
+
+    def handle(self, *args, **options):
+        categories, quizzes = refresh_catalog_summaries()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Ranked {categories} popular categories and {quizzes} featured quizzes."
+            )
+        )
@@ -0,0 +1,85 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+POPULAR_CATEGORY_LIMIT = 16
+FEATURED_QUIZ_POOL_SIZE = 24
+
+
+def fill_catalog_summaries(apps, schema_editor):
+    SystemCategory = apps.get_model("pages", "SystemCategory")
+    Quiz = apps.get_model("multi_choice_quiz", "Quiz")
+    PopularCategory = apps.get_model("pages", "PopularCategory")
+    FeaturedQuiz = apps.get_model("pages", "FeaturedQuiz")
+
+    popular = (
+        SystemCategory.objects.annotate(
+            num_active_quizzes=Count(
+                "quizzes",
+                filter=Q(
+                    quizzes__is_active=True, quizzes__active_question_count__gt=0
+                ),
+                distinct=True,
+            )
+        )
+        .filter(num_active_quizzes__gt=0)
+        .order_by("-num_active_quizzes", "name")
+        .values_list("id", "num_active_quizzes")[:POPULAR_CATEGORY_LIMIT]
+    )
+    PopularCategory.objects.bulk_create(
+        [
+            PopularCategory(category_id=category_id, active_quiz_count=count, rank=rank)
+            for rank, (category_id, count) in enumerate(popular, start=1)
+        ]
+    )
+    featured = (
+        Quiz.objects.filter(is_active=True, active_question_count__gt=0)
+        .order_by("-created_at", "-id")
+        .values_list("id", flat=True)[:FEATURED_QUIZ_POOL_SIZE]
+    )
+    FeaturedQuiz.objects.bulk_create(
+        [
+            FeaturedQuiz(quiz_id=quiz_id, rank=rank)
+            for rank, quiz_id in enumerate(featured, start=1)
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('multi_choice_quiz', '0008_quiz_counters'),
+        ('pages', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PopularCategory',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='popularity', serialize=False, to='pages.systemcategory')),
+                ('active_quiz_count', models.PositiveIntegerField(default=0)),
+                ('rank', models.PositiveIntegerField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Popular Category',
+                'verbose_name_plural': 'Popular Categories',
+                'ordering': ['rank'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FeaturedQuiz',
+            fields=[
+                ('quiz', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='featured_slot', serialize=False, to='multi_choice_quiz.quiz')),
+                ('rank', models.PositiveIntegerField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Featured Quiz',
+                'verbose_name_plural': 'Featured Quizzes',
+                'ordering': ['rank'],
+            },
+        ),
+        migrations.RunPython(fill_catalog_summaries, migrations.RunPython.noop),
+    ]
@@ -129,6 +129,56 @@ class UserCollection(models.Model):
         super().clean()
 
 
+class PopularCategory(models.Model):
+    """
+    Materialized ranking of SystemCategories by active quiz count (home page).
+
+    Rebuilt by `pages.catalog.refresh_catalog_summaries` when catalog changes
+    commit (imports, admin edits) and by `manage.py refresh_catalog_summaries`.
+    """
+
+    category = models.OneToOneField(
+        SystemCategory,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="popularity",
+    )
+    active_quiz_count = models.PositiveIntegerField(default=0)
+    rank = models.PositiveIntegerField(db_index=True)
+
+    class Meta:
+        ordering = ["rank"]
+        verbose_name = "Popular Category"
+        verbose_name_plural = "Popular Categories"
+
+    def __str__(self):
+        return f"#{self.rank} {self.category_id}: {self.active_quiz_count} quizzes"
+
+
+class FeaturedQuiz(models.Model):
+    """
+    Materialized list of the newest catalog quizzes, featured on the home page.
+
+    Rebuilt together with `PopularCategory`.
+    """
+
+    quiz = models.OneToOneField(
+        "multi_choice_quiz.Quiz",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="featured_slot",
+    )
+    rank = models.PositiveIntegerField(db_index=True)
+
+    class Meta:
+        ordering = ["rank"]
+        verbose_name = "Featured Quiz"
+        verbose_name_plural = "Featured Quizzes"
+
+    def __str__(self):
+        return f"#{self.rank} quiz {self.quiz_id}"
+
+
 # --- Verification Steps ---
 # 1. Replace the content of `src/pages/models.py` with the code above.
 # 2. Run `python manage.py makemigrations pages`
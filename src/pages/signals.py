@@ -0,0 +1,36 @@
+# src/pages/signals.py
+"""
+Signal handlers bumping the catalog version (`multi_choice_quiz.caching`) when
+system categories or their quizzes change, and refreshing the home page's
+catalog summaries (`catalog.refresh_catalog_summaries`) when the change
+commits.
+
+Bulk paths (`bulk_create`, `QuerySet.update`) do not send signals; the import
+pipeline creates its quiz with `Quiz.objects.create`, which does.
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from multi_choice_quiz.caching import bump_catalog_version
+from multi_choice_quiz.models import Question, Quiz
+
+from .catalog import refresh_catalog_summaries_on_commit
+from .models import SystemCategory
+
+
+@receiver(post_save, sender=SystemCategory)
+@receiver(post_delete, sender=SystemCategory)
+@receiver(m2m_changed, sender=SystemCategory.quizzes.through)
+def system_categories_changed(sender, **kwargs):
+    bump_catalog_version()
+    refresh_catalog_summaries_on_commit()
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def catalog_quizzes_changed(sender, **kwargs):
+    # Activity, creation dates and active question counts decide the summaries.
+    refresh_catalog_summaries_on_commit()
@@ -6,6 +6,7 @@ from django.contrib.auth import get_user_model
 from django.contrib import messages
 from django.utils.http import urlencode  # Import urlencode
 
+from pages.catalog import refresh_catalog_summaries
 from pages.models import UserCollection
 from multi_choice_quiz.models import Quiz, Question
 from multi_choice_quiz.tests.test_logging import setup_test_logging
@@ -45,6 +46,8 @@ class CollectionManagementVerificationTests(TestCase):
         )
         if not cls.quiz3.questions.exists():
             Question.objects.create(quiz=cls.quiz3, text="Q1 from CTQ3")
+        # Summaries are refreshed on commit, which TestCase never reaches.
+        refresh_catalog_summaries()
 
         # URLs
         cls.profile_url = reverse("pages:profile")
@@ -1,14 +1,29 @@
 # src/pages/tests/test_views.py
 
 import re
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
 from django.utils import timezone
 from django.db.models import Count, Q, Exists, OuterRef, Avg  # Ensure Avg is imported
 
 from multi_choice_quiz.models import Quiz, QuizAttempt, Question
-from pages.models import UserCollection, SystemCategory
+from multi_choice_quiz.caching import bump_catalog_version, get_catalog_version
+from pages.autocomplete import reset_prefix_index
+from pages.catalog import refresh_catalog_summaries
+from pages.models import (
+    FeaturedQuiz,
+    PopularCategory,
+    SystemCategory,
+    UserCollection,
+)
 from multi_choice_quiz.tests.test_logging import setup_test_logging
 
 logger = setup_test_logging(__name__, "pages")
@@ -215,6 +230,8 @@ class PagesViewTests(TestCase):
         cls.nodata_user_collection = UserCollection.objects.create(
             user=cls.user_no_data, name="No Data User Coll"
         )
+        # Summaries are refreshed on commit, which TestCase never reaches.
+        refresh_catalog_summaries()
 
     def setUp(self):
         self.client = Client()
@@ -562,3 +579,738 @@ class PagesViewTests(TestCase):
             self.assertEqual(attempt_t1.individual_quiz_attempt_count, 3)
 
         logger.info("Profile page attempt counts verified in context.")
+
+
+class QuizzesPaginationTests(TestCase):
+    """The quizzes page paginates in the database with annotated question counts."""
+
+    def _create_quizzes(self, count):
+        for i in range(count):
+            quiz = Quiz.objects.create(title=f"Paged Quiz {i:02d}", is_active=True)
+            Question.objects.create(quiz=quiz, text="Active 1", position=1)
+            Question.objects.create(quiz=quiz, text="Active 2", position=2)
+            Question.objects.create(
+                quiz=quiz, text="Inactive", position=3, is_active=False
+            )
+
+    def _get_page(self, **params):
+        executed = []
+
+        def record_query(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        # connection.queries is reset per request, so record via a wrapper.
+        with connection.execute_wrapper(record_query):
+            response = self.client.get(reverse("pages:quizzes"), params)
+        self.assertEqual(response.status_code, 200)
+        return response, executed
+
+    def test_question_count_counts_active_questions(self):
+        self._create_quizzes(2)
+        empty_quiz = Quiz.objects.create(title="Only Inactive", is_active=True)
+        Question.objects.create(quiz=empty_quiz, text="Hidden", is_active=False)
+
+        response, _ = self._get_page()
+        quizzes_page = response.context["quizzes"]
+        self.assertEqual(quizzes_page.paginator.count, 2)
+        self.assertEqual(
+            [quiz.active_question_count for quiz in quizzes_page], [2, 2]
+        )
+        self.assertContains(response, "2 questions", count=2)
+
+    def test_page_cost_does_not_depend_on_catalog_size(self):
+        self._create_quizzes(10)
+        _, small_catalog = self._get_page(page=2)
+        self._create_quizzes(40)
+        response, large_catalog = self._get_page(page=3)
+
+        self.assertEqual(len(large_catalog), len(small_catalog))
+        self.assertEqual(response.context["quizzes"].paginator.count, 50)
+        self.assertEqual(len(response.context["quizzes"].object_list), 9)
+        self.assertFalse(
+            any(
+                sql.startswith('SELECT "multi_choice_quiz_question"')
+                for sql in large_catalog
+            ),
+            "Questions should not be prefetched",
+        )
+        logger.info(f"Quizzes page ran {len(large_catalog)} queries.")
+
+    def test_authenticated_ordering_puts_attempted_quizzes_last(self):
+        user = User.objects.create_user(username="pager", password="password123")
+        self._create_quizzes(12)
+        newest = Quiz.objects.order_by("-created_at", "-id").first()
+        QuizAttempt.objects.create(
+            user=user, quiz=newest, score=1, total_questions=2, percentage=50
+        )
+        self.client.force_login(user)
+
+        response, _ = self._get_page(page=2)
+        last_page = list(response.context["quizzes"])
+        self.assertEqual(last_page[-1], newest)
+        self.assertTrue(last_page[-1].has_attempted)
+        self.assertFalse(any(quiz.has_attempted for quiz in last_page[:-1]))
+
+    def test_personalized_pages_do_not_query_attempts(self):
+        """home and quizzes rank with the cached attempted-quiz set."""
+        user = User.objects.create_user(username="cached", password="password123")
+        self._create_quizzes(5)
+        QuizAttempt.objects.create(
+            user=user,
+            quiz=Quiz.objects.order_by("-created_at", "-id").first(),
+            score=1,
+            total_questions=2,
+            percentage=50,
+        )
+        refresh_catalog_summaries()
+        self.client.force_login(user)
+        self._get_page()  # Builds the cached set
+
+        response, executed = self._get_page()
+        self.assertTrue(list(response.context["quizzes"])[-1].has_attempted)
+        with connection.execute_wrapper(
+            lambda execute, sql, params, many, context: executed.append(sql)
+            or execute(sql, params, many, context)
+        ):
+            response = self.client.get(reverse("pages:home"))
+        self.assertFalse(response.context["featured_quizzes"][0].has_attempted)
+        self.assertFalse(
+            any('"multi_choice_quiz_quizattempt"' in sql for sql in executed)
+        )
+
+
+class CatalogCursorTests(TestCase):
+    """Keyset pagination of the quiz catalog (JSON endpoint and quizzes page)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = SystemCategory.objects.create(
+            name="Cursor Cat", slug="cursor-cat"
+        )
+        base = timezone.now() - timezone.timedelta(days=30)
+        cls.quizzes = []
+        for i in range(12):
+            quiz = Quiz.objects.create(title=f"Cursor Quiz {i:02d}", is_active=True)
+            # Pairs share a timestamp so the id tie-breaker is exercised.
+            Quiz.objects.filter(pk=quiz.pk).update(
+                created_at=base + timezone.timedelta(days=i // 2)
+            )
+            Question.objects.create(quiz=quiz, text="Q", position=1)
+            if i % 3 == 0:
+                cls.category.quizzes.add(quiz)
+            cls.quizzes.append(quiz)
+        cls.newest_first = [q.title for q in reversed(cls.quizzes)]
+
+    def _get_json(self, **params):
+        executed = []
+
+        def record_query(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        # connection.queries is reset per request, so record via a wrapper.
+        with connection.execute_wrapper(record_query):
+            response = self.client.get(reverse("pages:quizzes_catalog_json"), params)
+        return response, executed
+
+    def test_cursor_walk_lists_each_quiz_once_at_constant_cost(self):
+        titles, query_counts, cursor = [], [], ""
+        while True:
+            response, executed = self._get_json(cursor=cursor, limit=5)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            titles.extend(quiz["title"] for quiz in data["quizzes"])
+            query_counts.append(len(executed))
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(titles, self.newest_first)
+        self.assertEqual(len(query_counts), 3)
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+        self.assertFalse(any("COUNT(*)" in sql for sql in executed))
+
+    def test_new_quizzes_do_not_shift_later_pages(self):
+        first = self._get_json(limit=4)[0].json()
+        Quiz.objects.create(title="Imported Meanwhile", is_active=True)
+        Question.objects.create(
+            quiz=Quiz.objects.get(title="Imported Meanwhile"), text="Q", position=1
+        )
+        second = self._get_json(cursor=first["next_cursor"], limit=4)[0].json()
+        self.assertEqual(
+            [quiz["title"] for quiz in second["quizzes"]], self.newest_first[4:8]
+        )
+
+    def test_category_filter_and_payload(self):
+        data = self._get_json(category="cursor-cat", limit=50)[0].json()
+        self.assertEqual(
+            [quiz["title"] for quiz in data["quizzes"]],
+            ["Cursor Quiz 09", "Cursor Quiz 06", "Cursor Quiz 03", "Cursor Quiz 00"],
+        )
+        self.assertIsNone(data["next_cursor"])
+        first = data["quizzes"][0]
+        self.assertEqual(first["question_count"], 1)
+        self.assertEqual(
+            first["categories"], [{"name": "Cursor Cat", "slug": "cursor-cat"}]
+        )
+        self.assertEqual(
+            first["url"],
+            reverse("multi_choice_quiz:quiz_detail", args=[self.quizzes[9].id]),
+        )
+
+    def test_invalid_cursor_is_rejected(self):
+        for cursor in ["not-a-cursor", "bm90fGE"]:
+            response, _ = self._get_json(cursor=cursor)
+            self.assertEqual(response.status_code, 400)
+
+    def test_quizzes_page_cursor_mode(self):
+        response = self.client.get(reverse("pages:quizzes"), {"cursor": ""})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["cursor_mode"])
+        self.assertEqual(
+            [quiz.title for quiz in response.context["quizzes"]], self.newest_first[:9]
+        )
+        self.assertContains(response, "More quizzes")
+
+        response = self.client.get(
+            reverse("pages:quizzes"), {"cursor": response.context["next_cursor"]}
+        )
+        self.assertEqual(
+            [quiz.title for quiz in response.context["quizzes"]], self.newest_first[9:]
+        )
+        self.assertIsNone(response.context["next_cursor"])
+        self.assertNotContains(response, "More quizzes")
+
+
+class AttemptHistoryTests(TestCase):
+    """Keyset pagination of the profile attempt history."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="historian", password="pw")
+        other = User.objects.create_user(username="bystander", password="pw")
+        cls.quiz = Quiz.objects.create(title="History Walk Quiz", is_active=True)
+        Question.objects.create(quiz=cls.quiz, text="Q", position=1)
+        base = timezone.now() - timezone.timedelta(days=60)
+        cls.attempts = []
+        for i in range(45):
+            # Pairs share an end_time so the id tie-breaker is exercised; the
+            # last three have none and are placed by their start_time (now).
+            cls.attempts.append(
+                QuizAttempt.objects.create(
+                    user=cls.user,
+                    quiz=cls.quiz,
+                    score=1,
+                    total_questions=1,
+                    percentage=i,
+                    end_time=None if i >= 42 else base + timezone.timedelta(days=i // 2),
+                )
+            )
+        QuizAttempt.objects.create(
+            user=other, quiz=cls.quiz, score=0, total_questions=1, percentage=0
+        )
+        cls.newest_first = [
+            a.id
+            for a in sorted(
+                cls.attempts,
+                key=lambda a: (a.end_time or a.start_time, a.id),
+                reverse=True,
+            )
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def _get_json(self, **params):
+        executed = []
+
+        def record_query(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record_query):
+            response = self.client.get(reverse("pages:attempt_history_json"), params)
+        return response, executed
+
+    def test_profile_renders_first_page_only(self):
+        response = self.client.get(reverse("pages:profile"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [a.id for a in response.context["quiz_attempts"]], self.newest_first[:20]
+        )
+        self.assertEqual(response.context["stats"]["total_taken"], 45)
+        self.assertIsNotNone(response.context["history_next_cursor"])
+        self.assertContains(response, 'data-testid="history-more"')
+        self.assertNotContains(
+            response, f'data-testid="history-attempt-{self.newest_first[20]}"'
+        )
+
+    def test_cursor_walk_lists_each_attempt_once_at_constant_cost(self):
+        self.client.get(reverse("pages:profile"))  # Builds the user's stats rows
+        ids, query_counts, cursor = [], [], ""
+        while True:
+            response, executed = self._get_json(cursor=cursor)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            ids.extend(attempt["id"] for attempt in data["attempts"])
+            query_counts.append(len(executed))
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(ids, self.newest_first)
+        self.assertEqual(len(query_counts), 3)
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+        self.assertFalse(any("COUNT(" in sql.upper() for sql in executed))
+        # A plain descending range on the (user, -end_time, -id) index.
+        page_sql = next(sql for sql in executed if "ORDER BY" in sql.upper())
+        self.assertNotIn("NULLS LAST", page_sql.upper())
+        self.assertNotIn(" IS NULL", page_sql.upper())
+        self.assertEqual(data["attempts"][0]["quiz_attempt_count"], 45)
+        self.assertEqual(
+            data["attempts"][0]["quiz_url"],
+            reverse("multi_choice_quiz:quiz_detail", args=[self.quiz.id]),
+        )
+
+    def test_invalid_cursor_is_rejected(self):
+        for cursor in ["not-a-cursor", "bm90fGE"]:
+            response, _ = self._get_json(cursor=cursor)
+            self.assertEqual(response.status_code, 400)
+
+    def test_history_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse("pages:attempt_history_json"))
+        self.assertEqual(response.status_code, 302)
+
+
+class CollectionSummaryTests(TestCase):
+    """Collections render from annotated summaries, not their questions."""
+
+    def test_profile_collections_do_not_load_questions(self):
+        user = User.objects.create_user(username="collector", password="pw")
+        big = UserCollection.objects.create(user=user, name="Big")
+        UserCollection.objects.create(user=user, name="Empty")
+        for i in range(30):
+            quiz = Quiz.objects.create(title=f"Summary Quiz {i}", is_active=True)
+            for position in (1, 2, 3):
+                Question.objects.create(quiz=quiz, text="Q", position=position)
+            big.quizzes.add(quiz)
+        self.client.force_login(user)
+
+        executed = []
+        with connection.execute_wrapper(
+            lambda execute, sql, params, many, context: executed.append(sql)
+            or execute(sql, params, many, context)
+        ):
+            response = self.client.get(reverse("pages:profile"))
+
+        collections = {c.name: c for c in response.context["user_collections"]}
+        self.assertEqual(
+            (collections["Big"].quiz_count, collections["Big"].question_total), (30, 90)
+        )
+        self.assertEqual(
+            (collections["Empty"].quiz_count, collections["Empty"].question_total),
+            (0, 0),
+        )
+        self.assertContains(response, "30 quizs · 90 questions")
+        self.assertFalse(
+            any('"multi_choice_quiz_question"' in sql for sql in executed)
+        )
+        collection_queries = [
+            sql for sql in executed if '"pages_usercollection' in sql
+        ]
+        self.assertEqual(len(collection_queries), 2, collection_queries)
+
+
+class QuizAutocompleteTests(TestCase):
+    """Search-as-you-type served from the in-process prefix index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = Quiz.objects.create(title="Python Basics", is_active=True)
+        Question.objects.create(quiz=cls.python, text="Q", position=1)
+        cls.advanced = Quiz.objects.create(title="Advanced Python", is_active=True)
+        Question.objects.create(quiz=cls.advanced, text="Q", position=1)
+        cls.empty = Quiz.objects.create(title="Python Empty", is_active=True)
+        SystemCategory.objects.create(name="Programming", slug="programming")
+
+    def setUp(self):
+        cache.clear()
+        reset_prefix_index()
+        self.addCleanup(reset_prefix_index)
+
+    def _get_json(self, q, **params):
+        executed = []
+        with connection.execute_wrapper(
+            lambda execute, sql, params, many, context: executed.append(sql)
+            or execute(sql, params, many, context)
+        ):
+            response = self.client.get(
+                reverse("pages:quiz_autocomplete_json"), {"q": q, **params}
+            )
+        self.assertEqual(response.status_code, 200)
+        return response.json()["suggestions"], executed
+
+    def test_prefix_matches_rank_first_word_first(self):
+        logger.info("Testing autocomplete prefix matching")
+        suggestions, _ = self._get_json("pyth")
+        # Quizzes without active questions are not in the catalog.
+        self.assertEqual(
+            [s["label"] for s in suggestions], ["Python Basics", "Advanced Python"]
+        )
+        self.assertEqual(
+            suggestions[0]["url"],
+            reverse("multi_choice_quiz:quiz_detail", args=[self.python.id]),
+        )
+
+        suggestions, _ = self._get_json("PROG")
+        self.assertEqual(suggestions[0]["type"], "category")
+        self.assertTrue(suggestions[0]["url"].endswith("?category=programming"))
+
+        suggestions, _ = self._get_json("pyth", limit=1)
+        self.assertEqual([s["label"] for s in suggestions], ["Python Basics"])
+        self.assertEqual(self._get_json("")[0], [])
+        self.assertEqual(self._get_json("zzz")[0], [])
+
+    def test_lookups_run_no_queries_once_built(self):
+        logger.info("Testing autocomplete query count")
+        _, executed = self._get_json("py")
+        self.assertTrue(executed)  # First lookup builds the index.
+        for prefix in ("pyt", "pyth", "adv"):
+            _, executed = self._get_json(prefix)
+            self.assertEqual(executed, [], prefix)
+
+    def test_index_rebuilds_when_catalog_changes(self):
+        logger.info("Testing autocomplete rebuild on catalog version change")
+        self.assertEqual(self._get_json("gen")[0], [])
+        quiz = Quiz.objects.create(title="Generators", is_active=True)
+        Question.objects.create(quiz=quiz, text="Q", position=1)
+
+        with patch("pages.autocomplete.AUTOCOMPLETE_VERSION_CHECK_INTERVAL", 0):
+            suggestions, _ = self._get_json("gen")
+            self.assertEqual([s["label"] for s in suggestions], ["Generators"])
+
+            Quiz.objects.filter(pk=quiz.pk).update(is_active=False)
+            bump_catalog_version()  # Bulk updates send no signals.
+            self.assertEqual(self._get_json("gen")[0], [])
+
+    def test_invalid_limit(self):
+        response = self.client.get(
+            reverse("pages:quiz_autocomplete_json"), {"q": "py", "limit": "x"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class CatalogPageCacheTests(TestCase):
+    """Anonymous catalog pages and logged-in fragments, keyed on the catalog version."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="fragments", password="pw")
+        cls.category = SystemCategory.objects.create(name="Cached Cat", slug="cached")
+        for i in range(3):
+            quiz = Quiz.objects.create(title=f"Cached Quiz {i}", is_active=True)
+            Question.objects.create(quiz=quiz, text="Q", position=1)
+            cls.category.quizzes.add(quiz)
+        refresh_catalog_summaries()
+
+    def setUp(self):
+        cache.clear()
+        caches["template_fragments"].clear()
+
+    def _get(self, url, params=None):
+        executed = []
+        with connection.execute_wrapper(
+            lambda execute, sql, params, many, context: executed.append(sql)
+            or execute(sql, params, many, context)
+        ):
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, executed
+
+    def test_anonymous_pages_are_served_from_cache(self):
+        logger.info("Testing anonymous full-page caching")
+        for name in ("pages:home", "pages:quizzes", "pages:about"):
+            url = reverse(name)
+            first, _ = self._get(url)
+            second, executed = self._get(url)
+            self.assertEqual(second.content, first.content)
+            self.assertIsNone(second.context)  # Not rendered again
+            self.assertFalse(
+                any('"multi_choice_quiz_quiz"' in sql for sql in executed), url
+            )
+            self.assertIn("Cookie", second["Vary"])
+
+    def test_catalog_change_invalidates_anonymous_pages(self):
+        logger.info("Testing anonymous page cache invalidation")
+        url = reverse("pages:quizzes")
+        self._get(url, {"category": "cached"})
+        quiz = Quiz.objects.create(title="Brand New Quiz", is_active=True)
+        Question.objects.create(quiz=quiz, text="Q", position=1)
+        self.category.quizzes.add(quiz)
+        response, _ = self._get(url, {"category": "cached"})
+        self.assertIsNotNone(response.context)
+        self.assertContains(response, "Brand New Quiz")
+
+    def test_searches_and_logged_in_pages_are_not_cached(self):
+        logger.info("Testing page cache bypass")
+        url = reverse("pages:quizzes")
+        self._get(url, {"q": "cached"})
+        response, _ = self._get(url, {"q": "cached"})
+        self.assertIsNotNone(response.context)
+
+        self.client.force_login(self.user)
+        self._get(url)
+        response, _ = self._get(url)
+        self.assertIsNotNone(response.context)
+        self.assertContains(response, "Add to Collection")
+
+    def test_logged_in_home_reuses_category_fragment(self):
+        logger.info("Testing fragment caching for logged-in users")
+        self.client.force_login(self.user)
+        first, executed = self._get(reverse("pages:home"))
+        self.assertTrue(any("num_active_quizzes" in sql for sql in executed))
+        self.assertContains(first, "Cached Cat")
+
+        second, executed = self._get(reverse("pages:home"))
+        self.assertFalse(any("num_active_quizzes" in sql for sql in executed))
+        self.assertContains(second, "Cached Cat")
+        self.assertContains(second, "3 quizs")
+
+
+class CatalogSummaryTests(TestCase):
+    """The home page reads materialized popular categories and featured quizzes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="summaries", password="pw")
+        cls.big = SystemCategory.objects.create(name="Big", slug="big")
+        cls.small = SystemCategory.objects.create(name="Small", slug="small")
+        cls.quizzes = []
+        with cls.captureOnCommitCallbacks(execute=True):
+            for i in range(4):
+                quiz = Quiz.objects.create(title=f"Summary Quiz {i}", is_active=True)
+                for position in (1, 2):
+                    Question.objects.create(quiz=quiz, text="Q", position=position)
+                (cls.big if i < 3 else cls.small).quizzes.add(quiz)
+                cls.quizzes.append(quiz)
+
+    def setUp(self):
+        cache.clear()
+        caches["template_fragments"].clear()
+
+    def _get_home(self):
+        executed = []
+        with connection.execute_wrapper(
+            lambda execute, sql, params, many, context: executed.append(sql)
+            or execute(sql, params, many, context)
+        ):
+            response = self.client.get(reverse("pages:home"))
+        self.assertEqual(response.status_code, 200)
+        return response, executed
+
+    def test_refresh_command_ranks_categories(self):
+        logger.info("Testing refresh_catalog_summaries command")
+        PopularCategory.objects.all().delete()
+        FeaturedQuiz.objects.all().delete()
+        out = StringIO()
+        call_command("refresh_catalog_summaries", stdout=out)
+        self.assertIn(
+            "Ranked 2 popular categories and 4 featured quizzes", out.getvalue()
+        )
+        self.assertEqual(
+            list(
+                PopularCategory.objects.values_list(
+                    "category_id", "active_quiz_count", "rank"
+                )
+            ),
+            [(self.big.id, 3, 1), (self.small.id, 1, 2)],
+        )
+        self.assertEqual(
+            list(FeaturedQuiz.objects.values_list("quiz_id", flat=True)),
+            [quiz.id for quiz in reversed(self.quizzes)],
+        )
+
+    def test_home_reads_summaries_without_aggregating(self):
+        logger.info("Testing home page reads of the catalog summaries")
+        self.client.force_login(self.user)
+        first, _ = self._get_home()
+        popular = first.context["popular_categories"]
+        self.assertEqual(
+            [(c.name, c.num_active_quizzes) for c in popular], [("Big", 3), ("Small", 1)]
+        )
+        second, executed = self._get_home()
+        self.assertFalse(any("COUNT(" in sql.upper() for sql in executed), executed)
+        self.assertEqual(
+            [q.title for q in second.context["featured_quizzes"]],
+            ["Summary Quiz 3", "Summary Quiz 2", "Summary Quiz 1"],
+        )
+
+    def test_catalog_change_refreshes_summaries_on_commit(self):
+        logger.info("Testing catalog summary refresh on catalog changes")
+        self._get_home()
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                quiz = Quiz.objects.create(title=f"Late Quiz {i}", is_active=True)
+                Question.objects.create(quiz=quiz, text="Q", position=1)
+                self.small.quizzes.add(quiz)
+        response, _ = self._get_home()
+        popular = response.context["popular_categories"]
+        self.assertEqual(
+            [(c.name, c.num_active_quizzes) for c in popular], [("Small", 4), ("Big", 3)]
+        )
+        self.assertEqual(response.context["featured_quizzes"][0].title, "Late Quiz 2")
+
+    def test_home_serves_stored_summaries_without_refreshing(self):
+        logger.info("Testing that the home page never rebuilds the summaries")
+        quiz = Quiz.objects.create(title="Uncommitted Quiz", is_active=True)
+        Question.objects.create(quiz=quiz, text="Q", position=1)
+        self.small.quizzes.add(quiz)
+        bump_catalog_version()
+        response, executed = self._get_home()
+        # The database cache counts and culls its own table on set.
+        executed = [sql for sql in executed if '"django_cache"' not in sql]
+        self.assertFalse(any("COUNT(" in sql.upper() for sql in executed), executed)
+        self.assertFalse(any(sql.startswith("DELETE") for sql in executed), executed)
+        popular = response.context["popular_categories"]
+        self.assertEqual(
+            [(c.name, c.num_active_quizzes) for c in popular], [("Big", 3), ("Small", 1)]
+        )
+
+    def test_refresh_bumps_catalog_version_after_commit(self):
+        logger.info("Testing catalog version bump after a summary refresh")
+        version = get_catalog_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            refresh_catalog_summaries()
+        # A home request before the commit still sees the old version.
+        self.assertEqual(get_catalog_version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_catalog_version(), version)
+
+    def test_refresh_upserts_existing_rows(self):
+        """Rows written by an earlier refresh are updated, not inserted again."""
+        refresh_catalog_summaries()
+        self.assertEqual(refresh_catalog_summaries(), (2, 4))
+        self.assertEqual(PopularCategory.objects.count(), 2)
+        self.assertEqual(FeaturedQuiz.objects.count(), 4)
+
+    def test_featured_quizzes_fall_back_when_pool_is_attempted(self):
+        logger.info("Testing featured quiz fallback past the materialized pool")
+        for quiz in self.quizzes[2:]:
+            QuizAttempt.objects.create(
+                user=self.user, quiz=quiz, score=1, total_questions=2, percentage=50
+            )
+        self.client.force_login(self.user)
+        with patch("pages.catalog.FEATURED_QUIZ_POOL_SIZE", 2):
+            response, _ = self._get_home()
+        featured = response.context["featured_quizzes"]
+        self.assertEqual(
+            [q.title for q in featured],
+            ["Summary Quiz 1", "Summary Quiz 0", "Summary Quiz 3"],
+        )
+        self.assertEqual([q.has_attempted for q in featured], [False, False, True])
+
+
+class CollectionMembershipTests(TestCase):
+    """Bulk, set-based adds and removes of collection quizzes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="bulker", password="pw")
+        cls.other = User.objects.create_user(username="other_bulker", password="pw")
+        cls.collection = UserCollection.objects.create(user=cls.user, name="Bulk")
+        cls.quizzes = [
+            Quiz.objects.create(title=f"Bulk Quiz {i}", is_active=True)
+            for i in range(6)
+        ]
+        cls.inactive = Quiz.objects.create(title="Bulk Inactive", is_active=False)
+        cls.collection.quizzes.add(cls.quizzes[0])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def _post(self, name, quiz_ids, collection=None):
+        executed = []
+        url = reverse(f"pages:{name}", args=[(collection or self.collection).id])
+        with connection.execute_wrapper(
+            lambda execute, sql, params, many, context: executed.append(sql)
+            or execute(sql, params, many, context)
+        ):
+            response = self.client.post(url, {"quiz_ids": quiz_ids})
+        return response, executed
+
+    def test_bulk_add_skips_present_inactive_and_unknown_quizzes(self):
+        logger.info("Testing bulk add to a collection")
+        ids = [q.id for q in self.quizzes]
+        response, executed = self._post(
+            "bulk_add_quizzes_to_collection",
+            [*ids, ids[1], self.inactive.id, 999999],
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"added": ids[1:], "quiz_count": 6})
+        inserts = [sql for sql in executed if sql.startswith("INSERT")]
+        self.assertEqual(len(inserts), 1, inserts)
+        self.assertEqual(
+            set(self.collection.quizzes.values_list("id", flat=True)), set(ids)
+        )
+
+        response, _ = self._post("bulk_add_quizzes_to_collection", ids)
+        self.assertEqual(response.json(), {"added": [], "quiz_count": 6})
+
+    def test_bulk_remove(self):
+        logger.info("Testing bulk remove from a collection")
+        self.collection.quizzes.add(*self.quizzes[1:4])
+        ids = [q.id for q in self.quizzes[:3]] + [self.quizzes[5].id]
+        response, executed = self._post("bulk_remove_quizzes_from_collection", ids)
+        self.assertEqual(response.json(), {"removed": 3, "quiz_count": 1})
+        deletes = [sql for sql in executed if sql.startswith("DELETE")]
+        self.assertEqual(len(deletes), 1, deletes)
+        self.assertEqual(list(self.collection.quizzes.all()), [self.quizzes[3]])
+
+    def test_bulk_endpoints_reject_bad_requests(self):
+        logger.info("Testing bulk collection endpoint validation")
+        response, _ = self._post("bulk_add_quizzes_to_collection", [])
+        self.assertEqual(response.status_code, 400)
+        response, _ = self._post("bulk_add_quizzes_to_collection", ["x"])
+        self.assertEqual(response.status_code, 400)
+        others = UserCollection.objects.create(user=self.other, name="Theirs")
+        response, _ = self._post(
+            "bulk_remove_quizzes_from_collection", [self.quizzes[0].id], others
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_single_quiz_views_do_not_load_the_collection(self):
+        logger.info("Testing single add/remove membership checks")
+        self.collection.quizzes.add(*self.quizzes[1:])
+        executed = []
+        with connection.execute_wrapper(
+            lambda execute, sql, params, many, context: executed.append(sql)
+            or execute(sql, params, many, context)
+        ):
+            response = self.client.post(
+                reverse(
+                    "pages:add_quiz_to_selected_collection",
+                    args=[self.quizzes[2].id, self.collection.id],
+                )
+            )
+        self.assertIn(
+            "is already in collection",
+            str(list(get_messages(response.wsgi_request))[0]),
+        )
+        self.assertFalse(
+            any(
+                sql.startswith('SELECT "multi_choice_quiz_quiz"')
+                and '"pages_usercollection_quizzes"' in sql
+                for sql in executed
+            )
+        )
+
+        response = self.client.post(
+            reverse(
+                "pages:remove_quiz_from_collection",
+                args=[self.collection.id, self.quizzes[2].id],
+            ),
+            follow=True,
+        )
+        self.assertContains(response, "removed from collection")
+        self.assertFalse(self.collection.quizzes.filter(pk=self.quizzes[2].pk).exists())
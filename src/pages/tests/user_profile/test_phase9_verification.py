@@ -5,6 +5,7 @@ from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.contrib import messages
 
+from pages.catalog import refresh_catalog_summaries
 from pages.models import (
     SystemCategory,
     UserCollection,
@@ -44,6 +45,8 @@ class Phase9ProfileAndCollectionsVerificationTests(TestCase):
         # Data for category browsing
         cls.cat1 = SystemCategory.objects.create(name="P9 Category 1", slug="p9-cat-1")
         cls.cat1.quizzes.add(cls.quiz1)
+        # Summaries are refreshed on commit, which TestCase never reaches.
+        refresh_catalog_summaries()
 
     def setUp(self):
         self.client = Client()
@@ -8,9 +8,24 @@ app_name = "pages"
 urlpatterns = [
     path("", views.home, name="home"),
     path("quizzes/", views.quizzes, name="quizzes"),
+    path(
+        "quizzes/catalog.json",
+        views.quizzes_catalog_json,
+        name="quizzes_catalog_json",
+    ),
+    path(
+        "quizzes/autocomplete.json",
+        views.quiz_autocomplete_json,
+        name="quiz_autocomplete_json",
+    ),
     path("about/", views.about, name="about"),
     path("signup/", views.signup_view, name="signup"),
     path("profile/", views.profile_view, name="profile"),
+    path(
+        "profile/history.json",
+        views.attempt_history_json,
+        name="attempt_history_json",
+    ),
     path("profile/edit/", views.edit_profile_view, name="edit_profile"),
     path(
         "profile/collections/create/",
@@ -22,6 +37,16 @@ urlpatterns = [
         views.remove_quiz_from_collection_view,
         name="remove_quiz_from_collection",
     ),
+    path(
+        "profile/collections/<int:collection_id>/add_quizzes/",
+        views.bulk_add_quizzes_to_collection_view,
+        name="bulk_add_quizzes_to_collection",
+    ),
+    path(
+        "profile/collections/<int:collection_id>/remove_quizzes/",
+        views.bulk_remove_quizzes_from_collection_view,
+        name="bulk_remove_quizzes_from_collection",
+    ),
     path(
         "quiz/<int:quiz_id>/add-to-collection/",
         views.select_collection_for_quiz_view,
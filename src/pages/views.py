@@ -5,12 +5,45 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Avg, Count, Q, Exists, OuterRef
+from django.db.models import (
+    BooleanField,
+    Case,
+    Count,
+    Prefetch,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.db import IntegrityError
-from django.views.decorators.http import require_POST
-
-from multi_choice_quiz.models import Quiz, Question, QuizAttempt
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
+
+from multi_choice_quiz.caching import get_attempted_quiz_ids
+from multi_choice_quiz.counters import get_user_stats
+from multi_choice_quiz.models import Quiz, Question
+from multi_choice_quiz.search import MAX_SEARCH_RESULTS, search_quizzes
+from .autocomplete import autocomplete
+from .caching import (
+    FRAGMENT_CACHE_TIMEOUT,
+    cache_anonymous_page,
+    request_catalog_version,
+)
+from .catalog import (
+    InvalidCursor,
+    catalog_page,
+    catalog_queryset,
+    featured_quizzes,
+    popular_categories,
+)
+from .collection_membership import (
+    MAX_BULK_COLLECTION_QUIZZES,
+    add_quizzes_to_collection,
+    remove_quizzes_from_collection,
+)
+from .history import ATTEMPT_HISTORY_PAGE_SIZE, attempt_history_page
 from .models import UserCollection, SystemCategory
 from .forms import SignUpForm, EditProfileForm, UserCollectionForm
 from django.utils.http import (
@@ -29,58 +62,67 @@ except (ImportError, ModuleNotFoundError):
     )
 
 
-def home(request):
-    base_quizzes_qs = (
-        Quiz.objects.filter(is_active=True, questions__isnull=False)
-        .distinct()
-        .select_related()
-        .prefetch_related("system_categories")
+def _with_has_attempted(queryset, attempted_quiz_ids):
+    """Annotate `has_attempted` from the user's cached attempted-quiz set."""
+    return queryset.annotate(
+        has_attempted=Case(
+            When(pk__in=attempted_quiz_ids, then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        )
+    )
+
+
+def _with_collection_summary(queryset):
+    """Annotate collections with `quiz_count` and `question_total`."""
+    return queryset.annotate(
+        quiz_count=Count("quizzes", distinct=True),
+        question_total=Coalesce(Sum("quizzes__active_question_count"), 0),
     )
 
-    featured_quizzes_list = []
 
+def _fragment_cache_context(request):
+    """Context for the templates' `{% cache %}` fragments of catalog content."""
+    return {
+        "catalog_version": request_catalog_version(request),
+        "fragment_cache_timeout": FRAGMENT_CACHE_TIMEOUT,
+    }
+
+
+@cache_anonymous_page()
+def home(request):
     # log view and name of file:
     logger.info(f"View: home, File: {__file__}")
 
+    # Featured quizzes and popular categories come from the materialized
+    # catalog summaries (see pages.catalog), refreshed when catalog changes
+    # commit, never here.
     if request.user.is_authenticated:
-        attempted_quiz_ids = list(
-            QuizAttempt.objects.filter(user=request.user)
-            .values_list("quiz_id", flat=True)
-            .distinct()
-        )
-
-        unattempted_qs = base_quizzes_qs.exclude(id__in=attempted_quiz_ids)
-        unattempted_featured = list(unattempted_qs.order_by("-created_at", "-id")[:3])
-        featured_quizzes_list.extend(unattempted_featured)
-
-        if len(featured_quizzes_list) < 3:
-            num_needed = 3 - len(featured_quizzes_list)
-            selected_ids = [q.id for q in featured_quizzes_list]
-            additional_qs = base_quizzes_qs.exclude(id__in=selected_ids)
-            additional_featured = list(
-                additional_qs.order_by("-created_at", "-id")[:num_needed]
+        # Newest unattempted quizzes first, topped up with attempted ones. The
+        # attempted set comes from the cache, so QuizAttempt is not queried.
+        attempted_quiz_ids = get_attempted_quiz_ids(request.user.id)
+        featured_quizzes_list = featured_quizzes(attempted_quiz_ids)
+        if featured_quizzes_list is None:
+            # The user attempted most of the featured pool: rank the catalog.
+            featured_quizzes_list = list(
+                _with_has_attempted(
+                    catalog_queryset().prefetch_related("system_categories"),
+                    attempted_quiz_ids,
+                ).order_by("has_attempted", "-created_at", "-id")[:3]
             )
-            featured_quizzes_list.extend(additional_featured)
     else:
-        featured_quizzes_list = list(base_quizzes_qs.order_by("-created_at", "-id")[:3])
+        featured_quizzes_list = featured_quizzes()
 
-    popular_categories = (
-        SystemCategory.objects.annotate(
-            num_active_quizzes=Count(
-                "quizzes",
-                filter=Q(quizzes__is_active=True, quizzes__questions__isnull=False),
-            )
-        )
-        .filter(num_active_quizzes__gt=0)
-        .order_by("-num_active_quizzes", "name")[:16]
-    )
     context = {
         "featured_quizzes": featured_quizzes_list,
-        "popular_categories": popular_categories,
+        # Lazy: only evaluated when the template fragment is not cached.
+        "popular_categories": popular_categories(),
+        **_fragment_cache_context(request),
     }
     return render(request, "pages/home.html", context)
 
 
+@cache_anonymous_page()
 def about(request):
     return render(request, "pages/about.html")
 
@@ -100,14 +142,11 @@ def signup_view(request):
     return render(request, "pages/signup.html", {"form": form})
 
 
-def quizzes(request):
-    quiz_list_query = (
-        Quiz.objects.filter(is_active=True, questions__isnull=False)
-        .distinct()
-        .select_related()
-        .prefetch_related("system_categories", "questions")
-    )
+QUIZZES_PER_PAGE = 9
+
 
+@cache_anonymous_page(params=("category", "page", "cursor"))
+def quizzes(request):
     categories = SystemCategory.objects.all().order_by("name")
     selected_category = None
     category_slug = request.GET.get("category")
@@ -115,25 +154,67 @@ def quizzes(request):
     if category_slug:
         try:
             selected_category = SystemCategory.objects.get(slug=category_slug)
-            quiz_list_query = quiz_list_query.filter(
-                system_categories=selected_category
-            )
         except SystemCategory.DoesNotExist:
             selected_category = None
 
-    if request.user.is_authenticated:
-        quiz_list_annotated_and_ordered = quiz_list_query.annotate(
-            has_attempted=Exists(
-                QuizAttempt.objects.filter(quiz_id=OuterRef("pk"), user=request.user)
+    context = {
+        "categories": categories,
+        "selected_category": selected_category,
+        **_fragment_cache_context(request),
+    }
+
+    category_filter = selected_category.slug if selected_category else None
+
+    # Search mode (?q=): ranked matches from the full-text index, one page.
+    search_query = request.GET.get("q", "").strip()
+    if search_query:
+        hits = search_quizzes(search_query, MAX_SEARCH_RESULTS)
+        matches = (
+            catalog_queryset(category_filter)
+            .prefetch_related("system_categories")
+            .in_bulk([hit.quiz_id for hit in hits])
+        )
+        context.update(
+            {
+                "quizzes": [matches[h.quiz_id] for h in hits if h.quiz_id in matches],
+                "search_query": search_query,
+            }
+        )
+        return render(request, "pages/quizzes.html", context)
+
+    # Cursor mode (?cursor=, empty for the first page): keyset pages, newest
+    # first, without a COUNT of the catalog (see pages.catalog).
+    if "cursor" in request.GET:
+        try:
+            quiz_page, next_cursor = catalog_page(
+                category_filter, request.GET["cursor"], QUIZZES_PER_PAGE
+            )
+        except InvalidCursor:
+            # Stale or mangled link: start again from the newest quizzes.
+            quiz_page, next_cursor = catalog_page(
+                category_filter, None, QUIZZES_PER_PAGE
             )
+        context.update(
+            {"quizzes": quiz_page, "cursor_mode": True, "next_cursor": next_cursor}
+        )
+        return render(request, "pages/quizzes.html", context)
+
+    # Only the page rows are fetched: Paginator slices the queryset (LIMIT/
+    # OFFSET) and its COUNT skips the annotations. Question counts come from
+    # the stored Quiz.active_question_count instead of a prefetch of every
+    # question.
+    quiz_list_query = catalog_queryset(category_filter).prefetch_related(
+        "system_categories"
+    )
+
+    if request.user.is_authenticated:
+        quiz_list_query = _with_has_attempted(
+            quiz_list_query, get_attempted_quiz_ids(request.user.id)
         ).order_by("has_attempted", "-created_at", "-id")
-        final_quiz_list_for_pagination = list(quiz_list_annotated_and_ordered)
     else:
-        final_quiz_list_for_pagination = list(
-            quiz_list_query.order_by("-created_at", "-id")
-        )
+        quiz_list_query = quiz_list_query.order_by("-created_at", "-id")
 
-    paginator = Paginator(final_quiz_list_for_pagination, 9)
+    paginator = Paginator(quiz_list_query, QUIZZES_PER_PAGE)
     page_number = request.GET.get("page")
     try:
         quizzes_page = paginator.page(page_number)
@@ -142,73 +223,163 @@ def quizzes(request):
     except EmptyPage:
         quizzes_page = paginator.page(paginator.num_pages)
 
-    context = {
-        "quizzes": quizzes_page,
-        "categories": categories,
-        "selected_category": selected_category,
-    }
+    context["quizzes"] = quizzes_page
     return render(request, "pages/quizzes.html", context)
 
 
+@require_GET
+def quizzes_catalog_json(request):
+    """
+    JSON endpoint for the keyset-paginated catalog (infinite scroll).
+
+    Query parameters: 'cursor' (the previous response's 'next_cursor'),
+    'category' (SystemCategory slug) and 'limit'. Returns {"quizzes": [...],
+    "next_cursor": str or null}.
+    """
+    try:
+        limit = int(request.GET.get("limit", QUIZZES_PER_PAGE))
+        quiz_page, next_cursor = catalog_page(
+            request.GET.get("category") or None,
+            request.GET.get("cursor") or None,
+            limit,
+        )
+    except (InvalidCursor, ValueError) as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+    return JsonResponse(
+        {
+            "quizzes": [
+                {
+                    "id": quiz.id,
+                    "title": quiz.title,
+                    "description": quiz.description,
+                    "question_count": quiz.active_question_count,
+                    "categories": [
+                        {"name": category.name, "slug": category.slug}
+                        for category in quiz.system_categories.all()
+                    ],
+                    "url": reverse("multi_choice_quiz:quiz_detail", args=[quiz.id]),
+                }
+                for quiz in quiz_page
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@require_GET
+def quiz_autocomplete_json(request):
+    """
+    JSON endpoint for search-as-you-type on the quizzes page.
+
+    Query parameters: 'q' (the typed prefix) and 'limit'. Returns
+    {"suggestions": [{"type", "label", "url"}, ...]} from the in-process
+    prefix index (see pages.autocomplete), without database queries once the
+    index is built.
+    """
+    try:
+        limit = int(request.GET.get("limit", 8))
+    except ValueError as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+    return JsonResponse(
+        {
+            "suggestions": [
+                {"type": s.kind, "label": s.label, "url": s.url}
+                for s in autocomplete(request.GET.get("q", ""), limit)
+            ]
+        }
+    )
+
+
 @login_required
 def profile_view(request):
     user = request.user
-    user_attempts_qs = (  # Changed variable name to indicate it's a queryset initially
-        QuizAttempt.objects.filter(user=user)
-        .order_by("-end_time")
-        .select_related("quiz")
-    )
+    # Two queries however large the collections: the summary annotations, then
+    # the id/title/question count of their quizzes (never their questions).
     user_collections = (
-        UserCollection.objects.filter(user=user)
-        .prefetch_related("quizzes__questions")
+        _with_collection_summary(UserCollection.objects.filter(user=user))
+        .prefetch_related(
+            Prefetch(
+                "quizzes",
+                queryset=Quiz.objects.only("id", "title", "active_question_count"),
+            )
+        )
         .order_by("name")
     )
-    stats = user_attempts_qs.aggregate(  # Use the queryset for aggregate
-        total_attempts=Count("id"), average_score=Avg("percentage")
-    )
-    average_score = stats.get("average_score")
-    if average_score is None:
-        average_score = 0
-
-    # --- START: Calculate attempt counts per quiz for this user ---
-    quiz_attempt_counts_raw = (
-        QuizAttempt.objects.filter(user=user)
-        .values("quiz_id")
-        .annotate(count=Count("id"))
-        .order_by("quiz_id")
-    )
+    # Totals come from the per-user stats row (see multi_choice_quiz.counters),
+    # not from an aggregate over every attempt.
+    stats = get_user_stats(user.id)
 
+    # First page of the history only; the rest is loaded on scroll from
+    # attempt_history_json (see pages.history).
+    attempts_page, next_cursor = attempt_history_page(user.id)
     quiz_attempt_counts_dict = {
-        item["quiz_id"]: item["count"] for item in quiz_attempt_counts_raw
+        attempt.quiz_id: attempt.individual_quiz_attempt_count
+        for attempt in attempts_page
     }
     logger.debug(
         f"Quiz attempt counts for user {user.username}: {quiz_attempt_counts_dict}"
     )
-    # --- END: Calculate attempt counts per quiz ---
-
-    # Attach the count to each attempt object for easier template access
-    # This is one way; another is to pass quiz_attempt_counts_dict directly
-    # and look up in the template. For simplicity in the template, let's try attaching.
-    # Note: This modifies the queryset results in memory.
-    user_attempts_list = []
-    for attempt in user_attempts_qs:  # Iterate over the original queryset
-        attempt.individual_quiz_attempt_count = quiz_attempt_counts_dict.get(
-            attempt.quiz.id, 0
-        )
-        user_attempts_list.append(attempt)
 
     context = {
-        "quiz_attempts": user_attempts_list,  # Pass the modified list
+        "quiz_attempts": attempts_page,
+        "history_next_cursor": next_cursor,
         "user_collections": user_collections,
         "stats": {
-            "total_taken": stats.get("total_attempts", 0),
-            "avg_score_percent": round(average_score),
+            "total_taken": stats.attempt_count,
+            "avg_score_percent": round(stats.average_percentage),
         },
-        "quiz_attempt_counts": quiz_attempt_counts_dict,  # Also pass the dict for flexibility or alternative use
+        "quiz_attempt_counts": quiz_attempt_counts_dict,
     }
     return render(request, "pages/profile.html", context)
 
 
+@login_required
+@require_GET
+def attempt_history_json(request):
+    """
+    JSON endpoint for the keyset-paginated attempt history of the profile page.
+
+    Query parameters: 'cursor' (the previous response's 'next_cursor') and
+    'limit'. Returns {"attempts": [...], "next_cursor": str or null}.
+    """
+    try:
+        limit = int(request.GET.get("limit", ATTEMPT_HISTORY_PAGE_SIZE))
+        attempts_page, next_cursor = attempt_history_page(
+            request.user.id, request.GET.get("cursor") or None, limit
+        )
+    except (InvalidCursor, ValueError) as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+    return JsonResponse(
+        {
+            "attempts": [
+                {
+                    "id": attempt.id,
+                    "quiz_title": attempt.quiz.title,
+                    "quiz_attempt_count": attempt.individual_quiz_attempt_count,
+                    "percentage": attempt.percentage,
+                    "end_time": attempt.end_time,
+                    "quiz_url": reverse(
+                        "multi_choice_quiz:quiz_detail", args=[attempt.quiz_id]
+                    ),
+                    "review_url": (
+                        reverse(
+                            "multi_choice_quiz:attempt_mistake_review",
+                            args=[attempt.id],
+                        )
+                        if attempt.attempt_details
+                        else None
+                    ),
+                }
+                for attempt in attempts_page
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
 @login_required
 def edit_profile_view(request):
     if request.method == "POST":
@@ -261,8 +432,7 @@ def remove_quiz_from_collection_view(request, collection_id, quiz_id):
     collection = get_object_or_404(UserCollection, id=collection_id, user=request.user)
     quiz_to_remove = get_object_or_404(Quiz, id=quiz_id)
 
-    if quiz_to_remove in collection.quizzes.all():
-        collection.quizzes.remove(quiz_to_remove)
+    if remove_quizzes_from_collection(collection, [quiz_to_remove.pk]):
         messages.success(
             request,
             f"Quiz '{quiz_to_remove.title}' removed from collection '{collection.name}'.",
@@ -285,7 +455,9 @@ def remove_quiz_from_collection_view(request, collection_id, quiz_id):
 @login_required
 def select_collection_for_quiz_view(request, quiz_id):
     quiz = get_object_or_404(Quiz, id=quiz_id, is_active=True)
-    user_collections = UserCollection.objects.filter(user=request.user).order_by("name")
+    user_collections = _with_collection_summary(
+        UserCollection.objects.filter(user=request.user)
+    ).order_by("name")
 
     if not user_collections.exists():
         messages.info(
@@ -310,8 +482,7 @@ def add_quiz_to_selected_collection_view(request, quiz_id, collection_id):
     quiz_to_add = get_object_or_404(Quiz, id=quiz_id, is_active=True)
     collection = get_object_or_404(UserCollection, id=collection_id, user=request.user)
 
-    if quiz_to_add not in collection.quizzes.all():
-        collection.quizzes.add(quiz_to_add)
+    if add_quizzes_to_collection(collection, [quiz_to_add.pk]):
         messages.success(
             request,
             f"Quiz '{quiz_to_add.title}' added to collection '{collection.name}'.",
@@ -339,3 +510,59 @@ def add_quiz_to_selected_collection_view(request, quiz_id, collection_id):
 
     logger.info("No valid 'next' URL. Redirecting to profile page.")
     return redirect("pages:profile")
+
+
+def _posted_quiz_ids(request):
+    """Parse the repeated 'quiz_ids' POST field; raises ValueError."""
+    quiz_ids = [int(value) for value in request.POST.getlist("quiz_ids")]
+    if not quiz_ids:
+        raise ValueError("No quiz_ids given.")
+    if len(quiz_ids) > MAX_BULK_COLLECTION_QUIZZES:
+        raise ValueError(
+            f"At most {MAX_BULK_COLLECTION_QUIZZES} quizzes can be changed at once."
+        )
+    return quiz_ids
+
+
+@login_required
+@require_POST
+def bulk_add_quizzes_to_collection_view(request, collection_id):
+    """
+    JSON endpoint adding many quizzes to one collection in a single request.
+
+    POST field: 'quiz_ids' (repeated). Returns {"added": [ids], "quiz_count":
+    int}; unknown, inactive and already present quizzes are skipped.
+    """
+    collection = get_object_or_404(UserCollection, id=collection_id, user=request.user)
+    try:
+        quiz_ids = _posted_quiz_ids(request)
+    except ValueError as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+    added = add_quizzes_to_collection(collection, quiz_ids)
+    logger.info(
+        f"User {request.user.username} added {len(added)} quizzes to collection '{collection.name}' (ID: {collection_id})."
+    )
+    return JsonResponse({"added": added, "quiz_count": collection.quizzes.count()})
+
+
+@login_required
+@require_POST
+def bulk_remove_quizzes_from_collection_view(request, collection_id):
+    """
+    JSON endpoint removing many quizzes from one collection in a single request.
+
+    POST field: 'quiz_ids' (repeated). Returns {"removed": int, "quiz_count":
+    int}.
+    """
+    collection = get_object_or_404(UserCollection, id=collection_id, user=request.user)
+    try:
+        quiz_ids = _posted_quiz_ids(request)
+    except ValueError as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+    removed = remove_quizzes_from_collection(collection, quiz_ids)
+    logger.info(
+        f"User {request.user.username} removed {removed} quizzes from collection '{collection.name}' (ID: {collection_id})."
+    )
+    return JsonResponse({"removed": removed, "quiz_count": collection.quizzes.count()})